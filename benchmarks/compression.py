@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# benchmarks/compression.py
+
+"""
+Compare plain, gzip and zstd dumps: disk used against read throughput.
+
+Plain dumps are generated (or taken from `--dumps`), then re-written once
+per codec and level. For each variant the script reports bytes on disk,
+the share saved versus plain CSV, the time to load every process dump
+with `load_process_df` and to ingest them into a cold store, and the read
+throughput in MB of uncompressed CSV per second. zstd rows are skipped
+when `zstandard` is not installed.
+
+    python benchmarks/compression.py --processes 5000 --days 1
+    python benchmarks/compression.py --dumps dumps/time --levels 1 3 9
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import gen_dumps  # noqa: E402
+from adapters.dumps_reader import COMPRESSION_SUFFIXES, load_process_df, zstandard  # noqa: E402
+from adapters.snapshot_store import SnapshotStore  # noqa: E402
+
+
+DEFAULT_LEVELS: Dict[str, List[int]] = {"gzip": [1, 6], "zstd": [1, 3, 9]}
+
+
+def compressor(codec: str, level: int) -> Optional[Callable[[bytes], bytes]]:
+    """
+    Return a bytes → bytes compressor, or None if `codec` is unavailable.
+    """
+    if codec == "gzip":
+        return lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+    if zstandard is None:
+        return None
+    return zstandard.ZstdCompressor(level=level).compress
+
+
+def recompress(src: Path, dst: Path, compress: Callable[[bytes], bytes], suffix: str) -> float:
+    """
+    Write every dump of `src` into `dst` with `compress`; return seconds spent compressing.
+    """
+    dst.mkdir(parents=True)
+    spent = 0.0
+    for path in sorted(src.glob("*_mem_*.csv")):
+        data = path.read_bytes()
+        t0 = time.perf_counter()
+        packed = compress(data)
+        spent += time.perf_counter() - t0
+        (dst / (path.name + suffix)).write_bytes(packed)
+    strings = src / "process_strings.csv"
+    if strings.exists():
+        shutil.copy(strings, dst / strings.name)
+    return spent
+
+
+def dump_bytes(dumps: Path, prefix: str) -> int:
+    return sum(p.stat().st_size for p in dumps.glob(f"{prefix}*.csv*"))
+
+
+def timed_median(fn: Callable[[], object], repeat: int) -> float:
+    times: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def measure(dumps: Path, store_dir: Path, repeat: int) -> Dict[str, float]:
+    """
+    Return disk use and median load / cold-ingest seconds of one dump directory.
+    """
+    mask = dumps / "process_mem_*.csv*"
+
+    def ingest() -> None:
+        shutil.rmtree(store_dir, ignore_errors=True)
+        SnapshotStore(store_dir, mask).refresh()
+
+    return {
+        "proc_bytes": dump_bytes(dumps, "process_mem_"),
+        "all_bytes": dump_bytes(dumps, ""),
+        "load_s": timed_median(lambda: load_process_df(mask), repeat),
+        "ingest_s": timed_median(ingest, repeat),
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = gen_dumps.build_parser()
+    parser.description = "Benchmark disk saved vs. read throughput of compressed dumps."
+    parser.add_argument("--dumps", type=Path, help="Use existing plain dumps instead of generating.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per variant.")
+    parser.add_argument("--levels", type=int, nargs="+", help="Levels to try for every codec.")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file.")
+    return parser
+
+
+def main() -> None:
+    """
+    Generate (or reuse) plain dumps, re-write them per codec and print a report.
+    """
+    args = build_parser().parse_args()
+    args.compress = None
+
+    with tempfile.TemporaryDirectory(prefix="pmi-compress-") as tmp:
+        plain = args.dumps
+        if plain is None:
+            plain = args.out = Path(tmp) / "plain"
+            gen_dumps.generate(args)
+        plain = plain.resolve()
+        store_dir = Path(tmp) / "store"
+
+        base = measure(plain, store_dir, args.repeat)
+        csv_mb = base["proc_bytes"] / 2**20
+        results: Dict[str, dict] = {"plain": {**base, "compress_s": 0.0}}
+        for codec, levels in DEFAULT_LEVELS.items():
+            for level in args.levels or levels:
+                compress = compressor(codec, level)
+                if compress is None:
+                    print(f"skipping {codec}: pip install 'pid-memory-inspector[zstd]'")
+                    break
+                out = Path(tmp) / f"{codec}-{level}"
+                spent = recompress(plain, out, compress, COMPRESSION_SUFFIXES[codec])
+                results[f"{codec} -{level}"] = {**measure(out, store_dir, args.repeat), "compress_s": spent}
+                shutil.rmtree(out)
+
+    print(f"dumps: {plain} ({csv_mb:.1f} MB of process CSV)")
+    print(
+        f"{'variant':<10} {'disk MB':>9} {'saved':>7} {'compress s':>11} "
+        f"{'load s':>8} {'load MB/s':>10} {'ingest s':>9} {'ingest MB/s':>12}"
+    )
+    for name, res in results.items():
+        saved = 1 - res["all_bytes"] / base["all_bytes"]
+        print(
+            f"{name:<10} {res['all_bytes'] / 2**20:>9.1f} {saved:>7.1%} {res['compress_s']:>11.2f} "
+            f"{res['load_s']:>8.2f} {csv_mb / res['load_s']:>10.1f} "
+            f"{res['ingest_s']:>9.2f} {csv_mb / res['ingest_s']:>12.1f}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# benchmarks/gen_dumps.py
+
+"""
+Write synthetic `process_mem_*` / `sys_mem_*` dumps in collector format.
+
+The process population is a tree under PID 1: long-lived services with
+worker children down to `--depth` levels, plus a pool of short-lived
+processes (compilers, celery/gunicorn workers) of which `--churn` is
+replaced every snapshot. New processes take the next free PID, wrapping
+at `--pid-max`, and with probability `--pid-reuse` take a PID that was
+just freed, so PID reuse shows up as in real captures. A few services
+leak slowly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+SERVICES: List[str] = [
+    "/usr/lib/jvm/java-17/bin/java -Xmx8g -Dapp.name=billing -cp {classpath} com.example.billing.Main",
+    "/usr/bin/node /srv/web/node_modules/.bin/next start --port 3000 {flags}",
+    "/usr/bin/python3 -m gunicorn app.wsgi:application --workers 8 --bind 0.0.0.0:8000",
+    "/usr/bin/python3 -m celery -A tasks worker --concurrency 4 --loglevel INFO",
+    "/usr/sbin/postgres -D /var/lib/postgresql/16/main -c config_file=/etc/postgresql/16/main/postgresql.conf",
+    "/usr/bin/containerd-shim-runc-v2 -namespace moby -id {hexid} -address /run/containerd/containerd.sock",
+    "/usr/sbin/nginx -g daemon on; master_process on;",
+    "/usr/bin/redis-server 127.0.0.1:6379",
+]
+
+EPHEMERAL: List[str] = [
+    "/usr/lib/gcc/x86_64-linux-gnu/13/cc1plus -quiet -O2 -std=c++20 src/module_{n}.cpp -o /tmp/cc{n}.s",
+    "/usr/bin/python3 -m celery -A tasks worker --concurrency 4 --loglevel INFO",
+    "gunicorn: worker [app.wsgi:application]",
+    "/bin/sh -c /usr/local/bin/healthcheck.sh --timeout 5",
+    "[kworker/{n}:1-events]",
+]
+
+USERS: List[str] = ["root", "www-data", "postgres", "app", "redis"]
+
+
+@dataclass
+class Population:
+    """
+    Mutable process table evolved snapshot by snapshot.
+    """
+    rng: np.random.Generator
+    pid_max: int
+    pid_reuse: float
+    next_pid: int = 2
+    freed: List[int] = field(default_factory=list)
+    live: Dict[int, dict] = field(default_factory=dict)
+
+    def alloc_pid(self) -> int:
+        if self.freed and self.rng.random() < self.pid_reuse:
+            pid = self.freed.pop()
+            if pid not in self.live:
+                return pid
+        while True:
+            pid = self.next_pid
+            self.next_pid = 2 if self.next_pid >= self.pid_max else self.next_pid + 1
+            if pid not in self.live:
+                return pid
+
+    def spawn(self, ppid: int, cmd: str, user: str, rss: float, ephemeral: bool, leak: float = 0.0) -> int:
+        pid = self.alloc_pid()
+        self.live[pid] = {
+            "PPID": ppid, "USER": user, "CMD": cmd, "rss": rss,
+            "ephemeral": ephemeral, "leak": leak,
+        }
+        return pid
+
+    def kill(self, pid: int) -> None:
+        self.live.pop(pid, None)
+        self.freed.append(pid)
+
+
+def _render(template: str, rng: np.random.Generator, cmd_len: int) -> str:
+    classpath = ":".join(f"/opt/app/lib/dep-{i}.jar" for i in range(max(1, cmd_len // 24)))
+    return template.format(
+        classpath=classpath,
+        flags=" ".join(f"--opt{i}=x" for i in range(max(1, cmd_len // 100))),
+        hexid=f"{rng.integers(1 << 62):016x}",
+        n=int(rng.integers(0, 64)),
+    )
+
+
+def build_population(args: argparse.Namespace, rng: np.random.Generator) -> Population:
+    """
+    Return the initial process tree: services with worker subtrees up to
+    `args.depth` levels below init, plus the ephemeral pool.
+    """
+    pop = Population(rng=rng, pid_max=args.pid_max, pid_reuse=args.pid_reuse)
+    pop.live[1] = {"PPID": 0, "USER": "root", "CMD": "/sbin/init", "rss": 12.0, "ephemeral": False, "leak": 0.0}
+
+    n_ephemeral = int(args.processes * args.ephemeral_share)
+    depth = {1: 0}
+    parents = [1]
+    while len(pop.live) < args.processes - n_ephemeral:
+        ppid = 1 if rng.random() < 0.2 else parents[int(rng.integers(len(parents)))]
+        leak = float(rng.uniform(0.5, 5.0)) if rng.random() < args.leak_share else 0.0
+        pid = pop.spawn(
+            ppid,
+            _render(SERVICES[int(rng.integers(len(SERVICES)))], rng, args.cmd_len),
+            USERS[int(rng.integers(len(USERS)))],
+            float(rng.lognormal(4.0, 1.2)),
+            ephemeral=False,
+            leak=leak,
+        )
+        depth[pid] = depth[ppid] + 1
+        if depth[pid] < args.depth:
+            parents.append(pid)
+
+    for _ in range(n_ephemeral):
+        spawn_ephemeral(pop, parents, args, rng)
+    return pop
+
+
+def spawn_ephemeral(pop: Population, parents: List[int], args: argparse.Namespace, rng: np.random.Generator) -> None:
+    live_parents = [p for p in parents if p in pop.live] or [1]
+    pop.spawn(
+        live_parents[int(rng.integers(len(live_parents)))],
+        _render(EPHEMERAL[int(rng.integers(len(EPHEMERAL)))], rng, args.cmd_len),
+        USERS[int(rng.integers(len(USERS)))],
+        float(rng.lognormal(3.0, 1.0)),
+        ephemeral=True,
+    )
+
+
+def step(pop: Population, args: argparse.Namespace, rng: np.random.Generator, hours: float) -> None:
+    """
+    Advance one snapshot: random-walk RSS, apply leaks, churn ephemerals.
+    """
+    parents = [pid for pid, p in pop.live.items() if not p["ephemeral"]]
+    ephemeral = [pid for pid, p in pop.live.items() if p["ephemeral"]]
+    for p in pop.live.values():
+        p["rss"] = max(1.0, p["rss"] * float(rng.normal(1.0, 0.03)) + p["leak"] * hours)
+    n_exit = int(round(len(ephemeral) * args.churn))
+    for pid in rng.choice(ephemeral, size=min(n_exit, len(ephemeral)), replace=False) if ephemeral else []:
+        pop.kill(int(pid))
+    for _ in range(n_exit):
+        spawn_ephemeral(pop, parents, args, rng)
+
+
+def snapshot_frames(pop: Population, total_mb: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Return (process frame, system frame) for the current population.
+    """
+    proc = pd.DataFrame([
+        {
+            "PID": pid, "PPID": p["PPID"], "USER": p["USER"],
+            "RSS_MB": int(p["rss"]), "VSZ_MB": int(p["rss"] * 4), "CMD": p["CMD"],
+        }
+        for pid, p in pop.live.items()
+    ]).sort_values("RSS_MB", ascending=False)
+
+    used = int(min(proc["RSS_MB"].sum(), total_mb * 0.95))
+    cached = int((total_mb - used) * 0.5)
+    swap_total = total_mb // 4
+    sys = pd.DataFrame([{
+        "MemTotal_MB": total_mb, "MemFree_MB": total_mb - used - cached, "MemAvailable_MB": total_mb - used,
+        "Buffers_MB": 200, "Cached_MB": cached, "SwapCached_MB": 20,
+        "Active(anon)_MB": int(used * 0.7), "Inactive(anon)_MB": int(used * 0.2),
+        "SwapTotal_MB": swap_total, "SwapFree_MB": swap_total - min(swap_total, used // 20),
+        "AnonPages_MB": int(used * 0.9), "SReclaimable_MB": 300, "SUnreclaim_MB": 150,
+        "PageTables_MB": max(1, used // 200), "CommitLimit_MB": total_mb // 2 + swap_total,
+        "Committed_AS_MB": int(used * 1.6), "AnonHugePages_MB": 0,
+        "HugePages_Total": 0, "HugePages_Free": 0,
+    }])
+    return proc, sys
+
+
+def generate(args: argparse.Namespace) -> int:
+    """
+    Write all dumps into `args.out`; return the number of snapshots.
+    """
+    rng = np.random.default_rng(args.seed)
+    out: Path = args.out
+    out.mkdir(parents=True, exist_ok=True)
+
+    n_snapshots = max(1, int(args.days * 86400 // args.interval))
+    start = pd.Timestamp(args.start)
+    pop = build_population(args, rng)
+    ext = ".csv" + {"gzip": ".gz", "zstd": ".zst"}.get(args.compress, "")
+    for i in range(n_snapshots):
+        if i:
+            step(pop, args, rng, args.interval / 3600)
+        stamp = (start + pd.Timedelta(seconds=i * args.interval)).strftime("%Y%m%d_%H%M%S")
+        proc, sys = snapshot_frames(pop, args.total_mb)
+        proc.to_csv(out / f"process_mem_{stamp}{ext}", index=False, encoding="utf-8", compression=args.compress)
+        sys.to_csv(out / f"sys_mem_{stamp}{ext}", index=False, encoding="utf-8", compression=args.compress)
+    return n_snapshots
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate synthetic memory dumps.")
+    parser.add_argument("--out", type=Path, default=Path("dumps/bench"), help="Output directory.")
+    parser.add_argument("--processes", type=int, default=2000, help="Live processes per snapshot.")
+    parser.add_argument("--depth", type=int, default=4, help="Depth of service subtrees.")
+    parser.add_argument("--ephemeral-share", type=float, default=0.3, help="Share of short-lived processes.")
+    parser.add_argument("--churn", type=float, default=0.5, help="Share of short-lived processes replaced per snapshot.")
+    parser.add_argument("--pid-reuse", type=float, default=0.1, help="Probability a new process reuses a freed PID.")
+    parser.add_argument("--pid-max", type=int, default=32768, help="PID wrap-around limit.")
+    parser.add_argument("--leak-share", type=float, default=0.02, help="Share of services that leak.")
+    parser.add_argument("--cmd-len", type=int, default=200, help="Approximate length of long command lines.")
+    parser.add_argument("--days", type=float, default=1.0, help="Days of history.")
+    parser.add_argument("--interval", type=int, default=600, help="Seconds between snapshots.")
+    parser.add_argument("--start", default="2025-01-01 00:00:00", help="Time of the first snapshot.")
+    parser.add_argument("--total-mb", type=int, default=65536, help="MemTotal of the synthetic host.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--compress", choices=["gzip", "zstd"], help="Write .csv.gz / .csv.zst dumps.")
+    return parser
+
+
+def main() -> None:
+    """
+    Parse CLI arguments and write the dumps.
+    """
+    args = build_parser().parse_args()
+    t0 = time.perf_counter()
+    n = generate(args)
+    print(f"Wrote {n} snapshots of ~{args.processes} processes to '{args.out}' in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
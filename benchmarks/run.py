@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# benchmarks/run.py
+
+"""
+Time the analysis pipeline and every web route on synthetic dumps.
+
+Each scenario is run `--repeat` times for latency (median / min) and once
+more under tracemalloc for peak Python-side allocation. Results can be
+saved with `--json` and compared against a previous run with `--compare`;
+scenarios slower than `--threshold` × baseline are reported and make the
+script exit with status 1.
+
+Routes are exercised through FastAPI's TestClient, which needs `httpx`.
+
+    python benchmarks/run.py --processes 5000 --days 2
+    python benchmarks/run.py --dumps dumps/time --only route
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import pandas as pd  # noqa: E402
+
+import gen_dumps  # noqa: E402
+
+
+ROUTES: List[str] = [
+    "/api/v1/",
+    "/api/v1/snapshot/level?lvl=0",
+    "/api/v1/snapshot/level?lvl=1&min_life=0&min_rss=0&min_subtree=0",
+    "/api/v1/snapshot/pid/plot?pid={root_pid}",
+    "/api/v1/snapshot/diff",
+    "/api/v1/topn",
+    "/api/v1/groups",
+    "/api/v1/leaks",
+    "/api/v1/debug/memory",
+]
+"""Route scenarios; `{root_pid}` is a long-lived PID with children (see pick_root_pid)."""
+
+
+Scenario = Tuple[str, Callable[[], object]]
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Return median/min latency in ms and tracemalloc peak in MB for `fn`.
+    """
+    times: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_ms": statistics.median(times),
+        "min_ms": min(times),
+        "peak_mb": peak / 2**20,
+    }
+
+
+def pick_root_pid(full: pd.DataFrame) -> int:
+    """
+    Return a PID present in every snapshot that has the fewest (but some)
+    children, so per-child work in the PID views stays comparable between
+    runs; override with --root-pid.
+    """
+    root = os.environ.get("BENCH_ROOT_PID")
+    if root:
+        return int(root)
+    seen = full.groupby("PID").size()
+    stable = seen[seen == seen.max()].index
+    children = full[full["PPID"].isin(stable)].groupby("PPID")["PID"].nunique()
+    children = children.drop(index=1, errors="ignore")
+    return int(children.idxmin()) if not children.empty else int(stable[0])
+
+
+def core_scenarios(dumps: Path) -> List[Scenario]:
+    """
+    Return scenarios for the domain layer, fed from raw CSV loading.
+    """
+    from adapters.dumps_reader import load_process_df
+    from domain.analysis.timeseries import pid_timeseries
+    from domain.analysis.tree_stats import aggregate, build, build_subtree
+    from domain.filters import ProcessFilter
+
+    mask = dumps / "process_mem_*.csv*"
+    full = load_process_df(mask)
+    last = full["TIMESTAMP"].max()
+    snap = full[full["TIMESTAMP"] == last]
+    pf = ProcessFilter(min_lifetime_s=0, min_rss_mb=0, min_subtree_rss_mb=0, limit=10**9)
+    proc_stats = aggregate(full)
+    stats = build(proc_stats, snap, pf)
+    root = pick_root_pid(full)
+
+    return [
+        ("load_process_df", lambda: load_process_df(mask)),
+        ("tree_stats.aggregate", lambda: aggregate(full)),
+        ("tree_stats.build", lambda: build(proc_stats, snap, pf)),
+        ("pid_timeseries", lambda: pid_timeseries(full, root)),
+        ("build_subtree", lambda: build_subtree(stats, root)),
+    ]
+
+
+def store_scenarios(dumps: Path, store_dir: Path) -> List[Scenario]:
+    """
+    Return scenarios for a cold store ingest and a full-history read.
+    """
+    import shutil
+
+    from adapters.snapshot_store import SnapshotStore
+
+    mask = dumps / "process_mem_*.csv*"
+
+    cold_dir = store_dir.with_name(store_dir.name + "-cold")
+
+    def cold_ingest() -> None:
+        shutil.rmtree(cold_dir, ignore_errors=True)
+        SnapshotStore(cold_dir, mask).refresh()
+
+    SnapshotStore(store_dir, mask).refresh()
+    store = SnapshotStore(store_dir, mask)
+    return [
+        ("store.ingest (cold)", cold_ingest),
+        ("store.frame (full)", lambda: SnapshotStore(store_dir, mask).frame()),
+        ("store.frame (snapshot)", lambda: store.frame(store.snapshot_rows(store.n_snapshots - 1))),
+    ]
+
+
+def route_scenarios(dumps: Path, store_dir: Path) -> List[Scenario]:
+    """
+    Return one scenario per entry of ROUTES, served by the real app.
+    """
+    os.environ["DUMPS_DIR"] = str(dumps)
+    os.environ["STORE_DIR"] = str(store_dir)
+    os.chdir(ROOT)
+
+    from fastapi.testclient import TestClient
+
+    from adapters.snapshot_store import SnapshotStore
+    from app import create_app
+
+    client = TestClient(create_app(), follow_redirects=False)
+    full = SnapshotStore(store_dir, dumps / "process_mem_*.csv*").frame()
+    root = pick_root_pid(full)
+
+    def get(url: str) -> Callable[[], object]:
+        def call() -> None:
+            r = client.get(url)
+            if r.status_code >= 400:
+                raise RuntimeError(f"{url} → {r.status_code}")
+        return call
+
+    return [(f"route {url.format(root_pid=root)}", get(url.format(root_pid=root))) for url in ROUTES]
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """
+    Return descriptions of scenarios slower than `threshold` × baseline.
+    """
+    slow: List[str] = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if base and res["median_ms"] > base["median_ms"] * threshold:
+            slow.append(f"{name}: {base['median_ms']:.1f} → {res['median_ms']:.1f} ms")
+    return slow
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = gen_dumps.build_parser()
+    parser.description = "Benchmark loaders, analyses and routes on synthetic dumps."
+    parser.add_argument("--dumps", type=Path, help="Use existing dumps instead of generating.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per scenario.")
+    parser.add_argument("--only", help="Run only scenarios whose name contains this.")
+    parser.add_argument("--root-pid", type=int, help="PID used by pid_timeseries/build_subtree and PID routes.")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file.")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON from a previous run.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as regression.")
+    return parser
+
+
+def main() -> None:
+    """
+    Generate (or reuse) dumps, run all scenarios and print a report.
+    """
+    args = build_parser().parse_args()
+    if args.root_pid:
+        os.environ["BENCH_ROOT_PID"] = str(args.root_pid)
+    warnings.simplefilter("ignore", pd.errors.SettingWithCopyWarning)
+
+    with tempfile.TemporaryDirectory(prefix="pmi-bench-") as tmp:
+        dumps = args.dumps
+        if dumps is None:
+            dumps = args.out = Path(tmp) / "dumps"
+            gen_dumps.generate(args)
+        dumps = dumps.resolve()
+        store_dir = Path(tmp) / "store"
+
+        scenarios = core_scenarios(dumps) + store_scenarios(dumps, store_dir) + route_scenarios(dumps, store_dir)
+        if args.only:
+            scenarios = [s for s in scenarios if args.only in s[0]]
+
+        n_files = len(list(dumps.glob("process_mem_*")))
+        print(f"dumps: {dumps} ({n_files} snapshots)")
+        print(f"{'scenario':<70} {'median ms':>10} {'min ms':>10} {'peak MB':>9}")
+
+        results: Dict[str, dict] = {}
+        for name, fn in scenarios:
+            res = measure(fn, args.repeat)
+            results[name] = res
+            print(f"{name:<70} {res['median_ms']:>10.1f} {res['min_ms']:>10.1f} {res['peak_mb']:>9.1f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.compare:
+        slow = compare(results, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold)
+        for line in slow:
+            print(f"REGRESSION {line}")
+        if slow:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,241 @@
 
 """
 Run periodic memory collection and dump CSVs into dumps/time/.
+
+Besides the dumps, every tick appends one row to `collector_metrics.csv`
+in the same directory: time spent reading meminfo, scanning processes,
+serializing and writing, the collector's own CPU and RSS, how late the
+tick started and how many ticks were skipped because the previous one
+overran.
+
+Process dumps are interned by default: USER, CMD and CGROUP strings go
+once into `process_strings.csv` and each tick row references them by id
+(USER_ID / CMD_ID / CGROUP_ID); `--plain` writes the strings inline
+instead. Command lines (and cgroups) are read only for processes not seen
+before (new pid or starttime); `--reread-cmdline` re-reads them every tick
+to catch exec() changes.
+
+Each tick also writes `cgroup_mem_<stamp>.csv` with the kernel's
+`memory.current` of every cgroup holding a process, and of its ancestors.
+
+When the collector's CPU use exceeds `--cpu-budget` (percent of one core
+over the tick interval) it drops to reduced detail: ticks are spaced
+`REDUCED_INTERVAL_FACTOR` times further apart, the per-cgroup
+`memory.current` dump is skipped and, with `--reread-cmdline`, command
+lines of known processes are no longer re-read. Expect wider gaps between
+dumps and no `cgroup_mem_*` files meanwhile. Full detail resumes once a
+tick's usage falls below half the budget. Both switches are reported on
+stderr and every row of `collector_metrics.csv` records the detail level;
+a high `--cpu-budget` keeps full detail at any cost.
+
+System rows also carry memory pressure (PSI_* from /proc/pressure/memory)
+and /proc/vmstat counters (pgmajfault, oom_kill, ...). With
+`--pressure-threshold` the collector polls PSI between ticks and takes an
+extra snapshot as soon as "some" avg10 reaches the threshold or the OOM
+killer fires, so the run-up to an OOM is captured without raising the
+base interval.
+
+With `--compress gzip` or `--compress zstd` (needs `zstandard`) every dump
+is written as `<name>.csv.gz` / `<name>.csv.zst`; the app reads both
+transparently. `process_strings.csv` and the metrics file stay plain since
+they are appended to.
 """
 
+import argparse
+import gzip
+import io
+import sys
 import time
 from pathlib import Path
+from typing import Callable, Dict, Optional
+
+# The /proc readers live in src/utils/meminfo.py, shared with the app. The
+# collector's own helpers are in `collector`, a name of their own, so
+# `utils` here is only ever src/utils.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pandas as pd  # noqa: E402
 
-import pandas as pd
+from utils.meminfo import (  # noqa: E402
+    ProcessScanner,
+    get_cgroup_memory,
+    get_meminfo,
+    get_own_usage,
+    get_pressure,
+    get_vmstat,
+)
+from collector.strings import StringDictionary  # noqa: E402
 
-from utils.memory import get_meminfo, get_process_info
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
 
 
 DEFAULT_SLEEP_SECONDS = 600
+DEFAULT_CPU_BUDGET_PCT = 1.0
+REDUCED_INTERVAL_FACTOR = 2
+"""Tick interval multiplier while the collector is over its CPU budget."""
+METRICS_FILE = "collector_metrics.csv"
+
+Compressor = Callable[[bytes], bytes]
+
+SUFFIXES: Dict[str, str] = {"gzip": ".gz", "zstd": ".zst"}
+"""File suffix appended to `.csv` per codec (see adapters/dumps_reader.py)."""
+
+
+def make_compressor(codec: Optional[str], level: Optional[int]) -> Optional[Compressor]:
+    """
+    Return a bytes → bytes compressor for `codec`, or None for plain dumps.
+    """
+    if codec == "gzip":
+        lvl = 6 if level is None else level
+        return lambda data: gzip.compress(data, compresslevel=lvl, mtime=0)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress
+    return None
+
+
+def write_csv(
+    df: pd.DataFrame,
+    path: Path,
+    timings: Dict[str, float],
+    key: str,
+    compress: Optional[Compressor] = None,
+) -> None:
+    """
+    Write `df` to `path`, adding serialize/compress/write durations (ms) to `timings`.
+    """
+    t0 = time.perf_counter()
+    data = df.to_csv(index=False).encode("utf-8")
+    t1 = time.perf_counter()
+    if compress is not None:
+        data = compress(data)
+    t2 = time.perf_counter()
+    path.write_bytes(data)
+    t3 = time.perf_counter()
+    timings[f"{key}_serialize_ms"] = (t1 - t0) * 1000
+    timings[f"{key}_compress_ms"] = (t2 - t1) * 1000
+    timings[f"{key}_write_ms"] = (t3 - t2) * 1000
+    timings[f"{key}_bytes"] = len(data)
+
+
+def append_metrics(path: Path, row: Dict[str, object]) -> None:
+    """
+    Append one row to the collector metrics CSV, writing a header if new.
+    """
+    buf = io.StringIO()
+    pd.DataFrame([row]).to_csv(buf, index=False, header=not path.exists(), float_format="%.3f")
+    with path.open("a", encoding="utf-8") as f:
+        f.write(buf.getvalue())
+
+
+def collect_tick(
+    outdir: Path,
+    scanner: ProcessScanner,
+    strings: Optional[StringDictionary],
+    reread_cmdline: bool,
+    codec: Optional[str] = None,
+    compress: Optional[Compressor] = None,
+    cgroups: bool = True,
+) -> Dict[str, float]:
+    """
+    Write one set of dumps; return per-stage durations in ms and bytes written.
+
+    Without `cgroups` the cgroup_mem_ dump is not read or written.
+    """
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    ext = ".csv" + SUFFIXES.get(codec, "")
+    timings: Dict[str, float] = {}
+
+    t0 = time.perf_counter()
+    df_sys = pd.DataFrame([{**get_meminfo(), **get_pressure(), **get_vmstat()}])
+    t1 = time.perf_counter()
+    df_proc = scanner.scan(reread_cmdline=reread_cmdline)
+    df_cgroup = get_cgroup_memory(df_proc["CGROUP"].unique()) if cgroups else None
+    t2 = time.perf_counter()
+    if strings is not None:
+        df_proc = strings.encode(df_proc)
+    t3 = time.perf_counter()
+    timings["meminfo_ms"] = (t1 - t0) * 1000
+    timings["scan_ms"] = (t2 - t1) * 1000
+    timings["intern_ms"] = (t3 - t2) * 1000
+
+    write_csv(df_sys, outdir / f"sys_mem_{timestamp}{ext}", timings, "sys", compress)
+    write_csv(df_proc, outdir / f"process_mem_{timestamp}{ext}", timings, "proc", compress)
+    if df_cgroup is not None:
+        write_csv(df_cgroup, outdir / f"cgroup_mem_{timestamp}{ext}", timings, "cgroup", compress)
+    timings["processes"] = len(df_proc)
+    timings["oom_kill"] = int(df_sys.get("oom_kill", pd.Series([0])).iloc[0])
+    timings["cmdline_reads"] = scanner.cmdline_reads
+    return timings
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Periodically dump system and process memory metrics.")
+    parser.add_argument("--outdir", type=Path, default=Path("dumps/time"), help="Directory for the dumps.")
+    parser.add_argument("--interval", type=float, default=DEFAULT_SLEEP_SECONDS, help="Seconds between ticks.")
+    parser.add_argument(
+        "--cpu-budget",
+        type=float,
+        default=DEFAULT_CPU_BUDGET_PCT,
+        help=(
+            "Collector CPU budget, percent of one core. Above it the collector ticks at "
+            f"{REDUCED_INTERVAL_FACTOR}x the interval and skips cgroup dumps (and --reread-cmdline) "
+            "until usage drops below half the budget."
+        ),
+    )
+    parser.add_argument("--plain", action="store_true", help="Write USER/CMD strings inline, not interned.")
+    parser.add_argument(
+        "--pressure-threshold",
+        type=float,
+        help="Take an extra snapshot when memory PSI 'some' avg10 reaches this percent (or an OOM kill happens).",
+    )
+    parser.add_argument("--pressure-poll", type=float, default=1.0, help="Seconds between pressure checks.")
+    parser.add_argument(
+        "--pressure-cooldown",
+        type=float,
+        default=30.0,
+        help="Minimum seconds between pressure-triggered snapshots.",
+    )
+    parser.add_argument(
+        "--reread-cmdline",
+        action="store_true",
+        help="Re-read command lines of known processes every tick (within the CPU budget).",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=sorted(SUFFIXES),
+        help="Compress dumps (.csv.gz / .csv.zst); zstd needs the zstandard package.",
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        help="Codec level (gzip 1-9, default 6; zstd 1-22, default 3).",
+    )
+    return parser
+
+
+def wait_for_tick(deadline: float, args: argparse.Namespace, last_extra: float, oom_kills: int) -> str | None:
+    """
+    Sleep until `deadline`; return "pressure" or "oom" early when an extra
+    snapshot is due, None when the regular tick is.
+
+    Pressure is only watched with --pressure-threshold, at most one extra
+    snapshot per --pressure-cooldown seconds.
+    """
+    if args.pressure_threshold is None:
+        time.sleep(max(0.0, deadline - time.monotonic()))
+        return None
+    while (remaining := deadline - time.monotonic()) > 0:
+        time.sleep(min(args.pressure_poll, remaining))
+        if time.monotonic() - last_extra < args.pressure_cooldown:
+            continue
+        if get_vmstat().get("oom_kill", 0) > oom_kills:
+            return "oom"
+        if get_pressure().get("PSI_some_avg10", 0.0) >= args.pressure_threshold:
+            return "pressure"
+    return None
 
 
 def main() -> None:
@@ -21,19 +245,74 @@ def main() -> None:
     Create target directory and periodically write system
     and process memory metrics to timestamped CSV files.
     """
-    outdir: Path = Path("dumps/time")
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.compress == "zstd" and zstandard is None:
+        parser.error("--compress zstd needs the zstandard package: pip install 'pid-memory-inspector[zstd]'")
+    compress = make_compressor(args.compress, args.compress_level)
+    outdir: Path = args.outdir
     outdir.mkdir(parents=True, exist_ok=True)
+    metrics_path = outdir / METRICS_FILE
 
+    scanner = ProcessScanner()
+    strings = None if args.plain else StringDictionary(outdir)
+    reduced = False
+    next_tick = time.monotonic()
+    last_extra = float("-inf")
+    trigger = "tick"
     while True:
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        started = time.monotonic()
+        interval = args.interval * (REDUCED_INTERVAL_FACTOR if reduced else 1)
+        late_s = max(0.0, started - next_tick) if trigger == "tick" else 0.0
+        skipped = int(late_s // interval)
+        usage_before = get_own_usage()
+
+        timings = collect_tick(
+            outdir,
+            scanner,
+            strings,
+            args.reread_cmdline and not reduced,
+            args.compress,
+            compress,
+            cgroups=not reduced,
+        )
 
-        df_sys = pd.DataFrame([get_meminfo()])
-        df_sys.to_csv(outdir / f"sys_mem_{timestamp}.csv", index=False, encoding="utf-8")
+        usage = get_own_usage()
+        elapsed = time.monotonic() - started
+        cpu_s = usage["cpu_s"] - usage_before["cpu_s"]
+        cpu_pct = 100 * cpu_s / interval
+        append_metrics(metrics_path, {
+            "TIMESTAMP": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "trigger": trigger,
+            **timings,
+            "total_ms": elapsed * 1000,
+            "cpu_ms": cpu_s * 1000,
+            "cpu_pct": cpu_pct,
+            "rss_mb": usage["rss_mb"],
+            "late_s": late_s,
+            "skipped_ticks": skipped,
+            "detail": "reduced" if reduced else "full",
+        })
 
-        df_proc = get_process_info()
-        df_proc.to_csv(outdir / f"process_mem_{timestamp}.csv", index=False, encoding="utf-8")
+        if not reduced and cpu_pct > args.cpu_budget:
+            reduced = True
+            print(
+                f"collector CPU {cpu_pct:.1f}% over budget {args.cpu_budget}%: reduced detail, "
+                f"ticking every {args.interval * REDUCED_INTERVAL_FACTOR:g}s without cgroup dumps",
+                file=sys.stderr,
+                flush=True,
+            )
+        elif reduced and cpu_pct < args.cpu_budget / 2:
+            reduced = False
+            print(f"collector CPU {cpu_pct:.1f}% back under budget: full detail", file=sys.stderr, flush=True)
 
-        time.sleep(DEFAULT_SLEEP_SECONDS)
+        if trigger == "tick":
+            next_tick += (skipped + 1) * interval
+        else:
+            last_extra = started
+        # Dump names have one-second resolution; never reuse a stamp.
+        time.sleep(max(0.0, 1.0 - (time.monotonic() - started)))
+        trigger = wait_for_tick(next_tick, args, last_extra, int(timings.get("oom_kill", 0))) or "tick"
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+# scripts/collector/strings.py
+
+"""
+Append-only string dictionary for interned process dumps.
+
+`process_strings.csv` holds one row per distinct string with columns
+COLUMN (USER, CMD or CGROUP), ID (dense per column, from 0) and VALUE.
+Process dumps written in interned form carry USER_ID / CMD_ID / CGROUP_ID
+instead of the strings themselves.
+"""
+
+import csv
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+
+STRINGS_FILE = "process_strings.csv"
+INTERNED_COLUMNS: tuple[str, ...] = ("USER", "CMD", "CGROUP")
+
+
+class StringDictionary:
+    """
+    String → id mapping persisted to `STRINGS_FILE` in the dump directory.
+
+    Existing entries are loaded on start, so ids stay stable across
+    collector restarts.
+    """
+
+    def __init__(self, outdir: Path) -> None:
+        self.path = outdir / STRINGS_FILE
+        self._ids: Dict[str, Dict[str, int]] = {col: {} for col in INTERNED_COLUMNS}
+        if self.path.exists():
+            with self.path.open(newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    self._ids[row["COLUMN"]][row["VALUE"]] = int(row["ID"])
+
+    def encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return `df` with USER/CMD/CGROUP replaced by their *_ID columns.
+
+        New strings are appended to the dictionary file (and flushed)
+        before the frame is returned, so a dump never references an id
+        that is not on disk yet.
+        """
+        new: List[List[object]] = []
+        out = df.copy()
+        for col in INTERNED_COLUMNS:
+            ids = self._ids[col]
+            for value in df[col].unique():
+                if value not in ids:
+                    ids[value] = len(ids)
+                    new.append([col, ids[value], value])
+            out.insert(out.columns.get_loc(col), f"{col}_ID", df[col].map(ids))
+            out = out.drop(columns=col)
+
+        if new:
+            header = not self.path.exists()
+            with self.path.open("a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                if header:
+                    writer.writerow(["COLUMN", "ID", "VALUE"])
+                writer.writerows(new)
+        return out
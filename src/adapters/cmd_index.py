@@ -0,0 +1,239 @@
+# src/adapters/cmd_index.py
+
+"""
+Trigram index over the distinct command lines of the store.
+
+The store already interns every CMD into an append-only string table, so
+the index only covers that table (thousands of strings, not millions of
+rows). Each string id is listed under every byte trigram of its
+lower-cased UTF-8 text; postings are kept as one sorted uint64 array of
+``trigram << 32 | cmd_id`` keys in ``<generation>/cmd-trigrams/upto-<S>/``
+(S = strings covered), with ``meta.json`` naming the current directory.
+New strings are merged in when they are interned, and the result goes to
+a fresh directory so workers mapping the previous one stay consistent.
+
+A substring query intersects the postings of its trigrams; a regex query
+those of the literal runs it requires. Candidates are then checked with
+the real pattern, so the index only ever narrows the scan.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import shutil
+import threading
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from adapters.snapshot_store import SnapshotStore, file_lock, map_array, write_json
+from utils.timing import timed
+
+
+_KEY = np.dtype("<u8")
+_META = "\\.^$*+?{}[]|()"
+
+_ESCAPE = re.compile(r"\\(?:x[0-9a-fA-F]{0,2}|u[0-9a-fA-F]{0,4}|U[0-9a-fA-F]{0,8}|N\{[^}]*\}|0[0-7]{0,2}|[1-7][0-7]{2}|\d{1,2}|.)")
+"""One whole regex escape: hex/unicode/named/octal escapes, backreferences, or a single character."""
+
+_VERBOSE = re.compile(r"\(\?[a-zA-Z-]*x")
+"""Inline flags turning on verbose mode, where whitespace and # comments are not literal."""
+
+
+def trigram_keys(strings: List[str], first_id: int) -> np.ndarray:
+    """
+    Return the sorted distinct trigram keys of `strings`, numbered from `first_id`.
+    """
+    data = [s.lower().encode("utf-8") for s in strings]
+    lens = np.fromiter((len(b) for b in data), dtype=np.int64, count=len(data))
+    if lens.sum() == 0:
+        return np.empty(0, dtype=_KEY)
+    buf = np.frombuffer(b"".join(data), dtype=np.uint8).astype(np.uint64)
+    owner = np.repeat(np.arange(len(data), dtype=np.uint64) + np.uint64(first_id), lens)
+    ends = np.repeat(np.cumsum(lens), lens)
+    pos = np.arange(len(buf))
+    ok = pos + 2 < ends
+    tri = (buf[:-2] << np.uint64(16)) | (buf[1:-1] << np.uint64(8)) | buf[2:]
+    keys = (tri[ok[:-2]] << np.uint64(32)) | owner[:-2][ok[:-2]]
+    return np.unique(keys)
+
+
+def _trigrams(text: str) -> np.ndarray:
+    b = np.frombuffer(text.lower().encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+    if len(b) < 3:
+        return np.empty(0, dtype=np.uint64)
+    return np.unique((b[:-2] << np.uint64(16)) | (b[1:-1] << np.uint64(8)) | b[2:])
+
+
+def _class_end(pattern: str, i: int) -> int:
+    """
+    Return the index just past the character class opened at `pattern[i]`.
+    """
+    j = i + 1
+    if pattern.startswith("^", j):
+        j += 1
+    if pattern.startswith("]", j):
+        j += 1
+    while j < len(pattern) and pattern[j] != "]":
+        j += 2 if pattern[j] == "\\" else 1
+    return j + 1
+
+
+def required_literals(pattern: str) -> List[str]:
+    """
+    Return literal runs every match of regex `pattern` must contain.
+
+    Conservative: only top-level runs outside groups and classes count, a
+    character made optional by ?, * or {...} is dropped, an escape other
+    than an escaped symbol ends the run, and a pattern with alternation or
+    inline verbose mode requires nothing.
+    """
+    if "|" in pattern or _VERBOSE.search(pattern):
+        return []
+    runs: List[str] = []
+    cur: List[str] = []
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        lit = None
+        if c == "\\" and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            if nxt.isalnum():
+                i += len(_ESCAPE.match(pattern, i).group())
+            else:
+                lit = nxt
+                i += 2
+        elif c == "[":
+            i = _class_end(pattern, i)
+        elif c == "{":
+            j = pattern.find("}", i)
+            i = len(pattern) if j < 0 else j + 1
+        elif c == "(":
+            depth += 1
+            i += 1
+        elif c == ")":
+            depth = max(depth - 1, 0)
+            i += 1
+        elif c in _META:
+            i += 1
+        else:
+            lit = c
+            i += 1
+
+        nxt = pattern[i] if i < len(pattern) else ""
+        if lit is not None and depth == 0 and nxt not in ("?", "*", "{"):
+            cur.append(lit)
+            if nxt != "+":
+                continue
+        if len(cur) >= 3:
+            runs.append("".join(cur))
+        cur = []
+    if len(cur) >= 3:
+        runs.append("".join(cur))
+    return runs
+
+
+class CmdIndex:
+    """
+    Incrementally maintained trigram postings for one store generation.
+    """
+
+    def __init__(self, store: SnapshotStore) -> None:
+        self._store = store
+        self.generation = store.generation
+        self._dir = store.derived_dir("cmd-trigrams")
+        self._keys = np.empty(0, dtype=_KEY)
+        self._done = -1
+
+    @timed("CmdIndex.catch_up")
+    def catch_up(self) -> None:
+        """
+        Index every CMD string interned since the last call.
+        """
+        stop = len(self._store.strings("cmd"))
+        if self._done == stop:
+            return
+        if self._read_meta()["done"] < stop:
+            with file_lock(self._dir / ".lock"):
+                meta = self._read_meta()
+                if meta["done"] < stop:
+                    self._extend(meta, stop)
+        self._load()
+
+    @timed("CmdIndex.search")
+    def search(self, pattern: str, regex: bool = False, case: bool = False) -> np.ndarray:
+        """
+        Return ids of the CMD strings matching `pattern`, ascending.
+
+        `pattern` is a substring unless `regex`; matching ignores case
+        unless `case`. An invalid regex raises `re.error`.
+        """
+        if regex:
+            re.compile(pattern)
+        strings = self._store.strings("cmd")[: self._done]
+        literals = required_literals(pattern) if regex else [pattern]
+        cand = None
+        for lit in literals:
+            for tri in _trigrams(lit):
+                ids = self._postings(tri)
+                cand = ids if cand is None else np.intersect1d(cand, ids, assume_unique=True)
+                if len(cand) == 0:
+                    return cand
+        if cand is None:
+            cand = np.arange(len(strings))
+        hit = pd.Series(strings[cand]).str.contains(pattern, case=case, regex=regex).to_numpy(bool)
+        return cand[hit]
+
+    def _postings(self, tri: np.uint64) -> np.ndarray:
+        lo, hi = np.searchsorted(self._keys, [tri << np.uint64(32), (tri + np.uint64(1)) << np.uint64(32)])
+        return (self._keys[lo:hi] & np.uint64(0xFFFFFFFF)).astype(np.int64)
+
+    def _read_meta(self) -> dict:
+        try:
+            return json.loads((self._dir / "meta.json").read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {"done": 0, "n": 0}
+
+    def _extend(self, meta: dict, stop: int) -> None:
+        """
+        Merge strings [meta["done"], stop) into the postings and commit meta.json.
+        """
+        start = meta["done"]
+        fresh = trigram_keys(list(self._store.strings("cmd")[start:stop]), start)
+        keys = fresh
+        if meta["n"]:
+            old = map_array(self._dir / meta["dir"] / "keys.bin", _KEY, meta["n"])
+            keys = np.insert(old, np.searchsorted(old, fresh), fresh)
+
+        out_dir = self._dir / f"upto-{stop}"
+        out_dir.mkdir(exist_ok=True)
+        (out_dir / "keys.bin").write_bytes(keys.astype(_KEY).tobytes())
+        write_json(self._dir / "meta.json", {"done": stop, "n": len(keys), "dir": out_dir.name})
+        for old_dir in self._dir.glob("upto-*"):
+            if old_dir != out_dir:
+                shutil.rmtree(old_dir, ignore_errors=True)
+
+    def _load(self) -> None:
+        meta = self._read_meta()
+        self._keys = map_array(self._dir / meta.get("dir", "") / "keys.bin", _KEY, meta["n"])
+        self._done = meta["done"]
+
+
+_INDEXES: Dict[int, CmdIndex] = {}
+_LOCK = threading.Lock()
+
+
+def open_cmd_index(store: SnapshotStore) -> CmdIndex:
+    """
+    Return the shared CMD trigram index of `store`, caught up with its strings.
+    """
+    key = id(store)
+    with _LOCK:
+        index = _INDEXES.get(key)
+        if index is None or index.generation != store.generation:
+            index = _INDEXES[key] = CmdIndex(store)
+        index.catch_up()
+    return index
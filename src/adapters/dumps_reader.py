@@ -1,35 +1,209 @@
 # src/adapters/dumps_reader.py
 
 import glob
+import gzip
+import io
+import threading
 from pathlib import Path
-from typing import Union
+from typing import IO, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
+from pandas.api.types import union_categoricals
 
 from utils.parser import parse_timestamp
+from utils.timing import timed
 
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
 
+
+PROCESS_DTYPES: Dict[str, str] = {
+    "PID": "int32",
+    "PPID": "int32",
+    "USER": "category",
+    "RSS_MB": "uint32",
+    "VSZ_MB": "uint32",
+    "CMD": "category",
+    "CGROUP": "category",
+}
+"""Compact column dtypes of a loaded process frame."""
+
+PROCESS_COLUMNS: List[str] = list(PROCESS_DTYPES)
+
+CATEGORICAL_COLS: tuple[str, ...] = ("USER", "CMD", "CGROUP")
+
+STRINGS_FILE = "process_strings.csv"
+"""Side dictionary of interned dumps (see scripts/collector/strings.py)."""
+
+INTERNED_DTYPES: Dict[str, str] = {
+    "PID": "int32",
+    "PPID": "int32",
+    "USER_ID": "int32",
+    "RSS_MB": "uint32",
+    "VSZ_MB": "uint32",
+    "CMD_ID": "int32",
+    "CGROUP_ID": "int32",
+}
+
+COMPRESSION_SUFFIXES: Dict[str, str] = {"gzip": ".gz", "zstd": ".zst"}
+"""Suffix appended to `.csv` by each dump codec the collector can write."""
+
+_DICTS: Dict[Path, Tuple[int, Dict[str, pd.Index]]] = {}
+_DICTS_LOCK = threading.Lock()
+
+
+def string_dictionary(dumps_dir: Path) -> Dict[str, pd.Index]:
+    """
+    Return USER/CMD/CGROUP strings of an interned dump directory, indexed by id.
+
+    The file is append-only, so a cached copy is extended with the bytes
+    written since it was last read instead of being parsed again.
+    """
+    path = Path(dumps_dir) / STRINGS_FILE
+    empty = {col: pd.Index([], dtype=object) for col in CATEGORICAL_COLS}
+    with _DICTS_LOCK:
+        offset, strings = _DICTS.get(path, (0, empty))
+        if path.stat().st_size < offset:
+            offset, strings = 0, empty
+        with path.open("rb") as f:
+            f.seek(offset)
+            tail = f.read()
+        # Only consume complete lines; a collector may be mid-write.
+        end = tail.rfind(b"\n") + 1
+        if end:
+            new = pd.read_csv(
+                io.BytesIO(tail[:end]),
+                header=0 if offset == 0 else None,
+                names=["COLUMN", "ID", "VALUE"],
+                dtype={"COLUMN": str, "ID": "int64", "VALUE": str},
+                keep_default_na=False,
+            ).sort_values("ID", kind="stable")
+            strings = {
+                col: idx.append(pd.Index(new.loc[new["COLUMN"] == col, "VALUE"], dtype=object))
+                for col, idx in strings.items()
+            }
+            _DICTS[path] = (offset + end, strings)
+        return strings
+
+
+def open_dump(path: Union[str, Path]) -> IO[bytes]:
+    """
+    Open a dump for binary reading, decompressing `.csv.gz` / `.csv.zst` as a stream.
+
+    Data is inflated chunk by chunk as the CSV parser consumes it, so a
+    compressed dump never needs a decompressed copy on disk or in memory.
+    The zstd reader is wrapped in `io.BufferedReader` since on its own it
+    has no `readline`.
+    """
+    path = Path(path)
+    if path.suffix == COMPRESSION_SUFFIXES["gzip"]:
+        return gzip.open(path, "rb")
+    if path.suffix == COMPRESSION_SUFFIXES["zstd"]:
+        if zstandard is None:
+            raise RuntimeError(f"{path.name} is zstd-compressed: pip install 'pid-memory-inspector[zstd]'")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(path.open("rb"), closefd=True))
+    return path.open("rb")
+
+
+def find_dump(dumps_dir: Union[str, Path], prefix: str, ts_str: str) -> Optional[Path]:
+    """
+    Return the `<prefix><ts_str>.csv` dump of `dumps_dir`, plain or compressed, or None.
+    """
+    base = Path(dumps_dir) / f"{prefix}{ts_str}.csv"
+    for suffix in ("", *COMPRESSION_SUFFIXES.values()):
+        path = base.with_name(base.name + suffix)
+        if path.exists():
+            return path
+    return None
+
+
+def _read_csv(path: Union[str, Path], **kwargs) -> pd.DataFrame:
+    with open_dump(path) as f:
+        return pd.read_csv(f, **kwargs)
+
+
+@timed()
+def read_process_csv(path: Union[str, Path]) -> pd.DataFrame:
+    """
+    Return a single process dump with compact dtypes and TIMESTAMP column.
+
+    Interned dumps (USER_ID / CMD_ID / CGROUP_ID columns) are resolved
+    against the directory's string dictionary as categoricals, so each
+    string is materialised once per frame rather than once per row. Dumps
+    written before cgroups were recorded get an empty CGROUP.
+    """
+    path = Path(path)
+    with open_dump(path) as f:
+        header = f.readline()
+    if b"CMD_ID" in header:
+        df = _read_csv(path, dtype=INTERNED_DTYPES)
+        strings = string_dictionary(path.parent)
+        for col in CATEGORICAL_COLS:
+            if f"{col}_ID" not in df.columns:
+                continue
+            codes = df.pop(f"{col}_ID")
+            df.insert(PROCESS_COLUMNS.index(col), col, pd.Categorical.from_codes(codes, categories=strings[col]))
+            df[col] = df[col].cat.remove_unused_categories()
+    else:
+        df = _read_csv(path, dtype=PROCESS_DTYPES)
+    if "CGROUP" not in df.columns:
+        df.insert(PROCESS_COLUMNS.index("CGROUP"), "CGROUP", pd.Categorical([""] * len(df)))
+    df["TIMESTAMP"] = parse_timestamp(str(path), "process_mem_")
+    return df
+
+
+def concat_process_frames(dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Return process frames concatenated without losing categorical dtypes.
+
+    Frames read separately carry different category sets; they are aligned
+    to a shared set first so that pandas does not fall back to object.
+    """
+    for col in CATEGORICAL_COLS:
+        cats = union_categoricals([df[col] for df in dfs], ignore_order=True).categories
+        for df in dfs:
+            df[col] = df[col].cat.set_categories(cats)
+    return pd.concat(dfs, ignore_index=True)
+
+
+def read_cgroup_csv(path: Union[str, Path]) -> pd.DataFrame:
+    """
+    Return a single cgroup dump (CGROUP, MEMORY_CURRENT_MB) with TIMESTAMP column.
+    """
+    df = _read_csv(path, dtype={"CGROUP": str, "MEMORY_CURRENT_MB": "uint32"}, keep_default_na=False)
+    df["TIMESTAMP"] = parse_timestamp(str(path), "cgroup_mem_")
+    return df
+
+
+def read_system_csv(path: Union[str, Path]) -> pd.DataFrame:
+    """
+    Return a single system dump with TIMESTAMP column.
+    """
+    df = _read_csv(path)
+    df["TIMESTAMP"] = parse_timestamp(str(path), "sys_mem_")
+    return df
+
+
+@timed()
 def load_system_df(glob_mask: Union[str, Path]) -> pd.DataFrame:
     """
     Return system memory metrics across all matching dumps, with TIMESTAMP column.
     """
-    dfs: list[pd.DataFrame] = []
-    for fname in glob.iglob(str(glob_mask)):
-        ts = parse_timestamp(fname, "sys_mem_")
-        df = pd.read_csv(fname)
-        df["TIMESTAMP"] = ts
-        dfs.append(df)
+    dfs = [read_system_csv(fname) for fname in glob.iglob(str(glob_mask))]
+    if not dfs:
+        return pd.DataFrame()
     return pd.concat(dfs, ignore_index=True).sort_values("TIMESTAMP")
 
 
+@timed()
 def load_process_df(glob_mask: Union[str, Path]) -> pd.DataFrame:
     """
     Return per-process memory snapshots from all matching dumps, with TIMESTAMP column.
+
+    PIDs are int32, MB values uint32 and USER/CMD/CGROUP categorical, so repeated
+    command lines are stored once instead of once per snapshot row.
     """
-    dfs: list[pd.DataFrame] = []
-    for fname in glob.iglob(str(glob_mask)):
-        ts = parse_timestamp(fname, "process_mem_")
-        df = pd.read_csv(fname)
-        df["TIMESTAMP"] = ts
-        dfs.append(df)
-    return pd.concat(dfs, ignore_index=True).sort_values(["PID", "TIMESTAMP"])
+    dfs = [read_process_csv(fname) for fname in glob.iglob(str(glob_mask))]
+    return concat_process_frames(dfs).sort_values(["PID", "TIMESTAMP"])
@@ -0,0 +1,182 @@
+# src/adapters/embedded_collector.py
+
+"""
+In-process sampler: the app collects its own dumps.
+
+Every tick the process table is appended straight into the snapshot store
+and the system row is kept in memory, so pages and live streams see a
+sample as soon as it is taken. Dumps are written to `dumps_dir` in the
+collector's CSV format every `collector_flush_every` ticks (and on
+shutdown), compressed with `collector_compression` if set; until then the
+store lists them as pending.
+
+With several app workers only the one holding `<dumps_dir>/.collector.lock`
+samples; the others pick up its process snapshots from the store like any
+other ingest, and its system rows once they are flushed.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from adapters.dumps_reader import COMPRESSION_SUFFIXES, zstandard
+from adapters.snapshot_store import SnapshotStore
+from config.settings import Settings
+from utils.meminfo import ProcessScanner, get_cgroup_memory, get_meminfo, get_pressure, get_vmstat
+
+log = logging.getLogger(__name__)
+
+
+class EmbeddedCollector:
+    """
+    Background thread that samples memory into a store and flushes dumps.
+    """
+
+    def __init__(self, settings: Settings, store: SnapshotStore) -> None:
+        self._dumps_dir = Path(settings.dumps_dir)
+        self._interval = max(1.0, settings.collector_interval_s)
+        self._flush_every = max(1, settings.collector_flush_every)
+        self._compression = settings.collector_compression or None
+        if self._compression not in (None, *COMPRESSION_SUFFIXES):
+            raise ValueError(
+                f"COLLECTOR_COMPRESSION must be empty, 'gzip' or 'zstd', not {self._compression!r}"
+            )
+        if self._compression == "zstd" and zstandard is None:
+            raise RuntimeError("COLLECTOR_COMPRESSION=zstd needs the zstandard package: pip install 'pid-memory-inspector[zstd]'")
+        self._suffix = ".csv" + (COMPRESSION_SUFFIXES[self._compression] if self._compression else "")
+        self._store = store
+        self._scanner = ProcessScanner()
+        self._pending: List[Tuple[str, pd.DataFrame, pd.DataFrame, pd.DataFrame]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="embedded-collector", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop sampling and write out every buffered dump.
+        """
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+    def pending_system(self) -> pd.DataFrame:
+        """
+        Return system rows sampled but not yet written, with TIMESTAMP column.
+        """
+        with self._lock:
+            frames = [sys_df for _, sys_df, _, _ in self._pending]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def sample(self) -> None:
+        """
+        Take one sample into the store and the in-memory buffer.
+        """
+        now = pd.Timestamp.now().floor("s")
+        stamp = f"{now:%Y%m%d_%H%M%S}"
+        sys_df = pd.DataFrame([{**get_meminfo(), **get_pressure(), **get_vmstat()}])
+        proc_df = self._scanner.scan(reread_cmdline=False)
+        cgroup_df = get_cgroup_memory(proc_df["CGROUP"].unique())
+
+        if not self._store.append_frame(now, f"process_mem_{stamp}{self._suffix}", proc_df):
+            return
+        sys_df["TIMESTAMP"] = now
+        with self._lock:
+            self._pending.append((stamp, sys_df, proc_df, cgroup_df))
+            due = len(self._pending) >= self._flush_every
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write buffered samples as sys_mem_/process_mem_/cgroup_mem_ CSV dumps.
+
+        A write error is logged and the rest of the batch is dropped rather
+        than retried, so a full disk cannot make the buffer grow without
+        bound; the dropped snapshots are taken out of the store too, so it
+        keeps matching the dumps on disk.
+        """
+        with self._lock:
+            batch = list(self._pending)
+        opts = {"index": False, "encoding": "utf-8", "compression": self._compression}
+        written = 0
+        for stamp, sys_df, proc_df, cgroup_df in batch:
+            paths = [self._dumps_dir / f"{kind}_mem_{stamp}{self._suffix}" for kind in ("process", "cgroup", "sys")]
+            try:
+                proc_df.to_csv(paths[0], **opts)
+                cgroup_df.to_csv(paths[1], **opts)
+                sys_df.drop(columns="TIMESTAMP").to_csv(paths[2], **opts)
+            except Exception:
+                log.exception(
+                    "embedded collector could not write dumps; dropping %d samples", len(batch) - written
+                )
+                for path in paths:
+                    path.unlink(missing_ok=True)
+                break
+            written += 1
+        with self._lock:
+            del self._pending[:len(batch)]
+        if written < len(batch):
+            self._store.drop_pending([f"process_mem_{stamp}{self._suffix}" for stamp, *_ in batch[written:]])
+
+    def _run(self) -> None:
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception:
+                log.exception("embedded collector tick failed")
+            next_tick += self._interval
+            self._stop.wait(max(0.0, next_tick - time.monotonic()))
+
+
+_ACTIVE: Optional[EmbeddedCollector] = None
+_LOCK_FH = None
+
+
+def start_collector(settings: Settings, store: SnapshotStore) -> Optional[EmbeddedCollector]:
+    """
+    Start the process-wide collector unless another worker already runs one.
+    """
+    global _ACTIVE, _LOCK_FH
+    Path(settings.dumps_dir).mkdir(parents=True, exist_ok=True)
+    collector = EmbeddedCollector(settings, store)
+    fh = open(Path(settings.dumps_dir) / ".collector.lock", "a")
+    try:
+        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        fh.close()
+        return None
+    _LOCK_FH = fh
+    _ACTIVE = collector
+    _ACTIVE.start()
+    return _ACTIVE
+
+
+def stop_collector() -> None:
+    """
+    Stop the collector started by this process, flushing its buffer.
+    """
+    global _ACTIVE, _LOCK_FH
+    if _ACTIVE is not None:
+        _ACTIVE.stop()
+        _ACTIVE = None
+    if _LOCK_FH is not None:
+        _LOCK_FH.close()
+        _LOCK_FH = None
+
+
+def pending_system() -> pd.DataFrame:
+    """
+    Return unflushed system rows of this process's collector (empty if none).
+    """
+    return _ACTIVE.pending_system() if _ACTIVE is not None else pd.DataFrame()
@@ -0,0 +1,384 @@
+# src/adapters/process_stats.py
+
+"""
+Per-process history statistics, kept next to the store.
+
+Every process identity (PID, PPID, CMD) seen in any snapshot has its RSS
+min/max/sum, sample count and first/last-seen time, plus two quantile
+sketches (`domain.analysis.sketch`) of its own RSS and of its subtree RSS
+(from `adapters.subtree_index`), so p50/p95/p99 never need the raw rows.
+
+Statistics live in two tables of the same format under
+``<generation>/proc-stats/``:
+
+    base-<S>/    every identity over snapshots [0, S)
+    delta-<T>/   identities seen in snapshots [S, T), aggregated over
+                 those snapshots only
+
+Each table is sorted by identity and stored as column files, with the
+sketches CSR-style in ``<own|sub>_ptr/key/cnt.bin``; ``meta.json`` names
+the current pair. A catch-up folds the new snapshots into the delta,
+whose size follows the live process set rather than the whole history.
+Once the delta holds more than 1/COMPACT_RATIO of the base's identities
+the two are merged into a new base, so the full rewrite is amortized over
+the history it absorbs. Tables are written to fresh directories, so
+workers that have the previous pair mapped keep a consistent view.
+
+Queries read both tables and merge the statistics of identities found in
+each. Tree views look up the processes of one snapshot here instead of
+aggregating the whole history, so `ProcessFilter` thresholds apply to
+precomputed maxima and lifetimes.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from adapters.snapshot_store import SnapshotStore, file_lock, map_array, write_json
+from adapters.subtree_index import open_subtrees
+from domain.analysis.sketch import QUANTILES, bucket_of, segment_quantiles
+from utils.timing import timed
+
+
+_KEYS: Tuple[str, ...] = ("pid", "ppid", "cmd")
+
+_COLUMNS: Dict[str, np.dtype] = {
+    "pid": np.dtype("<i4"),
+    "ppid": np.dtype("<i4"),
+    "cmd": np.dtype("<i4"),
+    "rss_min": np.dtype("<u4"),
+    "rss_max": np.dtype("<u4"),
+    "rss_sum": np.dtype("<i8"),
+    "samples": np.dtype("<i8"),
+    "first_ts": np.dtype("<i8"),
+    "last_ts": np.dtype("<i8"),
+}
+
+_MERGE: Dict[str, str] = {
+    "rss_min": "min",
+    "rss_max": "max",
+    "rss_sum": "sum",
+    "samples": "sum",
+    "first_ts": "min",
+    "last_ts": "max",
+}
+"""How statistics of one identity from different tables combine."""
+
+_SKETCHES: Dict[str, str] = {"own": "rss", "sub": "rss_subtree"}
+"""Sketch name → column prefix of its quantiles in `lookup`."""
+
+_SKETCH_FILES: Dict[str, np.dtype] = {
+    "ptr": np.dtype("<i8"),
+    "key": np.dtype("<i4"),
+    "cnt": np.dtype("<i8"),
+}
+
+COMPACT_RATIO = 4
+"""The delta is merged into the base once it exceeds base identities / COMPACT_RATIO."""
+
+_Table = Dict[str, Dict[str, np.ndarray]]
+"""One loaded table: {"cols": column arrays, "own"/"sub": CSR sketch arrays}."""
+
+
+def _combine(stats: List[pd.DataFrame], pairs: Dict[str, List[pd.DataFrame]]) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    Return statistics and sketch pairs merged per identity, sorted by identity.
+    """
+    merged = pd.concat(stats, ignore_index=True).groupby(list(_KEYS)).agg(
+        **{name: (name, how) for name, how in _MERGE.items()}
+    ).reset_index()
+    sketches = {
+        name: pd.concat(parts, ignore_index=True).groupby([*_KEYS, "key"])["cnt"].sum().reset_index()
+        for name, parts in pairs.items()
+    }
+    return merged, sketches
+
+
+def _csr(stats: pd.DataFrame, pairs: pd.DataFrame) -> np.ndarray:
+    """
+    Return the CSR pointer of identity-sorted `pairs` over the rows of `stats`.
+    """
+    ident = pd.MultiIndex.from_frame(stats[list(_KEYS)])
+    at = ident.get_indexer(pd.MultiIndex.from_frame(pairs[list(_KEYS)]))
+    return np.searchsorted(at, np.arange(len(stats) + 1))
+
+
+def _write_table(out_dir: Path, stats: pd.DataFrame, pairs: Dict[str, pd.DataFrame]) -> dict:
+    """
+    Write one identity-sorted table to `out_dir`; return its meta entry.
+    """
+    out_dir.mkdir(exist_ok=True)
+    for name, dtype in _COLUMNS.items():
+        (out_dir / f"{name}.bin").write_bytes(stats[name].to_numpy().astype(dtype).tobytes())
+    sizes = {}
+    for name, sk in pairs.items():
+        arrays = {"ptr": _csr(stats, sk), "key": sk["key"].to_numpy(), "cnt": sk["cnt"].to_numpy()}
+        for part, dtype in _SKETCH_FILES.items():
+            (out_dir / f"{name}_{part}.bin").write_bytes(arrays[part].astype(dtype).tobytes())
+        sizes[name] = len(sk)
+    return {"dir": out_dir.name, "n": len(stats), "sketch": sizes}
+
+
+def _load_table(base: Path, info: dict) -> _Table:
+    n = info["n"]
+    table: _Table = {"cols": {name: map_array(base / f"{name}.bin", dtype, n) for name, dtype in _COLUMNS.items()}}
+    for name in _SKETCHES:
+        m = info["sketch"][name]
+        table[name] = {
+            "ptr": map_array(base / f"{name}_ptr.bin", _SKETCH_FILES["ptr"], n + 1) if n else np.zeros(1, dtype=np.int64),
+            "key": map_array(base / f"{name}_key.bin", _SKETCH_FILES["key"], m),
+            "cnt": map_array(base / f"{name}_cnt.bin", _SKETCH_FILES["cnt"], m),
+        }
+    return table
+
+
+def _table_stats(table: _Table, rows: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({name: table["cols"][name][rows] for name in _COLUMNS})
+
+
+def _table_pairs(table: _Table, name: str, rows: np.ndarray) -> pd.DataFrame:
+    """
+    Return sketch `name` of table rows `rows` as (identity, key, cnt) rows.
+    """
+    sk = table[name]
+    starts = sk["ptr"][rows]
+    lens = sk["ptr"][rows + 1] - starts
+    at = np.repeat(starts - (np.cumsum(lens) - lens), lens) + np.arange(lens.sum())
+    out = {k: np.repeat(table["cols"][k][rows], lens) for k in _KEYS}
+    out["key"] = sk["key"][at]
+    out["cnt"] = sk["cnt"][at]
+    return pd.DataFrame(out)
+
+
+class ProcessStatsIndex:
+    """
+    Incrementally maintained per-process statistics for one store generation.
+    """
+
+    def __init__(self, store: SnapshotStore) -> None:
+        self._store = store
+        self.generation = store.generation
+        self._dir = store.derived_dir("proc-stats")
+        self._tables: List[_Table] = []
+        self._done = -1
+
+    @timed("ProcessStatsIndex.catch_up")
+    def catch_up(self) -> None:
+        """
+        Fold in every snapshot ingested since the last call.
+        """
+        stop = self._store.n_snapshots
+        if self._done == stop:
+            return
+        if self._read_meta()["done"] < stop:
+            with file_lock(self._dir / ".lock"):
+                meta = self._read_meta()
+                if meta["done"] < stop:
+                    self._extend(meta, stop)
+        self._load()
+
+    def lookup(self, pid: np.ndarray, ppid: np.ndarray) -> pd.DataFrame:
+        """
+        Return history statistics of the identities with one of the given
+        (PID, PPID) pairs, in identity order.
+
+        Columns: PID, PPID, CMD, rss_min, rss_mean, rss_max, rss_p50/p95/p99,
+        rss_subtree_p50/p95/p99, lifetime (s), first_seen, last_seen. Only rows whose PID is among `pid` are
+        touched before the pairs are matched.
+        """
+        pairs = pd.DataFrame({"PID": np.asarray(pid), "PPID": np.asarray(ppid)}).drop_duplicates()
+
+        def match(cols: Dict[str, np.ndarray]) -> np.ndarray:
+            rows = np.flatnonzero(np.isin(cols["pid"], pid))
+            cand = pd.DataFrame({"PID": cols["pid"][rows], "PPID": cols["ppid"][rows], "_row": rows})
+            return np.sort(cand.merge(pairs, on=["PID", "PPID"], how="inner")["_row"].to_numpy())
+
+        return self._frame(self._select(match))
+
+    def by_cmd(self, cmd_ids: np.ndarray) -> pd.DataFrame:
+        """
+        Return history statistics of every identity whose CMD id is among
+        `cmd_ids`, in identity order, with the columns of `lookup`.
+        """
+        return self._frame(self._select(lambda cols: np.flatnonzero(np.isin(cols["cmd"], cmd_ids))))
+
+    def pid_quantiles(self, pid: int) -> Dict[str, float]:
+        """
+        Return p50/p95/p99 of own and subtree RSS over every identity of
+        `pid`, merged from their sketches.
+        """
+        return {k: float(v) for k, v in self.quantiles_by_pid(np.array([pid])).iloc[0].items()}
+
+    def quantiles_by_pid(self, pids: np.ndarray) -> pd.DataFrame:
+        """
+        Return p50/p95/p99 of own and subtree RSS per PID of `pids` (index
+        PID, ascending), each merged over every identity of the PID; NaN
+        for PIDs never seen. All PIDs share one groupby per sketch.
+        """
+        pids = np.unique(np.asarray(pids, dtype=np.int64))
+        rows = self._select(lambda cols: np.flatnonzero(np.isin(cols["pid"], pids)))
+        out: Dict[str, np.ndarray] = {}
+        for name, prefix in _SKETCHES.items():
+            pairs = pd.concat([_table_pairs(t, name, r) for t, r in zip(self._tables, rows)], ignore_index=True)
+            pairs["owner"] = np.searchsorted(pids, pairs["pid"].to_numpy())
+            merged = pairs.groupby(["owner", "key"])["cnt"].sum().reset_index()
+            ptr = np.searchsorted(merged["owner"].to_numpy(), np.arange(len(pids) + 1))
+            values = segment_quantiles(
+                ptr, merged["key"].to_numpy(), merged["cnt"].to_numpy(), np.arange(len(pids))
+            ).round(1)
+            out.update({f"{prefix}_p{round(q * 100)}": values[:, j] for j, q in enumerate(QUANTILES)})
+        return pd.DataFrame(out, index=pd.Index(pids, name="PID"))
+
+    def _select(self, match: Callable[[Dict[str, np.ndarray]], np.ndarray]) -> List[np.ndarray]:
+        """
+        Return, per table, the ascending rows `match` picks from its columns.
+        """
+        return [match(t["cols"]) for t in self._tables]
+
+    def _frame(self, rows: List[np.ndarray]) -> pd.DataFrame:
+        """
+        Return the `lookup` frame of the given rows of every table.
+
+        With a single table its stored sketches are read in place; rows of
+        an identity present in both tables are merged first.
+        """
+        if len(self._tables) == 1:
+            table, at = self._tables[0], rows[0]
+            stats = _table_stats(table, at)
+            sketches = {name: (table[name]["ptr"], table[name]["key"], table[name]["cnt"], at) for name in _SKETCHES}
+        else:
+            stats, pairs = _combine(
+                [_table_stats(t, r) for t, r in zip(self._tables, rows)],
+                {name: [_table_pairs(t, name, r) for t, r in zip(self._tables, rows)] for name in _SKETCHES},
+            )
+            sketches = {
+                name: (_csr(stats, sk), sk["key"].to_numpy(), sk["cnt"].to_numpy(), np.arange(len(stats)))
+                for name, sk in pairs.items()
+            }
+
+        pct = {}
+        for name, prefix in _SKETCHES.items():
+            values = segment_quantiles(*sketches[name]).round(1)
+            pct.update({f"{prefix}_p{round(q * 100)}": values[:, j] for j, q in enumerate(QUANTILES)})
+        first, last = stats["first_ts"].to_numpy(), stats["last_ts"].to_numpy()
+        return pd.DataFrame({
+            "PID": stats["pid"].to_numpy(),
+            "PPID": stats["ppid"].to_numpy(),
+            "CMD": pd.Categorical.from_codes(stats["cmd"].to_numpy(), categories=self._store.strings("cmd")),
+            "rss_min": stats["rss_min"].to_numpy(),
+            "rss_mean": stats["rss_sum"].to_numpy() / stats["samples"].to_numpy(),
+            "rss_max": stats["rss_max"].to_numpy(),
+            **pct,
+            "lifetime": (last - first).astype(np.float64),
+            "first_seen": pd.to_datetime(first, unit="s"),
+            "last_seen": pd.to_datetime(last, unit="s"),
+        })
+
+    def _read_meta(self) -> dict:
+        try:
+            meta = json.loads((self._dir / "meta.json").read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {"done": 0, "base": None, "delta": None}
+        # Tables written before the base/delta split are rebuilt from scratch.
+        return meta if "base" in meta else {"done": 0, "base": None, "delta": None}
+
+    def _aggregate(self, start: int, stop: int) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]:
+        """
+        Return statistics and sketch pairs of snapshots [start, stop) alone.
+        """
+        rows = slice(self._store.snapshot_rows(start).start, self._store.snapshot_rows(stop - 1).stop)
+        cols = self._store.columns(rows)
+        stats = pd.DataFrame({
+            "pid": cols["pid"],
+            "ppid": cols["ppid"],
+            "cmd": cols["cmd"],
+            "rss": cols["rss_mb"].astype(np.int64),
+            "ts": cols["ts"],
+        }).groupby(list(_KEYS), sort=False).agg(
+            rss_min=("rss", "min"),
+            rss_max=("rss", "max"),
+            rss_sum=("rss", "sum"),
+            samples=("rss", "size"),
+            first_ts=("ts", "min"),
+            last_ts=("ts", "max"),
+        ).reset_index()
+        values = {"own": cols["rss_mb"], "sub": open_subtrees(self._store).columns(rows)["sub_rss"]}
+        pairs = {
+            name: pd.DataFrame({k: cols[k] for k in _KEYS}).assign(key=bucket_of(v), cnt=1)
+            for name, v in values.items()
+        }
+        return stats, pairs
+
+    def _extend(self, meta: dict, stop: int) -> None:
+        """
+        Fold snapshots [meta["done"], stop) into the delta, or into a new
+        base when the delta has grown too large, and commit meta.json.
+        """
+        fresh, fresh_pairs = self._aggregate(meta["done"], stop)
+        base = meta["base"]
+        delta, delta_pairs = self._merge_tables(
+            [meta["delta"]] if meta["delta"] else [], [fresh], {name: [p] for name, p in fresh_pairs.items()}
+        )
+        if base is None or len(delta) * COMPACT_RATIO > base["n"]:
+            merged, merged_pairs = self._merge_tables(
+                [base] if base else [], [delta], {name: [p] for name, p in delta_pairs.items()}
+            )
+            base = _write_table(self._dir / f"base-{stop}", merged, merged_pairs)
+            delta_info = None
+        else:
+            delta_info = _write_table(self._dir / f"delta-{stop}", delta, delta_pairs)
+
+        write_json(self._dir / "meta.json", {"done": stop, "base": base, "delta": delta_info})
+        keep = {base["dir"], delta_info["dir"] if delta_info else None}
+        for old_dir in [*self._dir.glob("base-*"), *self._dir.glob("delta-*"), *self._dir.glob("upto-*")]:
+            if old_dir.name not in keep:
+                shutil.rmtree(old_dir, ignore_errors=True)
+
+    def _merge_tables(
+        self,
+        infos: List[dict],
+        stats: List[pd.DataFrame],
+        pairs: Dict[str, List[pd.DataFrame]],
+    ) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]:
+        """
+        Return the committed tables `infos` merged with in-memory `stats`/`pairs`.
+        """
+        for info in infos:
+            table = _load_table(self._dir / info["dir"], info)
+            every = np.arange(info["n"])
+            stats = [_table_stats(table, every), *stats]
+            for name in pairs:
+                pairs[name] = [_table_pairs(table, name, every), *pairs[name]]
+        return _combine(stats, pairs)
+
+    def _load(self) -> None:
+        meta = self._read_meta()
+        self._tables = [
+            _load_table(self._dir / info["dir"], info)
+            for info in (meta["base"], meta["delta"]) if info
+        ]
+        self._done = meta["done"]
+
+
+_INDEXES: Dict[int, ProcessStatsIndex] = {}
+_LOCK = threading.Lock()
+
+
+def open_process_stats(store: SnapshotStore) -> ProcessStatsIndex:
+    """
+    Return the shared per-process statistics of `store`, caught up with its snapshots.
+    """
+    key = id(store)
+    with _LOCK:
+        index = _INDEXES.get(key)
+        if index is None or index.generation != store.generation:
+            index = _INDEXES[key] = ProcessStatsIndex(store)
+        index.catch_up()
+    return index
@@ -0,0 +1,556 @@
+# src/adapters/snapshot_store.py
+
+"""
+Memory-mapped, append-only store of all process rows.
+
+Rows of every ingested ``process_mem_*.csv`` dump are kept as flat column
+files sorted by timestamp (then PID), plus an offset index per snapshot:
+
+    <store_dir>/manifest.json               generation, ingested files, sizes
+    <store_dir>/gen-<N>/<column>.bin        raw little-endian column arrays
+    <store_dir>/gen-<N>/snap_ts.bin         int64 epoch seconds per snapshot
+    <store_dir>/gen-<N>/snap_offsets.bin    int64 first row of each snapshot
+    <store_dir>/gen-<N>/<user|cmd|cgroup>.strings  one JSON string per line, line no = id
+
+Columns are opened with ``np.memmap``, so selecting a snapshot or a time
+window is a zero-copy slice and every worker reading the same store shares
+the OS page cache. New dumps are appended in place; a dump older than the
+last ingested one (or a deleted dump) triggers a rebuild into a fresh
+generation directory, which keeps files mapped by other workers valid.
+
+Several server workers share one store: ingest happens under a file lock
+by whichever process gets there first (or only by ``src/loader.py`` when
+workers attach read-only), and every worker maps the same files, so RSS
+for the history is paid once in the page cache rather than per worker.
+``frame`` wraps the mapped columns without copying them where dtypes
+allow.
+
+Snapshots sampled in-process can be appended with ``append_frame`` before
+their dump is written; the manifest lists them as pending until the file
+shows up, so a not-yet-flushed dump does not count as deleted. Snapshots
+whose dump will never be written are given up with ``drop_pending``.
+
+A manifest written by another STORE_VERSION is treated as empty and the
+next refresh rebuilds the store into a fresh generation.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import glob
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from adapters.dumps_reader import read_process_csv
+from utils.parser import parse_timestamp
+from utils.timing import timed
+
+
+STORE_VERSION = 2
+
+COLUMNS: Dict[str, np.dtype] = {
+    "ts": np.dtype("<i8"),
+    "pid": np.dtype("<i4"),
+    "ppid": np.dtype("<i4"),
+    "user": np.dtype("<i4"),
+    "rss_mb": np.dtype("<u4"),
+    "vsz_mb": np.dtype("<u4"),
+    "cmd": np.dtype("<i4"),
+    "cgroup": np.dtype("<i4"),
+}
+"""Per-row column files and their on-disk dtypes."""
+
+SNAP_COLUMNS: Dict[str, np.dtype] = {
+    "snap_ts": np.dtype("<i8"),
+    "snap_offsets": np.dtype("<i8"),
+}
+"""Per-snapshot index files and their on-disk dtypes."""
+
+STRING_TABLES: Tuple[str, ...] = ("user", "cmd", "cgroup")
+"""Columns stored as ids into an append-only string table."""
+
+
+class SnapshotStore:
+    """
+    Read access to, and incremental ingest into, one on-disk store.
+    """
+
+    def __init__(self, store_dir: Path, glob_mask: Union[str, Path]) -> None:
+        self._dir = Path(store_dir)
+        self._glob_mask = str(glob_mask)
+        self._lock = threading.Lock()
+        self._manifest_mtime = -1
+        self._manifest: dict = _empty_manifest(0)
+        self._stale = False
+        self._cols: Dict[str, np.ndarray] = {}
+        self._strings: Dict[str, pd.Index] = {}
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    # ------------------------------------------------------------------ #
+    # Read side
+    # ------------------------------------------------------------------ #
+
+    @property
+    def n_rows(self) -> int:
+        return int(self._manifest["n_rows"])
+
+    @property
+    def n_snapshots(self) -> int:
+        return int(self._manifest["n_snapshots"])
+
+    @property
+    def generation(self) -> int:
+        return int(self._manifest["generation"])
+
+    def snapshot_times(self) -> np.ndarray:
+        """
+        Return epoch seconds of every snapshot, ascending.
+        """
+        return self._cols["snap_ts"]
+
+    def stamps(self) -> List[str]:
+        """
+        Return snapshot timestamps formatted as YYYYMMDD_HHMMSS.
+        """
+        return list(pd.to_datetime(self.snapshot_times(), unit="s").strftime("%Y%m%d_%H%M%S"))
+
+    def locate(self, ts: pd.Timestamp) -> int:
+        """
+        Return the index of the snapshot taken exactly at `ts`.
+        """
+        sec = _epoch_s(ts)
+        times = self.snapshot_times()
+        i = int(np.searchsorted(times, sec))
+        if i == len(times) or times[i] != sec:
+            raise KeyError(ts)
+        return i
+
+    def locate_at(self, ts: pd.Timestamp) -> int:
+        """
+        Return the index of the last snapshot taken at or before `ts`.
+        """
+        i = int(np.searchsorted(self.snapshot_times(), _epoch_s(ts), "right")) - 1
+        if i < 0:
+            raise KeyError(ts)
+        return i
+
+    def snapshot_rows(self, i: int) -> slice:
+        """
+        Return the row range of snapshot number `i`.
+        """
+        offsets = self._cols["snap_offsets"]
+        end = int(offsets[i + 1]) if i + 1 < len(offsets) else self.n_rows
+        return slice(int(offsets[i]), end)
+
+    def window_rows(self, start: pd.Timestamp | None, end: pd.Timestamp | None) -> slice:
+        """
+        Return the row range of all snapshots taken within [start, end].
+        """
+        times = self.snapshot_times()
+        lo = 0 if start is None else int(np.searchsorted(times, _epoch_s(start), "left"))
+        hi = len(times) if end is None else int(np.searchsorted(times, _epoch_s(end), "right"))
+        if lo >= hi:
+            return slice(0, 0)
+        first = int(self._cols["snap_offsets"][lo])
+        last = self.snapshot_rows(hi - 1).stop
+        return slice(first, last)
+
+    def columns(self, rows: slice | np.ndarray = slice(None)) -> Dict[str, np.ndarray]:
+        """
+        Return all row columns over `rows`; zero-copy views when `rows` is a slice.
+        """
+        return {name: self._cols[name][rows] for name in COLUMNS}
+
+    def strings(self, table: str) -> pd.Index:
+        """
+        Return the string table for `table`; position equals string id.
+        """
+        return self._strings[table]
+
+    def frame(self, rows: slice | np.ndarray = slice(None)) -> pd.DataFrame:
+        """
+        Return rows as a process frame in the schema of ``load_process_df``.
+
+        Rows keep store order (TIMESTAMP, then PID). For a slice, numeric
+        columns and TIMESTAMP (second resolution) are read-only views of
+        the mapped files; only categorical codes are copied.
+        """
+        c = self.columns(rows)
+        return pd.DataFrame({
+            "PID": c["pid"],
+            "PPID": c["ppid"],
+            "USER": pd.Categorical.from_codes(c["user"], categories=self._strings["user"]),
+            "RSS_MB": c["rss_mb"],
+            "VSZ_MB": c["vsz_mb"],
+            "CMD": pd.Categorical.from_codes(c["cmd"], categories=self._strings["cmd"]),
+            "CGROUP": pd.Categorical.from_codes(c["cgroup"], categories=self._strings["cgroup"]),
+            "TIMESTAMP": c["ts"].view("datetime64[s]"),
+        }, copy=False)
+
+    def derived_dir(self, name: str) -> Path:
+        """
+        Return a directory for indexes derived from the current generation.
+
+        It lives inside the generation, so a rebuild discards it together
+        with the rows it refers to.
+        """
+        path = self._gen_dir(self.generation) / name
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def disk_bytes(self) -> int:
+        """
+        Return the size of the current generation on disk.
+        """
+        return int(sum(self._manifest["sizes"].values()))
+
+    # ------------------------------------------------------------------ #
+    # Ingest
+    # ------------------------------------------------------------------ #
+
+    @timed("SnapshotStore.refresh")
+    def refresh(self) -> None:
+        """
+        Ingest dumps that appeared since the last call and pick up
+        ingests done by other processes.
+        """
+        with self._lock:
+            if self._manifest_changed():
+                self._load()
+            found = self._scan()
+            pending = set(self._manifest.get("pending", []))
+            if set(found) | pending == set(self._manifest["files"]) and not pending & set(found):
+                return
+            with file_lock(self._dir / ".lock"):
+                self._load()
+                pending = set(self._manifest.get("pending", []))
+                known = set(self._manifest["files"])
+                new = sorted((ts, name) for name, ts in found.items() if name not in known)
+                if not new and known - pending <= set(found):
+                    if pending & set(found):
+                        self._write_pending(pending - set(found))
+                    return
+                last = self._manifest["last_ts"]
+                out_of_order = new and last is not None and new[0][0] <= last
+                if self._stale or not known - pending <= set(found) or out_of_order:
+                    self._rebuild(sorted((ts, name) for name, ts in found.items()))
+                else:
+                    self._append(self._manifest, self._strings, new)
+                    if pending:
+                        self._load()
+                        self._write_pending(pending - set(found))
+                self._load()
+
+    def append_frame(self, ts: pd.Timestamp, fname: str, df: pd.DataFrame) -> bool:
+        """
+        Ingest an in-memory snapshot whose dump `fname` is written later.
+
+        Return False (and ingest nothing) unless `ts` is newer than every
+        snapshot in the store.
+        """
+        sec = _epoch_s(ts)
+        with self._lock, file_lock(self._dir / ".lock"):
+            self._load()
+            if self._stale:
+                self._rebuild(sorted((t, name) for name, t in self._scan().items()))
+                self._load()
+            last = self._manifest["last_ts"]
+            if last is not None and sec <= last:
+                return False
+            df = df.astype({"USER": "category", "CMD": "category", "CGROUP": "category"})
+            self._append(self._manifest, self._strings, [(sec, fname)], frames={fname: df})
+            self._load()
+            self._write_pending(set(self._manifest.get("pending", [])) | {fname})
+        return True
+
+    def drop_pending(self, fnames: List[str]) -> None:
+        """
+        Give up on pending snapshots whose dumps will never be written.
+
+        They stop being listed as pending, so the store no longer matches
+        the dumps on disk and is rebuilt from them, without those snapshots.
+        """
+        with self._lock, file_lock(self._dir / ".lock"):
+            self._load()
+            pending = set(self._manifest.get("pending", []))
+            if not pending & set(fnames):
+                return
+            self._write_pending(pending - set(fnames))
+        self.refresh()
+
+    def reload(self) -> None:
+        """
+        Map the latest generation if another process ingested since; never
+        ingests itself.
+        """
+        with self._lock:
+            if self._manifest_changed():
+                self._load()
+
+    def _write_pending(self, pending: set) -> None:
+        manifest = dict(self._manifest)
+        manifest["pending"] = sorted(pending)
+        _write_manifest(self._dir, manifest)
+        self._load()
+
+    def _scan(self) -> Dict[str, int]:
+        """
+        Return mapping dump file name → epoch seconds for all current dumps.
+        """
+        return {
+            os.path.basename(f): _epoch_s(parse_timestamp(f, "process_mem_"))
+            for f in glob.iglob(self._glob_mask)
+        }
+
+    def _append(
+        self,
+        manifest: dict,
+        strings: Dict[str, pd.Index],
+        new: List[Tuple[int, str]],
+        frames: Dict[str, pd.DataFrame] | None = None,
+    ) -> None:
+        """
+        Append dumps (sorted by time, all newer than `manifest`) to its
+        generation and commit the extended manifest.
+
+        Dumps named in `frames` are taken from there instead of disk.
+        """
+        gen_dir = self._gen_dir(manifest["generation"])
+        gen_dir.mkdir(parents=True, exist_ok=True)
+        _truncate_to(gen_dir, manifest["sizes"])
+
+        tables = {t: {s: i for i, s in enumerate(strings[t])} for t in STRING_TABLES}
+        added: Dict[str, List[str]] = {t: [] for t in STRING_TABLES}
+        dumps_dir = Path(self._glob_mask).parent
+        n_rows = manifest["n_rows"]
+
+        handles = {
+            name: open(gen_dir / f"{name}.bin", "ab")
+            for name in (*COLUMNS, *SNAP_COLUMNS)
+        }
+        try:
+            for ts, fname in new:
+                df = frames[fname] if frames and fname in frames else read_process_csv(dumps_dir / fname)
+                df = df.sort_values("PID", kind="stable")
+                arrays = {
+                    "ts": np.full(len(df), ts),
+                    "pid": df["PID"].to_numpy(),
+                    "ppid": df["PPID"].to_numpy(),
+                    "user": _intern(df["USER"], tables["user"], added["user"]),
+                    "rss_mb": df["RSS_MB"].to_numpy(),
+                    "vsz_mb": df["VSZ_MB"].to_numpy(),
+                    "cmd": _intern(df["CMD"], tables["cmd"], added["cmd"]),
+                    "cgroup": _intern(df["CGROUP"], tables["cgroup"], added["cgroup"]),
+                }
+                for name, dtype in COLUMNS.items():
+                    handles[name].write(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+                handles["snap_ts"].write(np.array([ts], dtype=SNAP_COLUMNS["snap_ts"]).tobytes())
+                handles["snap_offsets"].write(np.array([n_rows], dtype=SNAP_COLUMNS["snap_offsets"]).tobytes())
+                n_rows += len(df)
+        finally:
+            for fh in handles.values():
+                fh.close()
+
+        for t in STRING_TABLES:
+            with open(gen_dir / f"{t}.strings", "a", encoding="utf-8") as fh:
+                fh.writelines(json.dumps(s) + "\n" for s in added[t])
+
+        manifest = dict(manifest)
+        manifest["files"] = manifest["files"] + [name for _, name in new]
+        manifest["n_rows"] = n_rows
+        manifest["n_snapshots"] = manifest["n_snapshots"] + len(new)
+        manifest["last_ts"] = new[-1][0]
+        manifest["sizes"] = {
+            p.name: p.stat().st_size for p in gen_dir.iterdir() if p.is_file()
+        }
+        _write_manifest(self._dir, manifest)
+
+    def _rebuild(self, found: List[Tuple[int, str]]) -> None:
+        """
+        Ingest all dumps into a new generation and drop older generations.
+        """
+        generation = self._manifest["generation"] + 1
+        shutil.rmtree(self._gen_dir(generation), ignore_errors=True)
+        empty = {t: pd.Index([], dtype=object) for t in STRING_TABLES}
+        if found:
+            self._append(_empty_manifest(generation), empty, found)
+        else:
+            _write_manifest(self._dir, _empty_manifest(generation))
+        for old in self._dir.glob("gen-*"):
+            if old != self._gen_dir(generation):
+                shutil.rmtree(old, ignore_errors=True)
+
+    # ------------------------------------------------------------------ #
+    # Loading
+    # ------------------------------------------------------------------ #
+
+    def _gen_dir(self, generation: int) -> Path:
+        return self._dir / f"gen-{generation}"
+
+    def _manifest_changed(self) -> bool:
+        try:
+            return (self._dir / "manifest.json").stat().st_mtime_ns != self._manifest_mtime
+        except FileNotFoundError:
+            return False
+
+    def _load(self) -> None:
+        """
+        Re-read the manifest and map the current generation.
+        """
+        path = self._dir / "manifest.json"
+        try:
+            mtime = path.stat().st_mtime_ns
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            mtime, manifest = -1, _empty_manifest(0)
+        stale = manifest.get("version") != STORE_VERSION
+        if stale:
+            manifest = _empty_manifest(manifest.get("generation", 0))
+
+        gen_dir = self._gen_dir(manifest["generation"])
+        cols: Dict[str, np.ndarray] = {}
+        for name, dtype in COLUMNS.items():
+            cols[name] = map_array(gen_dir / f"{name}.bin", dtype, manifest["n_rows"])
+        for name, dtype in SNAP_COLUMNS.items():
+            cols[name] = map_array(gen_dir / f"{name}.bin", dtype, manifest["n_snapshots"])
+
+        strings: Dict[str, pd.Index] = {}
+        for t in STRING_TABLES:
+            size = manifest["sizes"].get(f"{t}.strings", 0)
+            values: List[str] = []
+            if size:
+                with open(gen_dir / f"{t}.strings", "rb") as fh:
+                    values = [json.loads(line) for line in fh.read(size).splitlines()]
+            strings[t] = pd.Index(values, dtype=object)
+
+        self._manifest, self._manifest_mtime = manifest, mtime
+        self._stale = stale
+        self._cols, self._strings = cols, strings
+
+
+# ---------------------------------------------------------------------- #
+# Process-wide registry
+# ---------------------------------------------------------------------- #
+
+_STORES: Dict[Path, SnapshotStore] = {}
+_LAST_REFRESH: Dict[Path, float] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def open_store(
+    store_dir: Path,
+    glob_mask: Union[str, Path],
+    refresh_s: float = 0.0,
+    readonly: bool = False,
+) -> SnapshotStore:
+    """
+    Return the shared store for `store_dir`, ingesting new dumps at most
+    once per `refresh_s` seconds.
+
+    A `readonly` store only picks up what another process (the loader)
+    published.
+    """
+    key = Path(store_dir).resolve()
+    with _REGISTRY_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = SnapshotStore(key, glob_mask)
+            _LAST_REFRESH[key] = float("-inf")
+        due = time.monotonic() - _LAST_REFRESH[key] >= refresh_s
+        if due:
+            _LAST_REFRESH[key] = time.monotonic()
+    if due and readonly:
+        store.reload()
+    elif due:
+        store.refresh()
+    return store
+
+
+# ---------------------------------------------------------------------- #
+# Helpers
+# ---------------------------------------------------------------------- #
+
+def _empty_manifest(generation: int) -> dict:
+    return {
+        "version": STORE_VERSION,
+        "generation": generation,
+        "files": [],
+        "n_rows": 0,
+        "n_snapshots": 0,
+        "last_ts": None,
+        "sizes": {},
+    }
+
+
+def _epoch_s(ts: pd.Timestamp) -> int:
+    return int(pd.Timestamp(ts).value // 10**9)
+
+
+def map_array(path: Path, dtype: np.dtype, n: int) -> np.ndarray:
+    """
+    Return a read-only mapping of the first `n` items of `path`.
+    """
+    if n == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(n,))
+
+
+def _intern(col: pd.Series, table: Dict[str, int], added: List[str]) -> np.ndarray:
+    """
+    Return global string ids for a categorical column, extending `table`.
+
+    Only distinct values are looked up; missing values map to "".
+    """
+    cats = list(col.cat.categories.astype(str)) + [""]
+    ids = np.empty(len(cats), dtype=np.int32)
+    for i, s in enumerate(cats):
+        if s not in table:
+            table[s] = len(table)
+            added.append(s)
+        ids[i] = table[s]
+    return ids[col.cat.codes.to_numpy()]
+
+
+def _truncate_to(gen_dir: Path, sizes: Dict[str, int]) -> None:
+    """
+    Drop bytes past the committed sizes, left behind by an interrupted append.
+    """
+    for p in gen_dir.iterdir():
+        if p.is_file() and p.stat().st_size != sizes.get(p.name, 0):
+            os.truncate(p, sizes.get(p.name, 0))
+
+
+def write_json(path: Path, obj: dict) -> None:
+    """
+    Replace `path` with `obj` atomically, so readers never see a partial file.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(obj), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _write_manifest(store_dir: Path, manifest: dict) -> None:
+    write_json(store_dir / "manifest.json", manifest)
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on `path` (shared by all workers).
+    """
+    with open(path, "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
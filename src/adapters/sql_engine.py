@@ -0,0 +1,142 @@
+# src/adapters/sql_engine.py
+
+"""
+Ad-hoc SQL over the dump archive with an embedded DuckDB.
+
+DuckDB is optional (the ``sql`` extra,
+``pip install 'pid-memory-inspector[sql]'``); without it `connect` raises
+`SqlUnavailable`. Each connection is in-memory and exposes read-only views
+over data the app already keeps on disk, scanned in place by DuckDB's
+vectorized engine instead of being loaded into pandas first:
+
+    processes   TIMESTAMP, PID, PPID, USER, RSS_MB, VSZ_MB, CMD, CGROUP
+                (the memory-mapped process store)
+    subtrees    TIMESTAMP, PID, PPID, CMD, LEVEL, RSS_MB, SUBTREE_RSS_MB
+                (per-snapshot rollups from `adapters.subtree_index`)
+    system      every system dump column plus the derived series
+    cgroups     TIMESTAMP, CGROUP, MEMORY_CURRENT_MB (when recorded)
+
+Only single SELECT statements are accepted and, unless
+`query_external_access` is set, the connection cannot read other files.
+"""
+
+from __future__ import annotations
+
+import glob
+from dataclasses import dataclass
+from typing import Any, List
+
+import pandas as pd
+
+from adapters.dumps_reader import read_cgroup_csv
+from adapters.snapshot_store import SnapshotStore
+from adapters.subtree_index import open_subtrees
+from utils.timing import timed
+
+try:
+    import duckdb
+except ImportError:  # optional dependency
+    duckdb = None
+
+
+VIEWS = ("processes", "subtrees", "system", "cgroups")
+
+
+class SqlUnavailable(RuntimeError):
+    """
+    DuckDB is not installed.
+    """
+
+
+class SqlError(ValueError):
+    """
+    The query was rejected or failed.
+    """
+
+
+@dataclass
+class QueryResult:
+    columns: List[str]
+    rows: List[tuple]
+    truncated: bool
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame.from_records(self.rows, columns=self.columns)
+
+
+def _process_frame(store: SnapshotStore) -> pd.DataFrame:
+    """
+    Return the store rows with their subtree rollups, without copying columns.
+    """
+    df = store.frame()
+    sub = open_subtrees(store).columns(slice(0, len(df)))
+    df["LEVEL"] = sub["level"]
+    df["SUBTREE_RSS_MB"] = sub["sub_rss"]
+    return df
+
+
+def _cgroup_frame(pattern: str) -> pd.DataFrame:
+    files = sorted(glob.glob(pattern))
+    if not files:
+        return pd.DataFrame({
+            "TIMESTAMP": pd.Series(dtype="datetime64[ns]"),
+            "CGROUP": pd.Series(dtype=str),
+            "MEMORY_CURRENT_MB": pd.Series(dtype=float),
+        })
+    return pd.concat([read_cgroup_csv(f) for f in files], ignore_index=True)
+
+
+@timed("sql.connect")
+def connect(
+    store: SnapshotStore,
+    system: pd.DataFrame,
+    cgroup_pattern: str,
+    external_access: bool = False,
+) -> Any:
+    """
+    Return a DuckDB connection with the archive views registered.
+    """
+    if duckdb is None:
+        raise SqlUnavailable("SQL queries need DuckDB: pip install 'pid-memory-inspector[sql]'")
+
+    con = duckdb.connect(":memory:")
+    con.register("_rows", _process_frame(store))
+    con.register("_system", system)
+    con.register("_cgroups", _cgroup_frame(cgroup_pattern))
+    con.execute(
+        "CREATE VIEW processes AS "
+        "SELECT TIMESTAMP, PID, PPID, USER, RSS_MB, VSZ_MB, CMD, CGROUP FROM _rows"
+    )
+    con.execute(
+        "CREATE VIEW subtrees AS "
+        "SELECT TIMESTAMP, PID, PPID, CMD, LEVEL, RSS_MB, SUBTREE_RSS_MB FROM _rows"
+    )
+    con.execute("CREATE VIEW system AS SELECT * FROM _system")
+    con.execute("CREATE VIEW cgroups AS SELECT * FROM _cgroups")
+    if not external_access:
+        con.execute("SET enable_external_access = false")
+        con.execute("SET lock_configuration = true")
+    return con
+
+
+@timed("sql.run")
+def run(con: Any, sql: str, limit: int) -> QueryResult:
+    """
+    Execute one SELECT statement and fetch at most `limit` rows.
+    """
+    try:
+        statements = duckdb.extract_statements(sql)
+    except duckdb.Error as exc:
+        raise SqlError(str(exc)) from exc
+    if len(statements) != 1:
+        raise SqlError("expected exactly one statement")
+    if statements[0].type != duckdb.StatementType.SELECT:
+        raise SqlError("only SELECT statements are allowed")
+
+    try:
+        cur = con.execute(sql)
+        columns = [d[0] for d in cur.description]
+        rows = cur.fetchmany(limit + 1)
+    except duckdb.Error as exc:
+        raise SqlError(str(exc)) from exc
+    return QueryResult(columns, rows[:limit], len(rows) > limit)
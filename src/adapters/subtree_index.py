@@ -0,0 +1,128 @@
+# src/adapters/subtree_index.py
+
+"""
+Tree level and subtree RSS of every stored process row.
+
+Computed once per snapshot right after ingest (one `rollup.subtree_sum`
+pass) and appended to row-aligned memory-mapped arrays in
+``<generation>/subtrees/``:
+
+    level.bin     int32  depth of the row's process in its snapshot tree
+    sub_rss.bin   int64  RSS of the process and all its descendants, MB
+    meta.json     number of snapshots covered
+
+so SQL views and other scans get rolled-up subtrees without rebuilding
+trees per query.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Dict
+
+import numpy as np
+
+from adapters.snapshot_store import SnapshotStore, file_lock, map_array, write_json
+from domain.analysis.rollup import depths, parent_index, subtree_sum
+from utils.timing import timed
+
+
+_ARRAYS: Dict[str, np.dtype] = {
+    "level": np.dtype("<i4"),
+    "sub_rss": np.dtype("<i8"),
+}
+
+
+class SubtreeIndex:
+    """
+    Incrementally maintained per-row subtree rollups for one store generation.
+    """
+
+    def __init__(self, store: SnapshotStore) -> None:
+        self._store = store
+        self.generation = store.generation
+        self._dir = store.derived_dir("subtrees")
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._done = -1
+
+    @timed("SubtreeIndex.catch_up")
+    def catch_up(self) -> None:
+        """
+        Roll up every snapshot ingested since the last call.
+        """
+        stop = self._store.n_snapshots
+        if self._done == stop:
+            return
+        if self._read_done() < stop:
+            with file_lock(self._dir / ".lock"):
+                start = self._read_done()
+                if start < stop:
+                    self._extend(start, stop)
+        self._load()
+
+    def columns(self, rows: slice = slice(None)) -> Dict[str, np.ndarray]:
+        """
+        Return level and sub_rss over store rows `rows` (zero-copy views).
+        """
+        return {name: arr[rows] for name, arr in self._arrays.items()}
+
+    def _read_done(self) -> int:
+        try:
+            return int(json.loads((self._dir / "meta.json").read_text(encoding="utf-8"))["done"])
+        except FileNotFoundError:
+            return 0
+
+    def _rows_before(self, snapshots: int) -> int:
+        return self._store.snapshot_rows(snapshots - 1).stop if snapshots else 0
+
+    def _extend(self, start: int, stop: int) -> None:
+        """
+        Append rollups of snapshots [start, stop) and commit meta.json.
+        """
+        cols = self._store.columns()
+        for name, dtype in _ARRAYS.items():
+            path = self._dir / f"{name}.bin"
+            if path.exists():
+                os.truncate(path, self._rows_before(start) * dtype.itemsize)
+
+        handles = {name: open(self._dir / f"{name}.bin", "ab") for name in _ARRAYS}
+        try:
+            for i in range(start, stop):
+                rows = self._store.snapshot_rows(i)
+                parent = parent_index(cols["pid"][rows], cols["ppid"][rows])
+                level = depths(parent)
+                sub = subtree_sum(parent, cols["rss_mb"][rows], level)
+                handles["level"].write(level.astype(_ARRAYS["level"]).tobytes())
+                handles["sub_rss"].write(sub.astype(_ARRAYS["sub_rss"]).tobytes())
+        finally:
+            for fh in handles.values():
+                fh.close()
+        write_json(self._dir / "meta.json", {"done": stop})
+
+    def _load(self) -> None:
+        done = self._read_done()
+        n = self._rows_before(done)
+        self._arrays = {
+            name: map_array(self._dir / f"{name}.bin", dtype, n)
+            for name, dtype in _ARRAYS.items()
+        }
+        self._done = done
+
+
+_INDEXES: Dict[int, SubtreeIndex] = {}
+_LOCK = threading.Lock()
+
+
+def open_subtrees(store: SnapshotStore) -> SubtreeIndex:
+    """
+    Return the shared subtree rollups of `store`, caught up with its snapshots.
+    """
+    key = id(store)
+    with _LOCK:
+        index = _INDEXES.get(key)
+        if index is None or index.generation != store.generation:
+            index = _INDEXES[key] = SubtreeIndex(store)
+        index.catch_up()
+    return index
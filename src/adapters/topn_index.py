@@ -0,0 +1,188 @@
+# src/adapters/topn_index.py
+
+"""
+Per-snapshot top-N processes and subtrees by RSS, kept next to the store.
+
+Every snapshot is ranked exactly once, right after it is ingested, with
+partial sorts (`np.argpartition`) over its rows and over its rolled-up
+subtree RSS. Results are appended to fixed-width memory-mapped arrays in
+``<generation>/topn-<N>/``:
+
+    proc_rows.bin   int64 (n_snapshots, N)  store row of the k-th process
+    sub_rows.bin    int64 (n_snapshots, N)  store row of the k-th subtree root
+    sub_rss.bin     int64 (n_snapshots, N)  subtree RSS of that root, MB
+    meta.json       number of snapshots ranked
+
+so "who was on top at 03:00" is a searchsorted plus one row lookup.
+Unused slots of small snapshots hold row -1.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from adapters.snapshot_store import SnapshotStore, file_lock, map_array, write_json
+from domain.analysis.rollup import depths, parent_index, subtree_sum
+from utils.timing import timed
+
+
+_ARRAYS: Dict[str, np.dtype] = {
+    "proc_rows": np.dtype("<i8"),
+    "sub_rows": np.dtype("<i8"),
+    "sub_rss": np.dtype("<i8"),
+}
+
+
+def top_rows(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    Return positions of the `n` largest `values`, largest first, padded with -1.
+    """
+    out = np.full(n, -1, dtype=np.int64)
+    k = min(n, len(values))
+    if k == 0:
+        return out
+    part = np.argpartition(-values, k - 1)[:k] if k < len(values) else np.arange(k)
+    out[:k] = part[np.argsort(-values[part], kind="stable")]
+    return out
+
+
+class TopNIndex:
+    """
+    Incrementally maintained top-N rankings for one store generation.
+    """
+
+    def __init__(self, store: SnapshotStore, n: int) -> None:
+        self._store = store
+        self._n = n
+        self.generation = store.generation
+        self._dir = store.derived_dir(f"topn-{n}")
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._done = -1
+
+    @property
+    def n(self) -> int:
+        return self._n
+
+    @timed("TopNIndex.catch_up")
+    def catch_up(self) -> None:
+        """
+        Rank every snapshot ingested since the last call.
+        """
+        stop = self._store.n_snapshots
+        if self._done == stop:
+            return
+        if self._read_done() < stop:
+            with file_lock(self._dir / ".lock"):
+                start = self._read_done()
+                if start < stop:
+                    self._extend(start, stop)
+        self._load()
+
+    def processes(self, i: int) -> np.ndarray:
+        """
+        Return store rows of the top processes of snapshot `i`, largest first.
+        """
+        rows = self._arrays["proc_rows"][i]
+        return np.asarray(rows[rows >= 0])
+
+    def subtrees(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (store rows of subtree roots, subtree RSS) of snapshot `i`.
+        """
+        rows = self._arrays["sub_rows"][i]
+        keep = rows >= 0
+        return np.asarray(rows[keep]), np.asarray(self._arrays["sub_rss"][i][keep])
+
+    def ranking(self, i: int, kind: str) -> pd.DataFrame:
+        """
+        Return the top `kind` ("processes" or "subtrees") of snapshot `i`.
+
+        Columns: rank, prev_rank (rank in snapshot i-1, NaN if absent),
+        PID, PPID, USER, RSS_MB, CMD and, for subtrees, rss_subtree.
+        """
+        def frame(j: int) -> pd.DataFrame:
+            if kind == "subtrees":
+                rows, sub = self.subtrees(j)
+                df = self._store.frame(rows).assign(rss_subtree=sub)
+            else:
+                df = self._store.frame(self.processes(j))
+            return df.assign(rank=np.arange(1, len(df) + 1))
+
+        cur = frame(i)
+        ident = ["PID", "PPID", "CMD"]
+        if i > 0:
+            prev = frame(i - 1)[[*ident, "rank"]].rename(columns={"rank": "prev_rank"})
+            cur = cur.merge(prev, on=ident, how="left")
+        else:
+            cur["prev_rank"] = np.nan
+        cols = ["rank", "prev_rank", "PID", "PPID", "USER", "RSS_MB"]
+        if kind == "subtrees":
+            cols.append("rss_subtree")
+        return cur[[*cols, "CMD"]]
+
+    def _read_done(self) -> int:
+        try:
+            return int(json.loads((self._dir / "meta.json").read_text(encoding="utf-8"))["done"])
+        except FileNotFoundError:
+            return 0
+
+    def _extend(self, start: int, stop: int) -> None:
+        """
+        Append rankings of snapshots [start, stop) and commit meta.json.
+        """
+        n = self._n
+        cols = self._store.columns()
+        for name, dtype in _ARRAYS.items():
+            path = self._dir / f"{name}.bin"
+            if path.exists():
+                os.truncate(path, start * n * dtype.itemsize)
+
+        out: Dict[str, list] = {name: [] for name in _ARRAYS}
+        for i in range(start, stop):
+            rows = self._store.snapshot_rows(i)
+            rss = cols["rss_mb"][rows].astype(np.int64)
+            parent = parent_index(cols["pid"][rows], cols["ppid"][rows])
+            sub = subtree_sum(parent, rss, depths(parent)).astype(np.int64)
+
+            top_proc = top_rows(rss, n)
+            top_sub = top_rows(sub, n)
+            out["proc_rows"].append(np.where(top_proc >= 0, top_proc + rows.start, -1))
+            out["sub_rows"].append(np.where(top_sub >= 0, top_sub + rows.start, -1))
+            out["sub_rss"].append(np.where(top_sub >= 0, sub[top_sub], 0))
+
+        for name, dtype in _ARRAYS.items():
+            with open(self._dir / f"{name}.bin", "ab") as fh:
+                for chunk in out[name]:
+                    fh.write(chunk.astype(dtype).tobytes())
+        write_json(self._dir / "meta.json", {"done": stop})
+
+    def _load(self) -> None:
+        done = self._read_done()
+        self._arrays = {
+            name: map_array(self._dir / f"{name}.bin", dtype, done * self._n).reshape(done, self._n)
+            for name, dtype in _ARRAYS.items()
+        }
+        self._done = done
+
+
+_INDEXES: Dict[Tuple[int, int], TopNIndex] = {}
+_LOCK = threading.Lock()
+
+
+def open_topn(store: SnapshotStore, n: int) -> TopNIndex:
+    """
+    Return the shared top-N index of `store`, caught up with its snapshots.
+    """
+    key = (id(store), n)
+    with _LOCK:
+        index = _INDEXES.get(key)
+        if index is None or index.generation != store.generation:
+            index = _INDEXES[key] = TopNIndex(store, n)
+        index.catch_up()
+    return index
@@ -1,13 +1,31 @@
 # src/app.py
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 
+from adapters.embedded_collector import start_collector, stop_collector
+from application.concurrency import shutdown_pool
+from application.services import MetricsService
+from config.settings import Settings
+from interfaces.web.assets import install_assets
+from interfaces.web.cgroups_routes import cgroups_router
+from interfaces.web.cmd_groups_routes import groups_router
+from interfaces.web.debug_routes import debug_router
+from interfaces.web.leaks_routes import leaks_router
+from interfaces.web.query_routes import query_router
 from interfaces.web.routes import router
+from interfaces.web.search_routes import search_router
+from interfaces.web.snapshot_diff_routes import diff_router
 from interfaces.web.snapshot_level_routes import lvl_router
 from interfaces.web.snapshot_pid_routes import plot_router
 from interfaces.web.snapshot_pid_plot import plot_router
+from interfaces.web.snapshot_treemap_routes import treemap_router
+from interfaces.web.stream_routes import stream_router
+from interfaces.web.timing import install_timing
+from interfaces.web.topn_routes import topn_router
 
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
@@ -16,14 +34,36 @@ def create_app() -> FastAPI:
     """
     Create and configure FastAPI app with UI routes and static files.
     """
-    app = FastAPI(title="Memory-metrics UI")
+    settings = Settings()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if settings.embedded_collector:
+            start_collector(settings, MetricsService(settings).store())
+        yield
+        stop_collector()
+        shutdown_pool()
+
+    app = FastAPI(title="Memory-metrics UI", lifespan=lifespan)
 
+    install_timing(app)
+    install_assets(app)
     app.mount("/static", StaticFiles(directory="src/interfaces/web/static"), name="static")
 
     app.include_router(router, prefix="/api/v1")
     app.include_router(lvl_router, prefix="/api/v1")
     app.include_router(plot_router, prefix="/api/v1")
     app.include_router(plot_router, prefix="/api/v1")
+    app.include_router(treemap_router, prefix="/api/v1")
+    app.include_router(diff_router, prefix="/api/v1")
+    app.include_router(topn_router, prefix="/api/v1")
+    app.include_router(groups_router, prefix="/api/v1")
+    app.include_router(cgroups_router, prefix="/api/v1")
+    app.include_router(search_router, prefix="/api/v1")
+    app.include_router(leaks_router, prefix="/api/v1")
+    app.include_router(stream_router, prefix="/api/v1")
+    app.include_router(query_router, prefix="/api/v1")
+    app.include_router(debug_router, prefix="/api/v1")
 
     @app.exception_handler(StarletteHTTPException)
     async def redirect_not_found(request: Request, exc: StarletteHTTPException):
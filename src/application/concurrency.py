@@ -0,0 +1,152 @@
+# src/application/concurrency.py
+
+"""
+Request coalescing and a process pool for MetricsService methods.
+
+`@coalesced` makes concurrent calls of a method with equal settings and
+arguments share one computation: the first caller runs it, the others
+wait for its result (or exception). Results are shared, so callers must
+treat them as read-only. Nothing is cached once the call finishes.
+
+`@offloaded` runs a method in a pool of `analysis_workers` processes, so
+long pandas work does not hold the GIL of the serving process. A worker
+builds its own MetricsService from the caller's settings and opens the
+same memory-mapped store; only arguments and results are pickled. With
+`analysis_workers=0` (the default) methods run in the calling thread.
+"""
+
+from __future__ import annotations
+
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from utils.timing import span
+
+
+F = TypeVar("F", bound=Callable)
+
+
+class _Flight:
+    """
+    One in-flight computation and its outcome.
+    """
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+_FLIGHTS: Dict[tuple, _Flight] = {}
+_FLIGHTS_LOCK = threading.Lock()
+
+
+def _settings_key(service: Any) -> str:
+    return service._settings.model_dump_json()
+
+
+def coalesced(fn: F) -> F:
+    """
+    Share one computation between concurrent identical calls of method `fn`.
+
+    Calls with unhashable arguments are not coalesced.
+    """
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        key = (fn.__qualname__, _settings_key(self), args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return fn(self, *args, **kwargs)
+
+        with _FLIGHTS_LOCK:
+            flight = _FLIGHTS.get(key)
+            leader = flight is None
+            if leader:
+                flight = _FLIGHTS[key] = _Flight()
+        if not leader:
+            with span(f"{fn.__qualname__}.coalesced"):
+                flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn(self, *args, **kwargs)
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with _FLIGHTS_LOCK:
+                del _FLIGHTS[key]
+            flight.done.set()
+
+    return wrapper  # type: ignore[return-value]
+
+
+# ---------------------------------------------------------------------- #
+# Process pool
+# ---------------------------------------------------------------------- #
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+_IN_WORKER = False
+
+
+def _mark_worker() -> None:
+    global _IN_WORKER
+    _IN_WORKER = True
+
+
+def _pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            # Workers are spawned, not forked: the server has threads
+            # (threadpool, collector) whose locks a fork would copy.
+            _POOL = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_mark_worker,
+            )
+        return _POOL
+
+
+def shutdown_pool() -> None:
+    """
+    Stop the analysis workers, if any were started.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(cancel_futures=True)
+            _POOL = None
+
+
+def _run_in_worker(settings_json: str, name: str, args: tuple, kwargs: dict) -> Any:
+    from application.services import MetricsService
+    from config.settings import Settings
+
+    service = MetricsService(Settings.model_validate_json(settings_json))
+    return getattr(service, name)(*args, **kwargs)
+
+
+def offloaded(fn: F) -> F:
+    """
+    Run method `fn` in the analysis process pool when one is configured.
+    """
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        workers = self._settings.analysis_workers
+        if _IN_WORKER or workers <= 0:
+            return fn(self, *args, **kwargs)
+        future = _pool(workers).submit(_run_in_worker, _settings_key(self), fn.__name__, args, kwargs)
+        with span(f"{fn.__qualname__}.worker"):
+            return future.result()
+
+    return wrapper  # type: ignore[return-value]
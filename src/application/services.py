@@ -3,17 +3,47 @@
 from __future__ import annotations
 
 import glob
+import os
+import threading
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
-from adapters.dumps_reader import load_process_df, load_system_df
+from adapters.cmd_index import open_cmd_index
+from adapters.dumps_reader import find_dump, read_cgroup_csv, read_system_csv
+from adapters.embedded_collector import pending_system
+from adapters.process_stats import open_process_stats
+from adapters.snapshot_store import SnapshotStore, open_store
+from adapters.subtree_index import open_subtrees
+from adapters.sql_engine import QueryResult, connect as sql_connect, run as sql_run
+from adapters.topn_index import open_topn
+from application.concurrency import coalesced, offloaded
 from config.settings import Settings
+from domain.analysis.cgroups import in_cgroup, rollup as cgroup_rollup
+from domain.analysis.cmd_groups import compile_rules, group_series, group_summary, normalize_command
+from domain.analysis.diff import SnapshotDiff, diff as diff_snapshots
+from domain.analysis.sys_metrics import derive as derive_system, derive_rates, pressure_events
+from domain.analysis.leaks import rss_trends, subtree_trends, suspected_leakers
+from domain.analysis.rollup import parent_index
 from domain.analysis.tree_stats import build as build_tree_stats, build_subtree
-from domain.analysis.timeseries import pid_timeseries
-from domain.filters import ProcessFilter
-from utils.parser import parse_timestamp
+from domain.analysis.timeseries import collect_subtree_pids, pid_timeseries
+from domain.analysis.treemap import OTHER as TREEMAP_OTHER, ROOT as TREEMAP_ROOT, prune as prune_tree
+from domain.filters import LeakFilter, ProcessFilter
+from utils.process import own_memory_mb
+from utils.timing import timed
+
+
+_GROUP_SERIES: Dict[tuple, Tuple[int, pd.DataFrame]] = {}
+"""(store, generation, rules) → (snapshots covered, command-group series); one entry per store."""
+
+_GROUP_LOCK = threading.Lock()
+
+_SYSTEM_FRAMES: Dict[tuple, Tuple[frozenset, pd.DataFrame]] = {}
+"""(dumps dir, glob) → (ingested file names, derived system-metrics frame); one entry per dumps dir."""
+
+_SYSTEM_LOCK = threading.Lock()
 
 
 class MetricsService:
@@ -24,64 +54,164 @@ class MetricsService:
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
 
+    def store(self) -> SnapshotStore:
+        """
+        Return the shared memory-mapped process store, up to date with dumps.
+        """
+        s = self._settings
+        return open_store(
+            s.store_dir or s.dumps_dir / ".store",
+            s.dumps_dir / s.proc_glob,
+            refresh_s=s.store_refresh_s,
+            readonly=s.store_readonly,
+        )
+
     # --------------------------------------------------------------------- #
     # Snapshots & coverage
     # --------------------------------------------------------------------- #
 
+    @timed()
     def available_stamps(self) -> list[str]:
-        mask = self._settings.dumps_dir / self._settings.proc_glob
-        return sorted(
-            parse_timestamp(f, "process_mem_").strftime("%Y%m%d_%H%M%S")
-            for f in glob.iglob(str(mask))
-        )
+        return self.store().stamps()
+
+    @timed()
+    def stamp_at(self, when: pd.Timestamp) -> str:
+        """
+        Return the stamp of the last snapshot taken at or before `when`.
+        """
+        store = self.store()
+        return store.stamps()[store.locate_at(when)]
 
+    @timed()
     def system_metrics(self) -> pd.DataFrame:
-        df = load_system_df(self._settings.dumps_dir / self._settings.sys_glob)
-        df["ram_used_htop_MB"] = (
-            df["MemTotal_MB"]
-            - df["MemFree_MB"]
-            - df["Buffers_MB"]
-            - df["Cached_MB"]
-            - df["SReclaimable_MB"]
-        )
-        df["swap_used_MB"] = df["SwapTotal_MB"] - df["SwapFree_MB"]
+        """
+        Return all system dumps with every derived series, by TIMESTAMP.
+
+        The frame is cached per process; only dumps added since the last
+        call are read and derived, so all dashboard panels share a single
+        ingest. Callers must not modify it.
+        """
+        s = self._settings
+        key = (Path(s.dumps_dir).resolve(), s.sys_glob)
+        files = {os.path.basename(f): f for f in glob.iglob(str(s.dumps_dir / s.sys_glob))}
+        with _SYSTEM_LOCK:
+            seen, df = _SYSTEM_FRAMES.get(key, (frozenset(), pd.DataFrame()))
+            if not seen <= files.keys():
+                seen, df = frozenset(), pd.DataFrame()
+            new = sorted(files.keys() - seen)
+            if new:
+                fresh = derive_system(pd.concat([read_system_csv(files[n]) for n in new], ignore_index=True))
+                df = fresh if df.empty else pd.concat([df, fresh], ignore_index=True)
+                df = derive_rates(df.sort_values("TIMESTAMP", ignore_index=True))
+                for old in [k for k in _SYSTEM_FRAMES if k[0] == key[0] and k != key]:
+                    del _SYSTEM_FRAMES[old]
+                _SYSTEM_FRAMES[key] = (seen | frozenset(new), df)
+
+        pending = pending_system()
+        if not pending.empty:
+            pending = derive_system(pending[~pending["TIMESTAMP"].isin(df.get("TIMESTAMP", []))].copy())
+            df = derive_rates(pd.concat([df, pending], ignore_index=True))
         return df
 
+    @timed()
+    def pressure_events(self, min_psi: float) -> pd.DataFrame:
+        """
+        Return system samples with an OOM kill or memory pressure of at
+        least `min_psi`, each with the stamp of the process snapshot taken
+        at or just before it.
+        """
+        events = pressure_events(self.system_metrics(), min_psi)
+        store = self.store()
+        times = store.snapshot_times()
+        idx = times.searchsorted(events["TIMESTAMP"].to_numpy().astype("datetime64[s]").astype("int64"), "right") - 1
+        stamps = store.stamps()
+        events["stamp"] = [stamps[i] if i >= 0 else None for i in idx]
+        return events
+
+    @timed()
     def coverage(self) -> Tuple[pd.Timestamp, pd.Timestamp]:
         df = self.system_metrics()
         return df["TIMESTAMP"].min(), df["TIMESTAMP"].max()
 
+    @timed()
     def dumps_time_bounds(self) -> Tuple[pd.Timestamp, pd.Timestamp]:
         sys_df = self.system_metrics()
-        proc_df = self.process_df()
-        t_min = min(sys_df["TIMESTAMP"].min(), proc_df["TIMESTAMP"].min())
-        t_max = max(sys_df["TIMESTAMP"].max(), proc_df["TIMESTAMP"].max())
+        times = self.store().snapshot_times()
+        if len(times) == 0:
+            return sys_df["TIMESTAMP"].min(), sys_df["TIMESTAMP"].max()
+        proc_min, proc_max = pd.to_datetime([times[0], times[-1]], unit="s")
+        t_min = min(sys_df["TIMESTAMP"].min(), proc_min)
+        t_max = max(sys_df["TIMESTAMP"].max(), proc_max)
         return t_min, t_max
 
     # ------------------------------------------------------------------ #
     # Per-process snapshots
     # ------------------------------------------------------------------ #
 
+    @timed()
     def process_df(self) -> pd.DataFrame:
-        return load_process_df(self._settings.dumps_dir / self._settings.proc_glob)
+        """
+        Return the full process history, ordered by TIMESTAMP then PID.
+        """
+        return self.store().frame()
 
+    @timed()
     def snapshot_df(self, ts_str: str) -> pd.DataFrame:
-        f = self._settings.dumps_dir / f"process_mem_{ts_str}.csv"
-        if not f.exists():
-            raise FileNotFoundError(f)
-        df = pd.read_csv(f)
-        df["TIMESTAMP"] = parse_timestamp(str(f), "process_mem_")
-        return df
+        """
+        Return the processes of one snapshot; raise KeyError if unknown.
+        """
+        store = self.store()
+        i = store.locate(pd.to_datetime(ts_str, format="%Y%m%d_%H%M%S"))
+        return store.frame(store.snapshot_rows(i))
+
+    @timed()
+    def window_df(
+        self,
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """
+        Return all process rows of snapshots taken within [start, end].
+        """
+        store = self.store()
+        return store.frame(store.window_rows(start, end))
+
+    @timed()
+    def dataset_footprint(self) -> dict:
+        """
+        Return memory used by the loaded process frame, per column, and the
+        inspector's own resident memory.
+        """
+        df = self.process_df()
+        per_col = df.memory_usage(index=True, deep=True)
+        return {
+            "rows": len(df),
+            "snapshots": int(df["TIMESTAMP"].nunique()),
+            "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+            "columns_mb": {col: round(b / 2**20, 3) for col, b in per_col.items()},
+            "total_mb": round(per_col.sum() / 2**20, 3),
+            "store_disk_mb": round(self.store().disk_bytes() / 2**20, 3),
+            "inspector": own_memory_mb(),
+        }
 
     # ------------------------------------------------------------------ #
     # Tree analytics
     # ------------------------------------------------------------------ #
 
+    @timed()
+    @coalesced
     def snapshot_tree_stats(self, ts_str: str, pf: ProcessFilter) -> pd.DataFrame:
+        """
+        Return the filtered process tree of snapshot `ts_str`.
+
+        History stats come from the store's per-process index, looked up for
+        the snapshot's processes only, instead of aggregating every row.
+        """
         snap = self.snapshot_df(ts_str)
-        full = self.process_df()
-        return build_tree_stats(full, snap, pf).head(pf.limit)
+        stats = open_process_stats(self.store()).lookup(snap["PID"].to_numpy(), snap["PPID"].to_numpy())
+        return build_tree_stats(stats, snap, pf).head(pf.limit)
 
+    @timed()
     def snapshot_level(
         self,
         ts_str: str,
@@ -95,6 +225,7 @@ class MetricsService:
             .head(pf.limit)
         )
 
+    @timed()
     def snapshot_subtree(
         self,
         ts_str: str,
@@ -104,6 +235,40 @@ class MetricsService:
         df = self.snapshot_tree_stats(ts_str, pf)
         return build_subtree(df, root_pid)
 
+    @timed()
+    @coalesced
+    def snapshot_treemap(self, ts_str: str, min_fraction: float) -> pd.DataFrame:
+        """
+        Return the process tree of snapshot `ts_str` pruned for a treemap
+        (see `domain.analysis.treemap`), with pid, cmd and group name of
+        every process node; raise KeyError if the snapshot is unknown.
+
+        Subtree RSS and levels come from the store's subtree index, so no
+        tree is rolled up per request.
+        """
+        store = self.store()
+        i = store.locate(pd.to_datetime(ts_str, format="%Y%m%d_%H%M%S"))
+        rows = store.snapshot_rows(i)
+        cols = store.columns(rows)
+        sub = open_subtrees(store).columns(rows)
+        parent = parent_index(cols["pid"], cols["ppid"])
+        nodes = prune_tree(parent, cols["rss_mb"], sub["sub_rss"], min_fraction, sub["level"])
+
+        real = nodes["row"].to_numpy() >= 0
+        at = nodes["row"].to_numpy()[real]
+        cmds = store.strings("cmd")[cols["cmd"][at]]
+        rules = compile_rules(self._settings.cmd_group_rules)
+        nodes["pid"] = -1
+        nodes.loc[real, "pid"] = cols["pid"][at]
+        nodes["cmd"] = ""
+        nodes.loc[real, "cmd"] = cmds
+        nodes["name"] = np.where(nodes["id"] == TREEMAP_ROOT, TREEMAP_ROOT, TREEMAP_OTHER)
+        nodes.loc[real, "name"] = [normalize_command(str(c), rules) for c in cmds]
+        return nodes
+
+    @timed()
+    @coalesced
+    @offloaded
     def pid_plots(self, pid: int) -> Tuple[pd.DataFrame, pd.DataFrame, dict]:
         full = self.process_df()
         ts_df, child_df = pid_timeseries(full, pid)
@@ -123,5 +288,259 @@ class MetricsService:
             "sub_max": ts_df["rss_subtree"].max(),
             "cmd": cmd,
         }
+        stats.update(open_process_stats(self.store()).pid_quantiles(pid))
 
         return ts_df, child_df, stats
+
+    @timed()
+    def pid_summaries(self, pids: List[int]) -> pd.DataFrame:
+        """
+        Return one row of history stats per PID of `pids`, in that order:
+        CMD (first seen), since, until, lifetime_s, rss_min/mean/max,
+        sub_min/mean/max and the own/subtree RSS quantiles.
+
+        One pass over the store columns with the subtree index's per-row
+        subtree RSS, so the cost does not grow with the number of PIDs.
+        """
+        store = self.store()
+        cols = store.columns()
+        rows = np.flatnonzero(np.isin(cols["pid"], pids))
+        df = pd.DataFrame({
+            "PID": cols["pid"][rows],
+            "ts": cols["ts"][rows],
+            "rss": cols["rss_mb"][rows].astype(np.int64),
+            "sub": open_subtrees(store).columns()["sub_rss"][rows],
+            "cmd": cols["cmd"][rows],
+        })
+        out = df.groupby("PID").agg(
+            since=("ts", "min"),
+            until=("ts", "max"),
+            rss_min=("rss", "min"),
+            rss_mean=("rss", "mean"),
+            rss_max=("rss", "max"),
+            sub_min=("sub", "min"),
+            sub_mean=("sub", "mean"),
+            sub_max=("sub", "max"),
+            cmd=("cmd", "first"),
+        )
+        out["CMD"] = np.asarray(store.strings("cmd"))[out.pop("cmd").to_numpy()]
+        out["lifetime_s"] = (out["until"] - out["since"]).astype(np.float64)
+        out["since"] = pd.to_datetime(out["since"], unit="s")
+        out["until"] = pd.to_datetime(out["until"], unit="s")
+        out = out.join(open_process_stats(store).quantiles_by_pid(out.index.to_numpy()))
+        return out.reindex(pd.Index(pids, name="PID")).reset_index()
+
+    @timed()
+    @coalesced
+    @offloaded
+    def snapshot_diff(self, ts_a: str, ts_b: str) -> SnapshotDiff:
+        """
+        Return process and subtree changes between snapshots `ts_a` and `ts_b`.
+        """
+        return diff_snapshots(self.snapshot_df(ts_a), self.snapshot_df(ts_b))
+
+    # ------------------------------------------------------------------ #
+    # Top consumers
+    # ------------------------------------------------------------------ #
+
+    @timed()
+    @coalesced
+    def top_consumers(self, ts_str: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Return (top processes, top subtrees) by RSS of snapshot `ts_str`,
+        with their rank in the previous snapshot.
+        """
+        store = self.store()
+        index = open_topn(store, self._settings.topn_size)
+        i = store.locate(pd.to_datetime(ts_str, format="%Y%m%d_%H%M%S"))
+        return index.ranking(i, "processes"), index.ranking(i, "subtrees")
+
+    @timed()
+    def top_timeline(self, ts_str: str, span: int) -> pd.DataFrame:
+        """
+        Return ranks (rows) × the `span` snapshots up to `ts_str` (columns),
+        each cell holding the PID on that rank.
+        """
+        store = self.store()
+        index = open_topn(store, self._settings.topn_size)
+        i = store.locate(pd.to_datetime(ts_str, format="%Y%m%d_%H%M%S"))
+        stamps = store.stamps()
+        pid = store.columns()["pid"]
+        grid = {
+            stamps[j]: pd.Series(pid[index.processes(j)], dtype="Int32")
+            for j in range(max(0, i - span + 1), i + 1)
+        }
+        out = pd.DataFrame(grid)
+        out.index = pd.RangeIndex(1, len(out) + 1, name="rank")
+        return out
+
+    # ------------------------------------------------------------------ #
+    # Command groups
+    # ------------------------------------------------------------------ #
+
+    @timed()
+    @coalesced
+    def command_groups(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Return (per-snapshot series, per-group summary) of RSS aggregated by
+        normalized command.
+
+        The series is cached per process and extended only with snapshots
+        ingested since the previous call.
+        """
+        store = self.store()
+        rules = tuple(map(tuple, self._settings.cmd_group_rules))
+        key = (id(store), store.generation, rules)
+        with _GROUP_LOCK:
+            done, series = _GROUP_SERIES.get(key, (0, None))
+            n = store.n_snapshots
+            if series is None or done < n:
+                rows = slice(0, 0)
+                if done < n:
+                    rows = slice(store.snapshot_rows(done).start, store.snapshot_rows(n - 1).stop)
+                fresh = group_series(store.frame(rows), rules)
+                series = fresh if series is None else pd.concat([series, fresh], ignore_index=True)
+                # Series of an older generation (or other rules) of this store are never read again.
+                for old in [k for k in _GROUP_SERIES if k[0] == key[0] and k != key]:
+                    del _GROUP_SERIES[old]
+                _GROUP_SERIES[key] = (n, series)
+        return series, group_summary(series)
+
+    # ------------------------------------------------------------------ #
+    # Cgroups
+    # ------------------------------------------------------------------ #
+
+    @timed()
+    @coalesced
+    def cgroup_rollup(self, ts_str: str) -> pd.DataFrame:
+        """
+        Return RSS of snapshot `ts_str` rolled up its cgroup hierarchy, with
+        the kernel's memory.current where the collector recorded it.
+        """
+        s = self._settings
+        path = find_dump(s.dumps_dir, s.cgroup_glob.split("*", 1)[0], ts_str)
+        memory = read_cgroup_csv(path) if path is not None else None
+        return cgroup_rollup(self.snapshot_df(ts_str), memory)
+
+    @timed()
+    def cgroup_series(self, root: str) -> pd.DataFrame:
+        """
+        Return TIMESTAMP, rss_mb, processes of everything in cgroup `root`
+        (itself and below), one row per snapshot.
+
+        Works on the store's column arrays: matching cgroup ids are found
+        in the string table once, then rows are binned by snapshot.
+        """
+        store = self.store()
+        times = store.snapshot_times()
+        cols = store.columns()
+        ids = np.flatnonzero(in_cgroup(store.strings("cgroup"), root))
+        rows = np.isin(cols["cgroup"], ids)
+        snap = np.searchsorted(times, cols["ts"][rows])
+        n = len(times)
+        return pd.DataFrame({
+            "TIMESTAMP": pd.to_datetime(times, unit="s"),
+            "rss_mb": np.bincount(snap, weights=cols["rss_mb"][rows], minlength=n).astype(np.int64),
+            "processes": np.bincount(snap, minlength=n),
+        })
+
+    # ------------------------------------------------------------------ #
+    # Command search
+    # ------------------------------------------------------------------ #
+
+    @timed()
+    def search_processes(
+        self,
+        pattern: str,
+        regex: bool = False,
+        case: bool = False,
+        since: pd.Timestamp | None = None,
+        until: pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """
+        Return every process identity whose CMD matches `pattern` and that
+        ran between `since` and `until`, most recently seen first.
+
+        Columns are those of `ProcessStatsIndex.lookup`. Matching CMD
+        strings come from the trigram index, so only their identities are
+        looked up.
+        """
+        store = self.store()
+        ids = open_cmd_index(store).search(pattern, regex, case)
+        df = open_process_stats(store).by_cmd(ids)
+        if since is not None:
+            df = df[df["last_seen"] >= since]
+        if until is not None:
+            df = df[df["first_seen"] <= until]
+        return df.sort_values("last_seen", ascending=False, kind="stable", ignore_index=True)
+
+    # ------------------------------------------------------------------ #
+    # SQL
+    # ------------------------------------------------------------------ #
+
+    @timed()
+    def query(self, sql: str, limit: int | None = None) -> QueryResult:
+        """
+        Run a read-only SELECT over the archive views of `adapters.sql_engine`.
+        """
+        s = self._settings
+        con = sql_connect(self.store(), self.system_metrics(), str(s.dumps_dir / s.cgroup_glob), s.query_external_access)
+        try:
+            return sql_run(con, sql, min(limit or s.query_row_limit, s.query_row_limit))
+        finally:
+            con.close()
+
+    # ------------------------------------------------------------------ #
+    # Leak detection
+    # ------------------------------------------------------------------ #
+
+    @timed()
+    @coalesced
+    @offloaded
+    def leak_report(
+        self,
+        lf: LeakFilter,
+        ts_str: str | None = None,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Return (suspected leaking processes, fastest-growing subtrees).
+
+        Subtrees are taken from snapshot `ts_str`, the latest one by default.
+        """
+        trends = rss_trends(self.process_df(), lf)
+        ts_str = ts_str or self.available_stamps()[-1]
+        snap = self.snapshot_df(ts_str)
+        return suspected_leakers(trends, lf), subtree_trends(trends, snap, lf)
+
+    # ------------------------------------------------------------------ #
+    # Live samples
+    # ------------------------------------------------------------------ #
+
+    def system_since(self, since: pd.Timestamp) -> pd.DataFrame:
+        """
+        Return derived system metrics of samples taken after `since`.
+        """
+        df = self.system_metrics()
+        if df.empty:
+            return df
+        return df[df["TIMESTAMP"] > since]
+
+    def pid_since(self, pid: int, since: pd.Timestamp) -> List[dict]:
+        """
+        Return one sample per process snapshot taken after `since`: own and
+        subtree RSS of `pid` and the RSS of every PID in its subtree.
+        """
+        store = self.store()
+        times = store.snapshot_times()
+        first = int(times.searchsorted(int(since.value // 10**9), "right"))
+        samples: List[dict] = []
+        for i in range(first, store.n_snapshots):
+            snap = store.frame(store.snapshot_rows(i))
+            members = snap[snap["PID"].isin(collect_subtree_pids(snap, pid))]
+            samples.append({
+                "TIMESTAMP": pd.to_datetime(times[i], unit="s"),
+                "rss_own": int(members.loc[members["PID"] == pid, "RSS_MB"].sum()),
+                "rss_subtree": int(members["RSS_MB"].sum()),
+                "children": dict(zip(members["PID"].astype(str), members["RSS_MB"].astype(int))),
+            })
+        return samples
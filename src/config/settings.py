@@ -1,6 +1,7 @@
 # src/config/settings.py
 
 from pathlib import Path
+from typing import List, Tuple
 
 from pydantic_settings import BaseSettings
 
@@ -11,8 +12,50 @@ class Settings(BaseSettings):
     """
     dumps_dir: Path = Path("dumps/time")
 
-    sys_glob: str = "sys_mem_*.csv"
-    proc_glob: str = "process_mem_*.csv"
+    sys_glob: str = "sys_mem_*.csv*"
+    proc_glob: str = "process_mem_*.csv*"
+    cgroup_glob: str = "cgroup_mem_*.csv*"
+    """Dump masks; the trailing `*` also matches compressed `.csv.gz` / `.csv.zst` dumps."""
+
+    store_dir: Path | None = None
+    """Memory-mapped process store; defaults to `<dumps_dir>/.store`."""
+
+    store_refresh_s: float = 2.0
+    """Minimum interval between scans of `dumps_dir` for new dumps."""
+
+    store_readonly: bool = False
+    """Never ingest dumps; attach to the store published by `src/loader.py`."""
+
+    topn_size: int = 20
+    """Processes and subtrees ranked per snapshot by the top-N index."""
+
+    stream_poll_s: float = 2.0
+    """How often live-stream connections check for new dumps."""
+
+    embedded_collector: bool = False
+    """Sample memory inside the app instead of running scripts/collect_memory.py."""
+
+    collector_interval_s: float = 60.0
+    """Seconds between samples of the embedded collector."""
+
+    collector_flush_every: int = 10
+    """Embedded-collector samples buffered before they are written as dumps."""
+
+    collector_compression: str = ""
+    """Codec of dumps written by the embedded collector: "", "gzip" or "zstd"."""
+
+    analysis_workers: int = 0
+    """Processes running heavy analyses (leaks, diffs, PID timelines); 0 runs them in the request thread."""
+
+    query_row_limit: int = 10_000
+    """Most rows returned by one `/api/v1/query` call."""
+
+    query_external_access: bool = False
+    """Let SQL queries read files other than the archive views (DuckDB `read_csv` etc.)."""
+
+    cmd_group_rules: List[Tuple[str, str]] = []
+    """(regex, group name) pairs tried before the executable-basename default,
+    e.g. CMD_GROUP_RULES='[["celery.*worker", "celery"]]'."""
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,101 @@
+# src/domain/analysis/cgroups.py
+
+"""
+Process RSS rolled up the cgroup hierarchy of one snapshot.
+
+Containers and systemd units show up as cgroups rather than as PPID
+subtrees (a container's processes hang off containerd-shim). Every cgroup
+path and all its ancestors become nodes of a path tree, and RSS is pushed
+to parents with the same vectorized `subtree_sum` used for process trees.
+
+Returned DataFrame columns:
+    cgroup, parent, level, processes_own, processes, rss_own_mb, rss_mb,
+    memory_current_mb (kernel `memory.current`, NaN when not recorded)
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from domain.analysis.rollup import depths, subtree_sum
+
+
+def parent_path(path: str) -> str:
+    """
+    Return the cgroup containing `path` ("/" for top-level cgroups).
+    """
+    head = path.rstrip("/").rsplit("/", 1)[0]
+    return head or "/"
+
+
+def ancestors(path: str) -> List[str]:
+    """
+    Return `path` and every cgroup above it, root ("/") first.
+    """
+    parts = [p for p in path.split("/") if p]
+    return ["/"] + ["/" + "/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def in_cgroup(paths: pd.Index, root: str) -> np.ndarray:
+    """
+    Return a mask of `paths` equal to or below cgroup `root`.
+    """
+    if root == "/":
+        return np.ones(len(paths), dtype=bool)
+    root = root.rstrip("/")
+    values = paths.astype(str)
+    return np.asarray((values == root) | values.str.startswith(root + "/"))
+
+
+def rollup(snap: pd.DataFrame, memory: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Return one row per cgroup of snapshot `snap`, parents before children.
+
+    `memory` (CGROUP, MEMORY_CURRENT_MB from a cgroup dump) is joined when
+    given. Processes of dumps without cgroups fall into the root.
+    """
+    cgroup = snap["CGROUP"].astype(str).replace("", "/")
+    own = snap.groupby(cgroup, observed=True)["RSS_MB"].agg(["sum", "size"])
+
+    nodes = sorted(
+        {node for path in own.index for node in ancestors(path)},
+        key=lambda n: [p for p in n.split("/") if p],
+    )
+    pos = {node: i for i, node in enumerate(nodes)}
+    parent = np.array([-1 if n == "/" else pos[parent_path(n)] for n in nodes], dtype=np.int64)
+    level = depths(parent)
+
+    rss_own = np.zeros(len(nodes))
+    count_own = np.zeros(len(nodes))
+    at = np.array([pos[p] for p in own.index], dtype=np.int64)
+    rss_own[at] = own["sum"].to_numpy()
+    count_own[at] = own["size"].to_numpy()
+
+    out = pd.DataFrame({
+        "cgroup": nodes,
+        "parent": [None if p < 0 else nodes[p] for p in parent],
+        "level": level,
+        "processes_own": count_own.astype(np.int64),
+        "processes": subtree_sum(parent, count_own, level).astype(np.int64),
+        "rss_own_mb": rss_own.astype(np.int64),
+        "rss_mb": subtree_sum(parent, rss_own, level).astype(np.int64),
+    })
+    current = np.nan
+    if memory is not None and not memory.empty:
+        current = out["cgroup"].map(memory.set_index("CGROUP")["MEMORY_CURRENT_MB"])
+    out["memory_current_mb"] = current
+    return out
+
+
+def subtree(df: pd.DataFrame, root: str, max_depth: int) -> pd.DataFrame:
+    """
+    Return rows of a `rollup` at most `max_depth` levels below `root`.
+    """
+    mask = in_cgroup(pd.Index(df["cgroup"]), root)
+    base = df.loc[df["cgroup"] == (root.rstrip("/") or "/"), "level"]
+    if base.empty:
+        return df.iloc[0:0]
+    return df[mask & (df["level"] <= int(base.iloc[0]) + max_depth)]
@@ -0,0 +1,105 @@
+# src/domain/analysis/cmd_groups.py
+
+"""
+Aggregate process memory by normalized command instead of by PID.
+
+Short-lived workers get a new PID on every restart, so per-PID views split
+their memory across many rows. Grouping by command name keeps them in one
+series. Normalization runs once per distinct CMD string (the categories of
+the CMD column), and per-snapshot totals come from a single groupby.
+
+Returned series DataFrame columns:
+    TIMESTAMP       datetime
+    group           str
+    rss_mb          int, total RSS of the group in that snapshot
+    processes       int, number of processes in that snapshot
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+Rule = Tuple[str, str]
+"""(regex applied to the full CMD, group name; may reference groups as \\1)."""
+
+_KERNEL_THREAD = re.compile(r"^\[([^/\]:]+)")
+
+
+def compile_rules(rules: Iterable[Rule]) -> List[Tuple[re.Pattern, str]]:
+    return [(re.compile(pattern), name) for pattern, name in rules]
+
+
+def normalize_command(cmd: str, rules: List[Tuple[re.Pattern, str]]) -> str:
+    """
+    Return the group name of a command line.
+
+    The first matching rule wins; otherwise kernel threads collapse to
+    "[name]" and everything else to the executable basename.
+    """
+    for pattern, name in rules:
+        m = pattern.search(cmd)
+        if m:
+            return m.expand(name)
+    m = _KERNEL_THREAD.match(cmd)
+    if m:
+        return f"[{m.group(1)}]"
+    exe = cmd.split(maxsplit=1)[0] if cmd.strip() else ""
+    return os.path.basename(exe).rstrip(":") or "?"
+
+
+def group_codes(cmd: pd.Series, rules: Iterable[Rule]) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Return (group id per row, group names) for a categorical CMD column.
+    """
+    compiled = compile_rules(rules)
+    names = pd.Index([normalize_command(str(c), compiled) for c in cmd.cat.categories])
+    cat_group, groups = pd.factorize(names)
+    codes = cmd.cat.codes.to_numpy()
+    out = np.where(codes >= 0, cat_group[codes.clip(min=0)], -1)
+    return out, pd.Index(groups)
+
+
+def group_series(df: pd.DataFrame, rules: Iterable[Rule]) -> pd.DataFrame:
+    """
+    Return total RSS and process count per command group and snapshot.
+    """
+    gid, groups = group_codes(df["CMD"], rules)
+    keyed = pd.DataFrame({
+        "TIMESTAMP": df["TIMESTAMP"].to_numpy(),
+        "gid": gid,
+        "rss_mb": df["RSS_MB"].to_numpy(np.int64),
+    })
+    out = (
+        keyed[keyed["gid"] >= 0]
+        .groupby(["TIMESTAMP", "gid"], sort=True)["rss_mb"]
+        .agg(rss_mb="sum", processes="size")
+        .reset_index()
+    )
+    out["group"] = groups[out["gid"].to_numpy()]
+    return out[["TIMESTAMP", "group", "rss_mb", "processes"]]
+
+
+def group_summary(series: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return per-group statistics over all snapshots, largest peak first.
+
+    Snapshots where a group has no process count as zero for the mean.
+    """
+    n_snapshots = max(series["TIMESTAMP"].nunique(), 1)
+    grp = series.groupby("group")
+    out = pd.DataFrame({
+        "snapshots": grp.size(),
+        "rss_mean": grp["rss_mb"].sum() / n_snapshots,
+        "rss_max": grp["rss_mb"].max(),
+        "procs_mean": grp["processes"].sum() / n_snapshots,
+        "procs_max": grp["processes"].max(),
+        "first_seen": grp["TIMESTAMP"].min(),
+        "last_seen": grp["TIMESTAMP"].max(),
+    })
+    return out.sort_values("rss_max", ascending=False).reset_index()
@@ -0,0 +1,96 @@
+# src/domain/analysis/diff.py
+
+"""
+Compare two process snapshots.
+
+Processes are matched on identity (PID, PPID, CMD) with a single join, so
+PID reuse between the snapshots shows up as one exited plus one started
+process rather than as an RSS change. Subtree RSS is rolled up per
+snapshot with `rollup.subtree_sum` before joining.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from domain.analysis.rollup import depths, parent_index, subtree_sum
+
+
+IDENTITY = ["PID", "PPID", "CMD"]
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotDiff:
+    """
+    Differences between snapshot A and a later snapshot B.
+    """
+    started: pd.DataFrame
+    """Processes present only in B: identity, USER, rss_b."""
+
+    exited: pd.DataFrame
+    """Processes present only in A: identity, USER, rss_a."""
+
+    changed: pd.DataFrame
+    """Processes present in both: identity, rss_a, rss_b, delta."""
+
+    subtrees: pd.DataFrame
+    """Processes present in both: identity, level_b, sub_a, sub_b, sub_delta."""
+
+    rss_a: int
+    rss_b: int
+
+
+def _with_subtree(snap: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return identity, USER, RSS and level/subtree RSS of every process in `snap`.
+    """
+    out = snap[[*IDENTITY, "USER"]].copy()
+    out["CMD"] = out["CMD"].astype(str)
+    out["rss"] = snap["RSS_MB"].to_numpy(np.int64)
+    parent = parent_index(snap["PID"].to_numpy(), snap["PPID"].to_numpy())
+    depth = depths(parent)
+    out["level"] = depth
+    out["sub"] = subtree_sum(parent, out["rss"].to_numpy(), depth).astype(np.int64)
+    return out
+
+
+def diff(snap_a: pd.DataFrame, snap_b: pd.DataFrame) -> SnapshotDiff:
+    """
+    Return started/exited processes and per-process and per-subtree RSS deltas.
+    """
+    a, b = _with_subtree(snap_a), _with_subtree(snap_b)
+    joined = a.merge(
+        b, on=IDENTITY, how="outer", suffixes=("_a", "_b"), indicator=True, sort=True
+    )
+    side = joined["_merge"]
+
+    started = joined.loc[side == "right_only", [*IDENTITY, "USER_b", "rss_b"]]
+    exited = joined.loc[side == "left_only", [*IDENTITY, "USER_a", "rss_a"]]
+
+    both = joined[side == "both"].copy()
+    for col in ("rss_a", "rss_b", "sub_a", "sub_b", "level_b"):
+        both[col] = both[col].astype(np.int64)
+    both["delta"] = both["rss_b"] - both["rss_a"]
+    both["sub_delta"] = both["sub_b"] - both["sub_a"]
+
+    return SnapshotDiff(
+        started=started.rename(columns={"USER_b": "USER"})
+        .astype({"rss_b": np.int64})
+        .sort_values("rss_b", ascending=False)
+        .reset_index(drop=True),
+        exited=exited.rename(columns={"USER_a": "USER"})
+        .astype({"rss_a": np.int64})
+        .sort_values("rss_a", ascending=False)
+        .reset_index(drop=True),
+        changed=both[[*IDENTITY, "rss_a", "rss_b", "delta"]]
+        .sort_values("delta", key=np.abs, ascending=False)
+        .reset_index(drop=True),
+        subtrees=both[[*IDENTITY, "level_b", "sub_a", "sub_b", "sub_delta"]]
+        .sort_values("sub_delta", key=np.abs, ascending=False)
+        .reset_index(drop=True),
+        rss_a=int(a["rss"].sum()),
+        rss_b=int(b["rss"].sum()),
+    )
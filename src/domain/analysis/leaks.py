@@ -0,0 +1,145 @@
+# src/domain/analysis/leaks.py
+
+"""
+Leak heuristics over per-process RSS series, computed in one batched pass.
+
+Processes are identified by (PID, PPID, CMD), as in `tree_stats`. All
+per-process sums needed for a least-squares fit, step statistics and
+monotonicity are accumulated with `np.bincount` over the whole history,
+so the cost is a single sort plus a handful of vector passes.
+
+Returned process DataFrame columns:
+    PID, PPID, CMD      identity
+    since, until        first / last snapshot
+    samples             int
+    rss_first/last/max  float
+    growth_mb           rss_last - rss_first
+    slope_mb_h          least-squares slope, MB per hour
+    r2                  goodness of the linear fit
+    monotonic           share of non-shrinking steps
+    steps               number of jumps ≥ step_mb
+    max_step_mb         largest single jump
+    suspect             bool
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from domain.analysis.rollup import depths, parent_index, subtree_sum
+from domain.filters import LeakFilter
+
+
+IDENTITY = ["PID", "PPID", "CMD"]
+
+
+def rss_trends(df_full: pd.DataFrame, flt: LeakFilter) -> pd.DataFrame:
+    """
+    Return per-process RSS trend statistics over the full history.
+    """
+    df = df_full[[*IDENTITY, "TIMESTAMP", "RSS_MB"]]
+    gid = df.groupby(IDENTITY, observed=True, sort=False).ngroup().to_numpy()
+    t_ns = df["TIMESTAMP"].to_numpy().astype("datetime64[ns]").astype(np.int64)
+    order = np.lexsort((t_ns, gid))
+    gid = gid[order]
+    hours = (t_ns[order] - t_ns.min(initial=0)) / 3.6e12
+    rss = df["RSS_MB"].to_numpy()[order].astype(np.float64)
+    n_groups = int(gid.max()) + 1 if len(gid) else 0
+
+    def total(weights: np.ndarray | None = None) -> np.ndarray:
+        return np.bincount(gid, weights=weights, minlength=n_groups)
+
+    # Least-squares fit rss ~ a + slope * hours, per group
+    n = total()
+    st, sy = total(hours), total(rss)
+    stt, syy, sty = total(hours * hours), total(rss * rss), total(hours * rss)
+    var_t = n * stt - st * st
+    var_y = n * syy - sy * sy
+    cov = n * sty - st * sy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(var_t > 0, cov / var_t, 0.0)
+        r2 = np.where((var_t > 0) & (var_y > 0), cov * cov / (var_t * var_y), 0.0)
+
+    # Consecutive steps inside each group
+    first = np.r_[True, gid[1:] != gid[:-1]] if len(gid) else np.zeros(0, bool)
+    last = np.r_[first[1:], True] if len(gid) else first
+    step = np.r_[0.0, np.diff(rss)] if len(gid) else rss
+    inner = ~first
+    n_steps = total(inner.astype(np.float64))
+    up = total((inner & (step >= 0)).astype(np.float64))
+    jumps = total((inner & (step >= flt.step_mb)).astype(np.float64))
+    max_step = np.zeros(n_groups)
+    np.maximum.at(max_step, gid[inner], step[inner])
+    rss_max = np.zeros(n_groups)
+    np.maximum.at(rss_max, gid, rss)
+
+    ident = df.iloc[order[first]][IDENTITY].reset_index(drop=True)
+    times = df["TIMESTAMP"].to_numpy()[order]
+    out = ident.assign(
+        since=times[first],
+        until=times[last],
+        samples=n.astype(np.int64),
+        rss_first=rss[first],
+        rss_last=rss[last],
+        rss_max=rss_max,
+        growth_mb=rss[last] - rss[first],
+        slope_mb_h=slope,
+        r2=r2,
+        monotonic=np.where(n_steps > 0, up / np.maximum(n_steps, 1), 0.0),
+        steps=jumps.astype(np.int64),
+        max_step_mb=max_step,
+    )
+    out["suspect"] = (
+        (out["samples"] >= flt.min_samples)
+        & (out["slope_mb_h"] >= flt.min_slope_mb_h)
+        & (out["monotonic"] >= flt.min_monotonic)
+    )
+    return out
+
+
+def suspected_leakers(trends: pd.DataFrame, flt: LeakFilter) -> pd.DataFrame:
+    """
+    Return suspected leaking processes, fastest-growing first.
+    """
+    return (
+        trends[trends["suspect"]]
+        .sort_values(["slope_mb_h", "r2"], ascending=False)
+        .head(flt.limit)
+        .reset_index(drop=True)
+    )
+
+
+def subtree_trends(
+    trends: pd.DataFrame,
+    df_snapshot: pd.DataFrame,
+    flt: LeakFilter,
+) -> pd.DataFrame:
+    """
+    Return processes of a snapshot ranked by the summed growth of their subtree.
+
+    Slopes and growth of every descendant alive in the snapshot are rolled
+    up bottom-up, so a parent that leaks through many short-lived workers
+    surfaces even when no single child is flagged.
+    """
+    snap = df_snapshot[IDENTITY].merge(
+        trends[[*IDENTITY, "slope_mb_h", "growth_mb", "suspect"]],
+        on=IDENTITY,
+        how="left",
+    ).fillna({"slope_mb_h": 0.0, "growth_mb": 0.0})
+    snap["suspect"] = snap["suspect"].eq(True)
+
+    parent = parent_index(snap["PID"].to_numpy(), snap["PPID"].to_numpy())
+    depth = depths(parent)
+    snap["level"] = depth
+    snap["subtree_slope_mb_h"] = subtree_sum(parent, snap["slope_mb_h"].to_numpy(), depth)
+    snap["subtree_growth_mb"] = subtree_sum(parent, snap["growth_mb"].to_numpy(), depth)
+    snap["subtree_suspects"] = subtree_sum(parent, snap["suspect"].to_numpy(np.float64), depth).astype(np.int64)
+    snap["subtree_size"] = subtree_sum(parent, np.ones(len(snap)), depth).astype(np.int64)
+
+    ranked = snap[(snap["subtree_size"] > 1) & (snap["subtree_slope_mb_h"] >= flt.min_slope_mb_h)]
+    return (
+        ranked.sort_values("subtree_slope_mb_h", ascending=False)
+        .head(flt.limit)
+        .reset_index(drop=True)
+    )
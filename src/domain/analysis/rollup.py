@@ -0,0 +1,72 @@
+# src/domain/analysis/rollup.py
+
+"""
+Vectorized parent-pointer utilities for process trees.
+
+A tree is given as aligned PID/PPID arrays of one snapshot. Instead of a
+Python DFS per node, nodes are bucketed by depth and values are pushed to
+parents one depth level at a time, so the cost is O(depth) numpy passes.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def parent_index(pid: np.ndarray, ppid: np.ndarray) -> np.ndarray:
+    """
+    Return, for every row, the row index of its parent or -1 for roots.
+
+    A row whose PPID is not among `pid` (or equals its own PID) is a root.
+    """
+    pid = np.asarray(pid)
+    ppid = np.asarray(ppid)
+    n = len(pid)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    order = np.argsort(pid, kind="stable")
+    sorted_pid = pid[order]
+    pos = np.searchsorted(sorted_pid, ppid).clip(max=n - 1)
+    parent = np.where(sorted_pid[pos] == ppid, order[pos], -1)
+    parent[parent == np.arange(n)] = -1
+    return parent
+
+
+def depths(parent: np.ndarray) -> np.ndarray:
+    """
+    Return the tree level of every row (roots are level 0).
+
+    Cycles, which `ps` never reports but corrupt dumps may contain, are cut
+    after ``len(parent)`` steps.
+    """
+    depth = np.zeros(len(parent), dtype=np.int32)
+    cur = parent.copy()
+    for _ in range(len(parent)):
+        alive = cur >= 0
+        if not alive.any():
+            break
+        depth[alive] += 1
+        cur[alive] = parent[cur[alive]]
+    return depth
+
+
+def subtree_sum(
+    parent: np.ndarray,
+    values: np.ndarray,
+    depth: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Return, for every row, the sum of `values` over its subtree (itself included).
+    """
+    if depth is None:
+        depth = depths(parent)
+    total = np.asarray(values, dtype=np.float64).copy()
+    if len(total) == 0:
+        return total
+    order = np.argsort(depth, kind="stable")
+    bounds = np.searchsorted(depth[order], np.arange(depth.max() + 2))
+    for d in range(int(depth.max()), 0, -1):
+        rows = order[bounds[d]:bounds[d + 1]]
+        np.add.at(total, parent[rows], total[rows])
+    return total
+
@@ -0,0 +1,99 @@
+# src/domain/analysis/sketch.py
+
+"""
+Mergeable quantile sketches of RSS (DDSketch-style logarithmic buckets).
+
+A value v >= 1 falls in bucket ``ceil(log_γ v) + 1`` with
+γ = (1 + α) / (1 − α), and 0 in bucket 0; a sketch is a count per
+bucket. Every value in a bucket is within relative error α of the
+bucket's representative value, so quantiles read from the counts are
+too. Two sketches merge exactly by adding their counts, whether they
+cover different time windows, the processes of a subtree or different
+hosts, as long as all use the same α.
+
+Sketches of many items are stored CSR-style: ``ptr[i]:ptr[i+1]`` spans
+the (key, count) pairs of item i, keys ascending.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+ALPHA = 0.01
+"""Relative accuracy of quantiles read from a sketch."""
+
+GAMMA = (1 + ALPHA) / (1 - ALPHA)
+
+QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+"""Quantiles shown next to min/mean/max (p50, p95, p99)."""
+
+
+def bucket_of(values: np.ndarray) -> np.ndarray:
+    """
+    Return the bucket key of every value (non-negative, e.g. RSS in MB).
+    """
+    v = np.asarray(values, dtype=np.float64)
+    keys = np.zeros(len(v), dtype=np.int32)
+    pos = v > 0
+    keys[pos] = np.ceil(np.log(v[pos]) / np.log(GAMMA)).astype(np.int32) + 1
+    return keys
+
+
+def bucket_value(keys: np.ndarray) -> np.ndarray:
+    """
+    Return the representative value of every bucket key.
+    """
+    keys = np.asarray(keys, dtype=np.float64)
+    return np.where(keys > 0, 2 * GAMMA ** (keys - 1) / (GAMMA + 1), 0.0)
+
+
+def merge(keys: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the sketch holding all (key, count) pairs given, keys ascending.
+    """
+    uniq, inv = np.unique(keys, return_inverse=True)
+    return uniq, np.bincount(inv, weights=counts, minlength=len(uniq)).astype(np.int64)
+
+
+def quantiles(keys: np.ndarray, counts: np.ndarray, qs: Sequence[float] = QUANTILES) -> np.ndarray:
+    """
+    Return quantiles `qs` of one sketch (pairs in any order, keys may repeat).
+    """
+    keys, counts = merge(keys, counts)
+    return segment_quantiles(np.array([0, len(keys)]), keys, counts, np.array([0]), qs)[0]
+
+
+def segment_quantiles(
+    ptr: np.ndarray,
+    keys: np.ndarray,
+    counts: np.ndarray,
+    rows: np.ndarray,
+    qs: Sequence[float] = QUANTILES,
+) -> np.ndarray:
+    """
+    Return a (len(rows), len(qs)) array of quantiles of CSR sketches `rows`.
+
+    Empty sketches give NaN. All rows are answered with one cumulative sum
+    and one searchsorted per quantile.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    out = np.full((len(rows), len(qs)), np.nan)
+    starts, stops = ptr[rows], ptr[rows + 1]
+    lens = stops - starts
+    if lens.sum() == 0:
+        return out
+
+    seg_first = np.cumsum(lens) - lens
+    idx = np.repeat(starts - seg_first, lens) + np.arange(lens.sum())
+    cum = np.cumsum(counts[idx], dtype=np.int64)
+    before = np.concatenate([[0], cum])[seg_first]
+    total = np.concatenate([[0], cum])[seg_first + lens] - before
+
+    ok = total > 0
+    for j, q in enumerate(qs):
+        rank = before[ok] + np.floor(q * (total[ok] - 1)).astype(np.int64)
+        pos = np.searchsorted(cum, rank, side="right")
+        out[ok, j] = bucket_value(keys[idx[pos]])
+    return out
@@ -0,0 +1,90 @@
+# src/domain/analysis/sys_metrics.py
+
+"""
+Derived system-memory series and per-panel downsampling.
+"""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+def _col(df: pd.DataFrame, name: str) -> pd.Series:
+    """
+    Return column `name` as float, or NaN if older dumps lack it.
+    """
+    if name in df.columns:
+        return df[name].astype("float64")
+    return pd.Series(np.nan, index=df.index)
+
+
+def derive(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add every derived series to raw `sys_mem_*` rows, in place.
+
+    - ram_used_htop_MB: MemTotal − MemFree − Buffers − Cached − SReclaimable
+    - swap_used_MB: SwapTotal − SwapFree
+    - commit_ratio: Committed_AS / CommitLimit (over 1 means overcommitted)
+    - slab_MB: SReclaimable + SUnreclaim
+    - anon_MB / file_MB: AnonPages vs page cache (Cached + Buffers)
+    - hugepages_used: HugePages_Total − HugePages_Free (pages)
+    """
+    df["ram_used_htop_MB"] = (
+        df["MemTotal_MB"]
+        - df["MemFree_MB"]
+        - df["Buffers_MB"]
+        - df["Cached_MB"]
+        - df["SReclaimable_MB"]
+    )
+    df["swap_used_MB"] = df["SwapTotal_MB"] - df["SwapFree_MB"]
+    df["commit_ratio"] = _col(df, "Committed_AS_MB") / _col(df, "CommitLimit_MB").replace(0, np.nan)
+    df["slab_MB"] = _col(df, "SReclaimable_MB") + _col(df, "SUnreclaim_MB")
+    df["anon_MB"] = _col(df, "AnonPages_MB")
+    df["file_MB"] = _col(df, "Cached_MB") + _col(df, "Buffers_MB")
+    df["hugepages_used"] = _col(df, "HugePages_Total") - _col(df, "HugePages_Free")
+    return df
+
+
+def derive_rates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add series computed from consecutive rows of a TIMESTAMP-sorted frame,
+    in place.
+
+    - pgmajfault_rate: major page faults per second
+    - oom_kills: OOM-killer invocations since the previous row
+
+    Counter resets (reboots) give NaN instead of a negative delta.
+    """
+    dt = df["TIMESTAMP"].diff().dt.total_seconds()
+    majfault = _col(df, "pgmajfault").diff()
+    oom = _col(df, "oom_kill").diff()
+    df["pgmajfault_rate"] = (majfault / dt).where(majfault >= 0)
+    df["oom_kills"] = oom.where(oom >= 0)
+    return df
+
+
+def pressure_events(df: pd.DataFrame, min_psi: float) -> pd.DataFrame:
+    """
+    Return rows with an OOM kill or PSI "some" avg10 of at least `min_psi`.
+    """
+    hit = (_col(df, "oom_kills") > 0) | (_col(df, "PSI_some_avg10") >= min_psi)
+    cols = ["TIMESTAMP", "PSI_some_avg10", "PSI_full_avg10", "oom_kills", "pgmajfault_rate"]
+    return df.loc[hit, [c for c in cols if c in df.columns]].reset_index(drop=True)
+
+
+def downsample(df: pd.DataFrame, columns: List[str], max_points: int) -> pd.DataFrame:
+    """
+    Return at most `max_points` rows of TIMESTAMP + `columns`.
+
+    Rows are cut into equal-count buckets; each keeps its first timestamp
+    and the maximum of every column, so short peaks stay visible.
+    """
+    cols = [c for c in columns if c in df.columns]
+    if len(df) <= max_points:
+        return df[["TIMESTAMP", *cols]]
+    bucket = np.arange(len(df)) * max_points // len(df)
+    grouped = df[["TIMESTAMP", *cols]].groupby(bucket, sort=False)
+    out = grouped[cols].max()
+    out.insert(0, "TIMESTAMP", grouped["TIMESTAMP"].first())
+    return out.reset_index(drop=True)
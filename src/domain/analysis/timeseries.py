@@ -2,8 +2,12 @@
 
 from typing import Dict, List, Set, Tuple
 
+import numpy as np
 import pandas as pd
 
+OTHER = "other"
+"""Series name of the descendants not among the top K."""
+
 
 def collect_subtree_pids(df: pd.DataFrame, root: int) -> Set[int]:
     """
@@ -33,25 +37,59 @@ def pid_timeseries(df: pd.DataFrame, root: int) -> Tuple[pd.DataFrame, pd.DataFr
     - Second dataframe (long): TIMESTAMP, PID, rss
     """
     all_pids = collect_subtree_pids(df, root)
+    times = pd.Index(np.sort(df["TIMESTAMP"].unique()), name="TIMESTAMP")
+
+    members = df[df["PID"].isin(all_pids)]
+    rss = members["RSS_MB"]
+    ts_df = pd.DataFrame({
+        "rss_own": rss[members["PID"] == root].groupby(members["TIMESTAMP"]).sum().reindex(times, fill_value=0),
+        "rss_subtree": rss.groupby(members["TIMESTAMP"]).sum().reindex(times, fill_value=0),
+    }).reset_index()
+
+    child_df = pd.DataFrame({
+        "TIMESTAMP": members["TIMESTAMP"].to_numpy(),
+        "PID": members["PID"].to_numpy(np.int64),
+        "rss": rss.to_numpy(np.int64),
+    }).sort_values("TIMESTAMP", kind="stable", ignore_index=True)
+
+    return ts_df, child_df
+
 
-    ts_rows: List[Dict[str, int | float | pd.Timestamp]] = []
-    child_rows: List[Dict[str, int | float | pd.Timestamp]] = []
+def top_children(child_df: pd.DataFrame, k: int, rank: str = "peak") -> Tuple[pd.DataFrame, List[int]]:
+    """
+    Reduce the long per-PID frame of `pid_timeseries` to `k` series.
+
+    PIDs are ranked by peak RSS (`rank="peak"`) or by RSS integrated over
+    time (`rank="area"`, MB·s, each sample weighted by the interval to the
+    next snapshot). The top `k` keep their own series; all others are
+    summed per TIMESTAMP into one `OTHER` series, zero where none ran.
+
+    Returns the long frame TIMESTAMP, series (PID as str or `OTHER`), rss,
+    top series first, and the kept PIDs in rank order.
+    """
+    if child_df.empty:
+        return pd.DataFrame(columns=["TIMESTAMP", "series", "rss"]), []
 
-    for timestamp, snap in df.groupby("TIMESTAMP"):
-        own_rss = snap.loc[snap["PID"] == root, "RSS_MB"].sum()
-        subtree_rss = snap.loc[snap["PID"].isin(all_pids), "RSS_MB"].sum()
+    if rank == "area":
+        times = np.sort(child_df["TIMESTAMP"].unique())
+        dt = np.diff(times).astype("timedelta64[s]").astype(np.float64)
+        dt = np.append(dt, dt[-1] if len(dt) else 1.0)
+        weight = child_df["TIMESTAMP"].map(pd.Series(dt, index=times))
+        score = (child_df["rss"] * weight).groupby(child_df["PID"]).sum()
+    else:
+        score = child_df.groupby("PID")["rss"].max()
+    top = score.sort_values(ascending=False, kind="stable").index[:k]
 
-        ts_rows.append({
-            "TIMESTAMP": timestamp,
-            "rss_own": own_rss,
-            "rss_subtree": subtree_rss,
-        })
+    keep = child_df["PID"].isin(top)
+    kept = child_df[keep]
+    order = pd.Series(np.arange(len(top)), index=top)
+    kept = kept.assign(series=kept["PID"].astype(str), _rank=kept["PID"].map(order))
+    kept = kept.sort_values(["_rank", "TIMESTAMP"], kind="stable")
+    parts = [kept[["TIMESTAMP", "series", "rss"]]]
 
-        for pid, rss in snap[snap["PID"].isin(all_pids)][["PID", "RSS_MB"]].itertuples(index=False):
-            child_rows.append({
-                "TIMESTAMP": timestamp,
-                "PID": pid,
-                "rss": rss,
-            })
+    if not keep.all():
+        times = pd.Index(np.sort(child_df["TIMESTAMP"].unique()), name="TIMESTAMP")
+        other = child_df[~keep].groupby("TIMESTAMP")["rss"].sum().reindex(times, fill_value=0)
+        parts.append(other.reset_index().assign(series=OTHER)[["TIMESTAMP", "series", "rss"]])
 
-    return pd.DataFrame(ts_rows), pd.DataFrame(child_rows)
+    return pd.concat(parts, ignore_index=True), [int(p) for p in top]
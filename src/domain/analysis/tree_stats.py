@@ -11,29 +11,29 @@ Returned DataFrame columns:
     rss_subtree_mean    float
     rss_subtree_max     float
     CMD                 str
+
+plus every other column of `proc_stats` (the store's index adds
+rss_p50/p95/p99 and rss_subtree_p50/p95/p99 from quantile sketches).
 """
 
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Dict, List, Tuple
-
+import numpy as np
 import pandas as pd
 
+from domain.analysis.rollup import depths, parent_index, subtree_sum
 from domain.filters import ProcessFilter
 
 
-def build(
-    df_full: pd.DataFrame,
-    df_snapshot: pd.DataFrame,
-    flt: ProcessFilter,
-) -> pd.DataFrame:
+def aggregate(df_full: pd.DataFrame) -> pd.DataFrame:
     """
-    Return enriched tree of processes present in the given snapshot,
-    augmented with time-series memory stats and filtered by criteria.
+    Return own-RSS stats and lifetime of every (PID, PPID, CMD) in a
+    process history, in the layout `build` expects.
+
+    The store keeps the same table precomputed (see adapters.process_stats);
+    this is for callers holding only raw dumps.
     """
-    # 1. Aggregate own-RSS stats across full history
-    grp = df_full.groupby(["PID", "PPID", "CMD"])
+    grp = df_full.groupby(["PID", "PPID", "CMD"], observed=True)
     stats = grp["RSS_MB"].agg(
         rss_min="min",
         rss_mean="mean",
@@ -42,88 +42,54 @@ def build(
     stats["lifetime"] = (
         grp["TIMESTAMP"].max() - grp["TIMESTAMP"].min()
     ).dt.total_seconds().values
+    return stats
 
-    # 2. Keep only processes visible in snapshot
-    stats = stats.merge(
-        df_snapshot[["PID", "PPID"]], on=["PID", "PPID"], how="inner"
-    )
 
-    # 3. Build parent → children mapping
-    children: Dict[int, List[int]] = defaultdict(list)
-    for pid, ppid in stats[["PID", "PPID"]].itertuples(index=False):
-        children[int(ppid)].append(int(pid))
-
-    # 4. Assign tree levels
-    levels = _assign_levels(stats, children)
-    stats["level"] = stats["PID"].map(levels)
+def build(
+    proc_stats: pd.DataFrame,
+    df_snapshot: pd.DataFrame,
+    flt: ProcessFilter,
+) -> pd.DataFrame:
+    """
+    Return enriched tree of processes present in the given snapshot,
+    augmented with time-series memory stats and filtered by criteria.
 
-    # 5. Calculate subtree RSS
-    subtree_max, subtree_mean = _calc_subtree_rss(stats, children)
-    stats["rss_subtree_max"] = stats["PID"].map(subtree_max)
-    stats["rss_subtree_mean"] = stats["PID"].map(subtree_mean)
+    `proc_stats` holds per-process history stats (see `aggregate`); rows
+    of processes not in the snapshot are ignored. Levels and subtree sums
+    are computed over the whole snapshot, so ancestors and descendants
+    that fail `flt` still count towards the rows that pass it; each
+    process adds the stats of its current identity once, even if its PID
+    ran other commands earlier.
+    """
+    # 1. Keep only processes visible in snapshot
+    stats = proc_stats.merge(
+        df_snapshot[["PID", "PPID"]], on=["PID", "PPID"], how="inner"
+    )
 
-    # 6. Apply filters
+    # 2. Tree of the whole snapshot: levels and per-row history stats
+    pid = df_snapshot["PID"].to_numpy()
+    parent = parent_index(pid, df_snapshot["PPID"].to_numpy())
+    level = depths(parent)
+    own = df_snapshot[["PID", "PPID", "CMD"]].merge(
+        stats[["PID", "PPID", "CMD", "rss_max", "rss_mean"]], on=["PID", "PPID", "CMD"], how="left"
+    )
+    rss_max = own["rss_max"].fillna(0).to_numpy(dtype=np.float64)
+    rss_mean = own["rss_mean"].fillna(0).to_numpy(dtype=np.float64)
+
+    # 3. Subtree RSS, summed bottom-up one depth level at a time
+    sub_max = subtree_sum(parent, rss_max, level)
+    sub_mean = subtree_sum(parent, rss_mean, level)
+
+    # 4. Map back onto the history rows and apply filters
+    at = pd.Index(pid).get_indexer(stats["PID"])
+    stats["level"] = level[at]
+    stats["rss_subtree_max"] = sub_max[at].astype(np.int64)
+    stats["rss_subtree_mean"] = sub_mean[at]
     stats = _apply_filters(stats, flt)
 
     return stats.sort_values(["level", "rss_max"], ascending=[True, False]).reset_index(drop=True)
 
 
-def _assign_levels(
-    stats: pd.DataFrame,
-    children: Dict[int, List[int]],
-) -> Dict[int, int]:
-    """
-    Return mapping PID → level in tree using DFS from roots.
-    """
-    pids = set(stats["PID"])
-    roots = [
-        pid
-        for pid, ppid in stats[["PID", "PPID"]].itertuples(index=False)
-        if ppid not in pids
-    ]
-    levels: Dict[int, int] = {}
-
-    def dfs(pid: int, lvl: int) -> None:
-        levels[pid] = lvl
-        for ch in children.get(pid, []):
-            dfs(ch, lvl + 1)
-
-    for root_pid in roots:
-        dfs(root_pid, 0)
-
-    return levels
-
-
-def _calc_subtree_rss(
-    stats: pd.DataFrame,
-    children: Dict[int, List[int]],
-) -> Tuple[Dict[int, float], Dict[int, float]]:
-    """
-    Return mappings: PID → cumulative rss_max, rss_mean over subtree.
-    """
-    rss_max_map = stats.set_index("PID")["rss_max"].to_dict()
-    rss_mean_map = stats.set_index("PID")["rss_mean"].to_dict()
-
-    subtree_max: Dict[int, float] = {}
-    subtree_mean: Dict[int, float] = {}
-
-    def dfs(pid: int) -> None:
-        m_max = rss_max_map[pid]
-        m_mean = rss_mean_map[pid]
-        for ch in children.get(pid, []):
-            dfs(ch)
-            m_max += subtree_max[ch]
-            m_mean += subtree_mean[ch]
-        subtree_max[pid] = m_max
-        subtree_mean[pid] = m_mean
-
-    for pid in stats["PID"]:
-        if pid not in subtree_max:
-            dfs(pid)
-
-    return subtree_max, subtree_mean
-
-
 def _apply_filters(
     df: pd.DataFrame,
     flt: ProcessFilter,
@@ -0,0 +1,77 @@
+# src/domain/analysis/treemap.py
+
+"""
+Process tree of one snapshot pruned to the nodes worth drawing.
+
+Input is the snapshot's parent pointers (`rollup.parent_index`) and RSS
+with subtree RSS already rolled up (one `rollup.subtree_sum` pass, as
+kept by `adapters.subtree_index`). Subtree RSS never shrinks towards the
+root, so keeping every node whose subtree holds at least `min_fraction`
+of the total keeps a connected tree; everything else is folded, per
+kept parent, into a single "other" node. A 20k-process snapshot thus
+becomes a few hundred rectangles without another walk of the tree.
+
+Returned DataFrame columns (parents before children):
+    id, parent      node ids for plotly ("" parent for the root)
+    row             snapshot row of the process, -1 for synthetic nodes
+    value           subtree RSS in MB (plotly branchvalues="total")
+    own_mb          the process's own RSS, 0 for synthetic nodes
+    folded          subtrees merged into an "other" node, 0 otherwise
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from domain.analysis.rollup import depths
+
+ROOT = "all"
+"""Id of the synthetic node above every root process."""
+
+OTHER = "other"
+"""Label of the node holding the subtrees below `min_fraction`."""
+
+
+def prune(
+    parent: np.ndarray,
+    rss: np.ndarray,
+    sub_rss: np.ndarray,
+    min_fraction: float,
+    level: np.ndarray | None = None,
+) -> pd.DataFrame:
+    """
+    Return the nodes of a snapshot tree whose subtree RSS reaches
+    `min_fraction` of the total, plus one "other" node per kept parent.
+    """
+    rss = np.asarray(rss, dtype=np.float64)
+    sub_rss = np.asarray(sub_rss, dtype=np.float64)
+    if level is None:
+        level = depths(parent)
+    total = float(rss.sum())
+
+    keep = (sub_rss >= min_fraction * total) & (sub_rss > 0)
+    kept = np.flatnonzero(keep)
+    kept = kept[np.argsort(level[kept], kind="stable")]
+    ids = np.char.mod("%d", kept).astype(object)
+    up = parent[kept]
+    parents = np.where(up >= 0, np.char.mod("%d", up.clip(min=0)).astype(object), ROOT)
+
+    # Tops of pruned subtrees: dropped rows under a kept parent or a root.
+    top = np.flatnonzero(~keep & ((parent < 0) | keep[parent.clip(min=0)]))
+    top = top[sub_rss[top] > 0]
+    owner = parent[top]
+    groups, inv = np.unique(owner, return_inverse=True)
+    other_value = np.bincount(inv, weights=sub_rss[top], minlength=len(groups))
+    other_count = np.bincount(inv, minlength=len(groups))
+    other_parent = np.where(groups >= 0, np.char.mod("%d", groups.clip(min=0)).astype(object), ROOT)
+
+    n_kept, n_other = len(kept), len(groups)
+    return pd.DataFrame({
+        "id": np.concatenate([[ROOT], ids, other_parent + "/" + OTHER]),
+        "parent": np.concatenate([[""], parents, other_parent]),
+        "row": np.concatenate([[-1], kept, np.full(n_other, -1)]).astype(np.int64),
+        "value": np.concatenate([[total], sub_rss[kept], other_value]),
+        "own_mb": np.concatenate([[0.0], rss[kept], np.zeros(n_other)]),
+        "folded": np.concatenate([[0], np.zeros(n_kept, dtype=np.int64), other_count]).astype(np.int64),
+    })
@@ -21,3 +21,25 @@ class ProcessFilter:
 
     min_subtree_rss_mb: int = 500
     """Minimum cumulative RSS of a process subtree in MB."""
+
+
+@dataclass(frozen=True, slots=True)
+class LeakFilter:
+    """
+    Thresholds for flagging a process RSS series as a suspected leak.
+    """
+
+    min_samples: int = 6
+    """Minimum number of snapshots a process must appear in."""
+
+    min_slope_mb_h: float = 1.0
+    """Minimum least-squares RSS growth in MB per hour."""
+
+    min_monotonic: float = 0.8
+    """Minimum share of snapshot-to-snapshot steps that do not shrink RSS."""
+
+    step_mb: int = 50
+    """RSS jump between consecutive snapshots counted as a step change."""
+
+    limit: int = 50
+    """Number of top suspects and subtrees to keep."""
@@ -0,0 +1,33 @@
+# src/interfaces/web/assets.py
+
+"""
+plotly.js served by the app itself, so pages work without network access.
+
+The bundle shipped with the installed plotly package is served under a
+versioned URL with a year-long immutable Cache-Control: browsers fetch it
+once per plotly upgrade instead of revalidating it on every page.
+"""
+
+from pathlib import Path
+
+import plotly
+from fastapi import FastAPI
+from fastapi.responses import FileResponse
+
+
+PLOTLY_JS = Path(plotly.__file__).parent / "package_data" / "plotly.min.js"
+PLOTLY_JS_URL = f"/static/plotly-{plotly.__version__}.min.js"
+PLOTLY_SCRIPT = f'<script src="{PLOTLY_JS_URL}" charset="utf-8"></script>'
+
+_CACHE_FOREVER = {"Cache-Control": "public, max-age=31536000, immutable"}
+
+
+def plotly_js() -> FileResponse:
+    return FileResponse(PLOTLY_JS, media_type="text/javascript", headers=_CACHE_FOREVER)
+
+
+def install_assets(app: FastAPI) -> None:
+    """
+    Register the plotly.js route; call before mounting `/static`.
+    """
+    app.add_api_route(PLOTLY_JS_URL, plotly_js, methods=["GET"], include_in_schema=False)
@@ -0,0 +1,125 @@
+# src/interfaces/web/cgroups_routes.py
+
+from __future__ import annotations
+
+import html
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import HTMLResponse
+import pandas as pd
+import plotly.graph_objects as go
+
+from application.services import MetricsService
+from config.settings import Settings
+from domain.analysis.cgroups import subtree
+from interfaces.web.assets import PLOTLY_SCRIPT
+from interfaces.web.plots.encoding import figure_html
+from utils.timing import span
+
+cgroups_router = APIRouter()
+
+
+def get_service() -> MetricsService:
+    return MetricsService(Settings())
+
+
+def _link(cgroup: str, ts: str, depth: int) -> str:
+    return (
+        f'<a href="/api/v1/cgroups?ts={ts}&depth={depth}&cgroup={quote(cgroup)}">'
+        f"{html.escape(cgroup)}</a>"
+    )
+
+
+@cgroups_router.get("/cgroups", response_class=HTMLResponse)
+def cgroups(
+    service: MetricsService = Depends(get_service),
+    ts: str | None = Query(None, description="Timestamp YYYYMMDD_HHMMSS"),
+    cgroup: str = Query("/", description="Cgroup to start from"),
+    depth: int = Query(2, ge=1, le=20, description="Levels shown below `cgroup`"),
+) -> HTMLResponse:
+    """
+    Render RSS rolled up the cgroup hierarchy for one snapshot, processes
+    placed directly in `cgroup`, and the cgroup's RSS over time.
+    """
+    stamps = service.available_stamps()
+    if not stamps:
+        return HTMLResponse("<h1>No process dumps found</h1>", status_code=404)
+    ts = ts or stamps[-1]
+    if ts not in stamps:
+        return HTMLResponse(f"<h1>Timestamp {html.escape(ts)} unknown</h1>", status_code=404)
+
+    tree = subtree(service.cgroup_rollup(ts), cgroup, depth)
+    if tree.empty:
+        return HTMLResponse(f"<h1>No processes in cgroup {html.escape(cgroup)}</h1>", status_code=404)
+
+    table = tree.copy()
+    base = int(table["level"].min())
+    table["cgroup"] = [
+        "&nbsp;&nbsp;" * (lvl - base) + _link(c, ts, depth)
+        for c, lvl in zip(table["cgroup"], table["level"])
+    ]
+    table = table.drop(columns=["parent", "level"])
+    table_html = table.to_html(
+        index=False, escape=False, classes="proc-table", na_rep="–", float_format=lambda x: f"{x:,.0f}"
+    )
+
+    snap = service.snapshot_df(ts)
+    own = snap[snap["CGROUP"].astype(str).replace("", "/") == (cgroup.rstrip("/") or "/")]
+    own = own.sort_values("RSS_MB", ascending=False)[["PID", "PPID", "USER", "RSS_MB", "CMD"]]
+    own["PID"] = [f'<a href="/api/v1/snapshot/pid/plot?pid={p}">{p}</a>' for p in own["PID"]]
+    own["CMD"] = [html.escape(str(c)) for c in own["CMD"]]
+    own_html = (
+        own.to_html(index=False, escape=False, classes="proc-table")
+        if not own.empty else "<p>No processes directly in this cgroup.</p>"
+    )
+
+    series = service.cgroup_series(cgroup)
+    fig = go.Figure()
+    fig.add_scattergl(x=series["TIMESTAMP"], y=series["rss_mb"], mode="lines", name="RSS")
+    fig.update_layout(title=f"RSS in {cgroup}, MB", height=400, hovermode="x unified")
+    with span("render.figure"):
+        series_html = figure_html(fig)
+
+    parent = tree["parent"].iloc[0]
+    up = f'<p>Up: {_link(parent, ts, depth)}</p>' if parent else ""
+    ts_options = "\n".join(
+        f'<option value="{s}" {"selected" if s == ts else ""}>{s}</option>'
+        for s in stamps
+    )
+    when = pd.to_datetime(ts, format="%Y%m%d_%H%M%S")
+
+    return HTMLResponse(
+        f"""
+    <html>
+      <head>
+        <title>Cgroups at {ts}</title>
+        <link rel="stylesheet" href="/static/mem.css">
+        {PLOTLY_SCRIPT}
+      </head>
+      <body style="font-family:sans-serif;">
+        <div class="wrapper">
+          <h1>Memory by cgroup <small>{when}</small></h1>
+
+          <form class="pure-form">
+            Snapshot <select name="ts">{ts_options}</select>
+            cgroup <input name="cgroup" type="text" value="{html.escape(cgroup)}" style="width:24em">
+            depth <input name="depth" type="number" value="{depth}" style="width:4em">
+            <button class="pure-button" type="submit">Apply</button>
+          </form>
+          {up}
+
+          <h2>Hierarchy</h2>
+          {table_html}
+
+          <h2>Processes directly in {html.escape(cgroup)}</h2>
+          {own_html}
+
+          {series_html}
+
+          <p><a href="/api/v1/snapshot/level?lvl=0&ts={ts}">← back to snapshot</a></p>
+        </div>
+      </body>
+    </html>
+    """
+    )
@@ -0,0 +1,91 @@
+# src/interfaces/web/cmd_groups_routes.py
+
+from __future__ import annotations
+
+import html
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import HTMLResponse
+import plotly.graph_objects as go
+
+from application.services import MetricsService
+from config.settings import Settings
+from interfaces.web.assets import PLOTLY_SCRIPT
+from interfaces.web.plots.encoding import figure_html
+from utils.timing import span
+
+groups_router = APIRouter()
+
+
+def get_service() -> MetricsService:
+    return MetricsService(Settings())
+
+
+@groups_router.get("/groups", response_class=HTMLResponse)
+def command_groups(
+    service: MetricsService = Depends(get_service),
+    top: int = Query(10, ge=1, le=100, description="Groups to plot, by peak RSS"),
+    limit: int = Query(100, ge=1, le=10000, description="Maximum rows in the summary"),
+) -> HTMLResponse:
+    """
+    Render RSS and process count over time aggregated by normalized command.
+    """
+    series, summary = service.command_groups()
+    if series.empty:
+        return HTMLResponse("<h1>No process dumps found</h1>", status_code=404)
+
+    ts_min, ts_max = service.dumps_time_bounds()
+    shown = series[series["group"].isin(summary["group"].head(top))]
+
+    rss_fig = go.Figure()
+    count_fig = go.Figure()
+    for name, grp in shown.groupby("group", sort=False):
+        rss_fig.add_scattergl(x=grp["TIMESTAMP"], y=grp["rss_mb"], mode="lines", name=str(name))
+        count_fig.add_scattergl(x=grp["TIMESTAMP"], y=grp["processes"], mode="lines", name=str(name))
+    rss_fig.update_layout(title="RSS by command group, MB", height=550, hovermode="x unified")
+    count_fig.update_layout(title="Processes by command group", height=400, hovermode="x unified")
+    rss_fig.update_xaxes(range=[ts_min, ts_max])
+    count_fig.update_xaxes(range=[ts_min, ts_max])
+    with span("render.figure"):
+        rss_html = figure_html(rss_fig)
+        count_html = figure_html(count_fig)
+
+    table = summary.head(limit).copy()
+    table["group"] = [html.escape(str(g)) for g in table["group"]]
+    table_html = table.to_html(
+        index=False,
+        escape=False,
+        classes="proc-table",
+        float_format=lambda x: f"{x:,.1f}",
+    )
+
+    return HTMLResponse(
+        f"""
+    <html>
+      <head>
+        <title>Command groups</title>
+        <link rel="stylesheet" href="/static/mem.css">
+        {PLOTLY_SCRIPT}
+      </head>
+      <body style="font-family:sans-serif;">
+        <div class="wrapper">
+          <h1>Memory by command group</h1>
+
+          <form class="pure-form">
+            Plot top <input name="top" type="number" value="{top}" style="width:4em"> groups,
+            list <input name="limit" type="number" value="{limit}" style="width:5em"> rows
+            <button class="pure-button" type="submit">Apply</button>
+          </form>
+
+          {rss_html}
+          {count_html}
+
+          <h2>Groups</h2>
+          {table_html}
+
+          <p><a href="/api/v1/">← back to dashboard</a></p>
+        </div>
+      </body>
+    </html>
+    """
+    )
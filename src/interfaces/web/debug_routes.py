@@ -0,0 +1,30 @@
+# src/interfaces/web/debug_routes.py
+
+from fastapi import APIRouter, Depends
+
+from application.services import MetricsService
+from config.settings import Settings
+from interfaces.web.timing import timing_log
+
+
+debug_router = APIRouter()
+
+
+def get_service() -> MetricsService:
+    return MetricsService(Settings())
+
+
+@debug_router.get("/debug/memory")
+def debug_memory(service: MetricsService = Depends(get_service)) -> dict:
+    """
+    Return the inspector's own dataset footprint as JSON.
+    """
+    return service.dataset_footprint()
+
+
+@debug_router.get("/debug/timings")
+def debug_timings() -> dict:
+    """
+    Return recent request timings and per-route latency histograms as JSON.
+    """
+    return timing_log.report()
@@ -0,0 +1,118 @@
+# src/interfaces/web/leaks_routes.py
+
+from __future__ import annotations
+
+import html
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import HTMLResponse
+import pandas as pd
+
+from application.services import MetricsService
+from config.settings import Settings
+from domain.filters import LeakFilter
+
+leaks_router = APIRouter()
+
+
+def get_service() -> MetricsService:
+    return MetricsService(Settings())
+
+
+def _table(df: pd.DataFrame, cols: list[str]) -> str:
+    """
+    Return an HTML table of `cols` with PID links and escaped CMD.
+    """
+    out = df[cols].copy()
+    out["PID"] = [
+        f'<a href="/api/v1/snapshot/pid/plot?pid={p}">{p}</a>' for p in out["PID"]
+    ]
+    out["CMD"] = [html.escape(str(c)) for c in out["CMD"]]
+    return out.to_html(
+        index=False,
+        escape=False,
+        classes="proc-table",
+        float_format=lambda x: f"{x:,.2f}",
+    )
+
+
+@leaks_router.get("/leaks", response_class=HTMLResponse)
+def leaks(
+    service: MetricsService = Depends(get_service),
+    ts: str | None = Query(None, description="Snapshot for subtree ranking, YYYYMMDD_HHMMSS"),
+    min_samples: int = Query(6, ge=2, description="Minimum snapshots per process"),
+    min_slope: float = Query(1.0, ge=0, description="Minimum growth in MB/h"),
+    min_monotonic: float = Query(0.8, ge=0, le=1, description="Minimum share of non-shrinking steps"),
+    step_mb: int = Query(50, ge=1, description="Jump counted as a step change, MB"),
+    limit: int = Query(50, ge=1, le=10000, description="Maximum number of rows"),
+) -> HTMLResponse:
+    """
+    Render processes and subtrees ranked by suspected RSS leak.
+    """
+    stamps = service.available_stamps()
+    if not stamps:
+        return HTMLResponse("<h1>No process dumps found</h1>", status_code=404)
+
+    ts = ts or stamps[-1]
+    if ts not in stamps:
+        return HTMLResponse(f"<h1>Timestamp {html.escape(ts)} unknown</h1>", status_code=404)
+
+    lf = LeakFilter(
+        min_samples=min_samples,
+        min_slope_mb_h=min_slope,
+        min_monotonic=min_monotonic,
+        step_mb=step_mb,
+        limit=limit,
+    )
+    procs, subtrees = service.leak_report(lf, ts)
+
+    procs_html = _table(procs, [
+        "PID", "PPID", "since", "until", "samples",
+        "rss_first", "rss_last", "growth_mb", "slope_mb_h",
+        "r2", "monotonic", "steps", "max_step_mb", "CMD",
+    ]) if not procs.empty else "<p>No suspected leaks.</p>"
+
+    subtrees_html = _table(subtrees, [
+        "PID", "PPID", "level", "subtree_size", "subtree_suspects",
+        "subtree_growth_mb", "subtree_slope_mb_h", "CMD",
+    ]) if not subtrees.empty else "<p>No growing subtrees.</p>"
+
+    ts_options = "\n".join(
+        f'<option value="{s}" {"selected" if s == ts else ""}>{s}</option>'
+        for s in stamps
+    )
+
+    return HTMLResponse(
+        f"""
+    <html>
+      <head>
+        <title>Suspected leaks</title>
+        <link rel="stylesheet" href="/static/mem.css">
+      </head>
+      <body style="font-family:sans-serif;">
+        <div class="wrapper">
+          <h1>Suspected leaks</h1>
+
+          <form class="pure-form">
+            Subtrees at
+            <select name="ts">{ts_options}</select>,
+            samples ≥ <input name="min_samples" type="number" value="{min_samples}" style="width:4em">,
+            slope ≥ <input name="min_slope" type="number" step="any" value="{min_slope}" style="width:5em"> MB/h,
+            monotonic ≥ <input name="min_monotonic" type="number" step="any" value="{min_monotonic}" style="width:4em">,
+            step ≥ <input name="step_mb" type="number" value="{step_mb}" style="width:5em"> MB,
+            top <input name="limit" type="number" value="{limit}" style="width:4em"> rows
+            <button class="pure-button" type="submit">Apply</button>
+          </form>
+
+          <h2>Processes</h2>
+          {procs_html}
+
+          <h2>Subtrees at {ts}</h2>
+          {subtrees_html}
+
+          <p><a href="/api/v1/">← back to dashboard</a></p>
+        </div>
+      </body>
+    </html>
+    """
+    )
@@ -0,0 +1,24 @@
+# src/interfaces/web/plots/anon_file.py
+
+from typing import Dict, List
+
+import pandas as pd
+import plotly.graph_objects as go
+
+
+ANON_FILE_SERIES: Dict[str, str] = {
+    "Anon, MB": "anon_MB",
+    "File cache, MB": "file_MB",
+    "AnonHugePages, MB": "AnonHugePages_MB",
+}
+"""Trace name → system-metrics column; the live stream extends traces by name."""
+
+
+def anon_file_traces(df: pd.DataFrame) -> List[go.Scattergl]:
+    """
+    Return anonymous memory against file-backed page cache.
+    """
+    return [
+        go.Scattergl(x=df["TIMESTAMP"], y=df[col], mode="lines", name=name)
+        for name, col in ANON_FILE_SERIES.items()
+    ]
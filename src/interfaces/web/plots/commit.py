@@ -0,0 +1,22 @@
+# src/interfaces/web/plots/commit.py
+
+from typing import Dict, List
+
+import pandas as pd
+import plotly.graph_objects as go
+
+
+COMMIT_SERIES: Dict[str, str] = {
+    "Committed_AS / CommitLimit": "commit_ratio",
+}
+"""Trace name → system-metrics column; the live stream extends traces by name."""
+
+
+def commit_traces(df: pd.DataFrame) -> List[go.Scattergl]:
+    """
+    Return the commit ratio; above 1 the kernel has promised more than it can back.
+    """
+    return [
+        go.Scattergl(x=df["TIMESTAMP"], y=df[col], mode="lines", name=name)
+        for name, col in COMMIT_SERIES.items()
+    ]
@@ -0,0 +1,58 @@
+# src/interfaces/web/plots/dashboard.py
+
+import math
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from interfaces.web.plots.anon_file import ANON_FILE_SERIES, anon_file_traces
+from interfaces.web.plots.commit import COMMIT_SERIES, commit_traces
+from interfaces.web.plots.faults import FAULTS_SERIES, faults_traces
+from interfaces.web.plots.hugepages import HUGEPAGES_SERIES, hugepages_traces
+from interfaces.web.plots.pressure import PRESSURE_SERIES, pressure_traces
+from interfaces.web.plots.ram import RAM_SERIES, ram_traces
+from interfaces.web.plots.slab import SLAB_SERIES, slab_traces
+from interfaces.web.plots.swap import SWAP_SERIES, swap_traces
+
+
+Panel = Tuple[str, Dict[str, str], Callable[[pd.DataFrame], List[go.Scattergl]]]
+
+SYSTEM_PANELS: List[Panel] = [
+    ("RAM usage (htop)", RAM_SERIES, ram_traces),
+    ("Swap usage", SWAP_SERIES, swap_traces),
+    ("Commit ratio", COMMIT_SERIES, commit_traces),
+    ("Kernel memory", SLAB_SERIES, slab_traces),
+    ("Anon vs file cache", ANON_FILE_SERIES, anon_file_traces),
+    ("HugePages", HUGEPAGES_SERIES, hugepages_traces),
+    ("Memory pressure (PSI)", PRESSURE_SERIES, pressure_traces),
+    ("Major faults & OOM kills", FAULTS_SERIES, faults_traces),
+]
+"""Dashboard panels: (title, trace name → column, trace builder)."""
+
+
+def build_dashboard(
+    figs: List[go.Figure],
+    n_cols: int = 2,
+    height: int = 500,
+) -> go.Figure:
+    """
+    Return a single figure laying out `figs` on a grid of `n_cols` columns.
+
+    Each source figure keeps its title and x-axis range; `height` is per row.
+    """
+    n_cols = max(1, min(n_cols, len(figs)))
+    n_rows = math.ceil(len(figs) / n_cols)
+    titles = [fig.layout.title.text or "" for fig in figs]
+
+    dash = make_subplots(rows=n_rows, cols=n_cols, subplot_titles=titles)
+    for i, fig in enumerate(figs):
+        row, col = divmod(i, n_cols)
+        for trace in fig.data:
+            dash.add_trace(trace, row=row + 1, col=col + 1)
+        if fig.layout.xaxis.range is not None:
+            dash.update_xaxes(range=fig.layout.xaxis.range, row=row + 1, col=col + 1)
+
+    dash.update_layout(height=height * n_rows, hovermode="x unified")
+    return dash
@@ -0,0 +1,59 @@
+# src/interfaces/web/plots/encoding.py
+
+"""
+Compact figure serialization for the HTML pages.
+
+Plotly writes numpy arrays as base64 typed arrays (``{"dtype", "bdata"}``)
+but datetimes as one ISO string per point, which dominates page size and
+browser parse time on long histories. `figure_html` turns datetime x data
+into float64 epoch milliseconds first, so every x/y array ships as binary,
+and marks the x axes as dates so plotly.js still renders them as time.
+
+Pages load plotly.js once from `interfaces.web.assets.PLOTLY_SCRIPT`.
+"""
+
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+def epoch_ms(values: Any) -> np.ndarray:
+    """
+    Return datetimes as float64 milliseconds since the epoch (NaT → NaN).
+    """
+    ts = np.asarray(pd.to_datetime(values), dtype="datetime64[ms]")
+    out = ts.astype(np.int64).astype(np.float64)
+    out[np.isnat(ts)] = np.nan
+    return out
+
+
+def _is_datetimes(values: Any) -> bool:
+    if isinstance(values, np.ndarray):
+        return values.dtype.kind == "M"
+    if isinstance(values, (list, tuple)) and values:
+        return all(isinstance(v, (datetime, np.datetime64)) for v in values)
+    return False
+
+
+def compact(fig: go.Figure) -> go.Figure:
+    """
+    Replace datetime x data of every trace with epoch-ms arrays, in place.
+    """
+    dates = False
+    for trace in fig.data:
+        if _is_datetimes(getattr(trace, "x", None)):
+            trace.x = epoch_ms(trace.x)
+            dates = True
+    if dates:
+        fig.update_xaxes(type="date")
+    return fig
+
+
+def figure_html(fig: go.Figure, div_id: str | None = None) -> str:
+    """
+    Return `fig` as an HTML fragment with binary-encoded data and no plotly.js.
+    """
+    return compact(fig).to_html(full_html=False, include_plotlyjs=False, div_id=div_id)
@@ -0,0 +1,24 @@
+# src/interfaces/web/plots/faults.py
+
+from typing import Dict, List
+
+import pandas as pd
+import plotly.graph_objects as go
+
+
+FAULTS_SERIES: Dict[str, str] = {
+    "Major faults/s": "pgmajfault_rate",
+    "OOM kills": "oom_kills",
+}
+"""Trace name → system-metrics column; the live stream extends traces by name."""
+
+
+def faults_traces(df: pd.DataFrame) -> List[go.Scattergl]:
+    """
+    Return the major page-fault rate and OOM kills (as markers) per sample.
+    """
+    (faults, faults_col), (oom, oom_col) = FAULTS_SERIES.items()
+    return [
+        go.Scattergl(x=df["TIMESTAMP"], y=df[faults_col], mode="lines", name=faults),
+        go.Scattergl(x=df["TIMESTAMP"], y=df[oom_col], mode="markers", name=oom, marker=dict(symbol="x", size=9)),
+    ]
@@ -0,0 +1,24 @@
+# src/interfaces/web/plots/hugepages.py
+
+from typing import Dict, List
+
+import pandas as pd
+import plotly.graph_objects as go
+
+
+HUGEPAGES_SERIES: Dict[str, str] = {
+    "HugePages used": "hugepages_used",
+    "HugePages total": "HugePages_Total",
+}
+"""Trace name → system-metrics column; the live stream extends traces by name."""
+
+
+def hugepages_traces(df: pd.DataFrame) -> List[go.Scattergl]:
+    """
+    Return used against reserved huge pages (page counts, not MB).
+    """
+    (used, used_col), (total, total_col) = HUGEPAGES_SERIES.items()
+    return [
+        go.Scattergl(x=df["TIMESTAMP"], y=df[used_col], mode="lines", name=used),
+        go.Scattergl(x=df["TIMESTAMP"], y=df[total_col], mode="lines", name=total, line=dict(dash="dot")),
+    ]
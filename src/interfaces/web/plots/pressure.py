@@ -0,0 +1,23 @@
+# src/interfaces/web/plots/pressure.py
+
+from typing import Dict, List
+
+import pandas as pd
+import plotly.graph_objects as go
+
+
+PRESSURE_SERIES: Dict[str, str] = {
+    "PSI some avg10, %": "PSI_some_avg10",
+    "PSI full avg10, %": "PSI_full_avg10",
+}
+"""Trace name → system-metrics column; the live stream extends traces by name."""
+
+
+def pressure_traces(df: pd.DataFrame) -> List[go.Scattergl]:
+    """
+    Return memory pressure: share of time some / all tasks stalled on memory.
+    """
+    return [
+        go.Scattergl(x=df["TIMESTAMP"], y=df[col], mode="lines", name=name)
+        for name, col in PRESSURE_SERIES.items() if col in df.columns
+    ]
@@ -0,0 +1,24 @@
+# src/interfaces/web/plots/ram.py
+
+from typing import Dict, List
+
+import pandas as pd
+import plotly.graph_objects as go
+
+
+RAM_SERIES: Dict[str, str] = {
+    "RAM used, MB": "ram_used_htop_MB",
+    "RAM total, MB": "MemTotal_MB",
+}
+"""Trace name → system-metrics column; the live stream extends traces by name."""
+
+
+def ram_traces(df: pd.DataFrame) -> List[go.Scattergl]:
+    """
+    Return traces for used RAM (htop formula) against total RAM.
+    """
+    (used, used_col), (total, total_col) = RAM_SERIES.items()
+    return [
+        go.Scattergl(x=df["TIMESTAMP"], y=df[used_col], mode="lines", name=used),
+        go.Scattergl(x=df["TIMESTAMP"], y=df[total_col], mode="lines", name=total, line=dict(dash="dot")),
+    ]
@@ -0,0 +1,24 @@
+# src/interfaces/web/plots/slab.py
+
+from typing import Dict, List
+
+import pandas as pd
+import plotly.graph_objects as go
+
+
+SLAB_SERIES: Dict[str, str] = {
+    "Slab, MB": "slab_MB",
+    "SUnreclaim, MB": "SUnreclaim_MB",
+    "PageTables, MB": "PageTables_MB",
+}
+"""Trace name → system-metrics column; the live stream extends traces by name."""
+
+
+def slab_traces(df: pd.DataFrame) -> List[go.Scattergl]:
+    """
+    Return kernel memory: total slab, its unreclaimable part and page tables.
+    """
+    return [
+        go.Scattergl(x=df["TIMESTAMP"], y=df[col], mode="lines", name=name)
+        for name, col in SLAB_SERIES.items()
+    ]
@@ -0,0 +1,24 @@
+# src/interfaces/web/plots/swap.py
+
+from typing import Dict, List
+
+import pandas as pd
+import plotly.graph_objects as go
+
+
+SWAP_SERIES: Dict[str, str] = {
+    "Swap used, MB": "swap_used_MB",
+    "Swap total, MB": "SwapTotal_MB",
+}
+"""Trace name → system-metrics column; the live stream extends traces by name."""
+
+
+def swap_traces(df: pd.DataFrame) -> List[go.Scattergl]:
+    """
+    Return traces for used swap against total swap.
+    """
+    (used, used_col), (total, total_col) = SWAP_SERIES.items()
+    return [
+        go.Scattergl(x=df["TIMESTAMP"], y=df[used_col], mode="lines", name=used),
+        go.Scattergl(x=df["TIMESTAMP"], y=df[total_col], mode="lines", name=total, line=dict(dash="dot")),
+    ]
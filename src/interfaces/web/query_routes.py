@@ -0,0 +1,55 @@
+# src/interfaces/web/query_routes.py
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Body, Depends, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from adapters.sql_engine import SqlError, SqlUnavailable
+from application.services import MetricsService
+from config.settings import Settings
+
+query_router = APIRouter()
+
+
+def get_service() -> MetricsService:
+    return MetricsService(Settings())
+
+
+def _run(service: MetricsService, sql: str, limit: int | None) -> JSONResponse:
+    try:
+        result = service.query(sql, limit)
+    except SqlUnavailable as exc:
+        return JSONResponse({"error": str(exc)}, status_code=501)
+    except SqlError as exc:
+        return JSONResponse({"error": str(exc)}, status_code=400)
+    return JSONResponse(jsonable_encoder({
+        "columns": result.columns,
+        "rows": result.rows,
+        "truncated": result.truncated,
+    }))
+
+
+@query_router.get("/query")
+def query(
+    service: MetricsService = Depends(get_service),
+    sql: str = Query(..., description="One SELECT over processes, subtrees, system, cgroups"),
+    limit: int | None = Query(None, ge=1, description="Most rows returned (capped by QUERY_ROW_LIMIT)"),
+) -> JSONResponse:
+    """
+    Run a read-only SQL query over the dump archive and return JSON rows.
+    """
+    return _run(service, sql, limit)
+
+
+@query_router.post("/query")
+def query_post(
+    service: MetricsService = Depends(get_service),
+    sql: str = Body(..., media_type="text/plain"),
+    limit: int | None = Query(None, ge=1),
+) -> JSONResponse:
+    """
+    Same as GET /query, with the SQL text as the request body.
+    """
+    return _run(service, sql, limit)
@@ -7,11 +7,13 @@ from typing import List
 
 import pandas as pd
 
+from utils.timing import timed
+
 
 COLS = (
     "PID", "PPID", "lifetime",
-    "rss_min", "rss_mean",
-    "rss_subtree_mean", "rss_subtree_max",
+    "rss_min", "rss_mean", "rss_p50", "rss_p95", "rss_p99",
+    "rss_subtree_mean", "rss_subtree_p50", "rss_subtree_p95", "rss_subtree_p99", "rss_subtree_max",
     "rss_max",
     "CMD",
 )
@@ -31,6 +33,7 @@ def _format_row(row: pd.Series) -> str:
     return f"<tr>{''.join(cells)}</tr>"
 
 
+@timed()
 def build_proc_tree(df: pd.DataFrame) -> str:
     """
     Return an HTML table representing the process tree.
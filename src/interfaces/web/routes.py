@@ -1,15 +1,17 @@
 # src/interfaces/web/routes.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import HTMLResponse
 import plotly.graph_objects as go
 
 from application.services import MetricsService
 from config.settings import Settings
-from interfaces.web.plots.dashboard import build_dashboard
-from interfaces.web.plots.ram import ram_traces
-from interfaces.web.plots.swap import swap_traces
+from domain.analysis.sys_metrics import downsample
+from interfaces.web.assets import PLOTLY_SCRIPT
+from interfaces.web.plots.dashboard import SYSTEM_PANELS, build_dashboard
+from interfaces.web.plots.encoding import figure_html
 from utils.time import format_timedelta
+from utils.timing import span
 
 
 router = APIRouter()
@@ -24,9 +26,19 @@ def index(
     svc: MetricsService = Depends(get_service),
     cols: int = 2,
     height: int = 500,
+    live: bool = True,
+    points: int = Query(2000, ge=10, le=100000, description="Maximum points per panel"),
+    psi: float = Query(10.0, ge=0, le=100, description="PSI 'some' avg10 (%) listed as a pressure event"),
 ) -> str:
     """
-    Render dashboard with RAM and Swap usage charts.
+    Render dashboard with RAM, Swap, commit, kernel, anon/file and
+    HugePages charts.
+
+    Each panel is downsampled on its own columns to `points`. With `live`
+    (default) the page subscribes to /stream/system and appends new
+    samples to the charts as dumps arrive. Pressure events (PSI above
+    `psi` or OOM kills) link to the process snapshot taken at or just
+    before them.
     """
     df = svc.system_metrics()
     if df.empty:
@@ -36,53 +48,80 @@ def index(
     delta = format_timedelta(end - start)
     ts_min, ts_max = svc.dumps_time_bounds()
 
-    # --- RAM figure ---
-    ram_fig = go.Figure(ram_traces(df), layout=dict(title="RAM usage (htop)"))
-    ram_fig.update_xaxes(range=[ts_min, ts_max])
-    ram_fig.add_scatter(
-        x=[ts_min, ts_max],
-        y=[0, 0],
-        mode="lines",
-        name="",
-        showlegend=False,
-        line=dict(color="rgba(0,0,0,0)"),
-    )
+    figs = []
+    for title, series, traces in SYSTEM_PANELS:
+        panel = downsample(df, list(series.values()), points)
+        fig = go.Figure(traces(panel), layout=dict(title=title))
+        fig.update_xaxes(range=[ts_min, ts_max])
+        fig.add_scatter(
+            x=[ts_min, ts_max],
+            y=[0, 0],
+            mode="lines",
+            name="",
+            showlegend=False,
+            line=dict(color="rgba(0,0,0,0)"),
+        )
+        figs.append(fig)
+
+    with span("render.figure"):
+        dash_html = figure_html(build_dashboard(figs, n_cols=cols, height=height), "dash")
 
-    # --- Swap figure ---
-    swap_fig = go.Figure(swap_traces(df), layout=dict(title="Swap usage"))
-    swap_fig.update_xaxes(range=[ts_min, ts_max])
-    swap_fig.add_scatter(
-        x=[ts_min, ts_max],
-        y=[0, 0],
-        mode="lines",
-        name="",
-        showlegend=False,
-        line=dict(color="rgba(0,0,0,0)"),
-    )
+    events = svc.pressure_events(psi).tail(50).iloc[::-1]
+    events_html = ""
+    if not events.empty:
+        rows = "".join(
+            f"<tr><td>{e.TIMESTAMP}</td>"
+            f"<td>{getattr(e, 'PSI_some_avg10', float('nan')):.1f}</td>"
+            f"<td>{getattr(e, 'PSI_full_avg10', float('nan')):.1f}</td>"
+            f"<td>{e.oom_kills:.0f}</td>"
+            f"<td>{e.pgmajfault_rate:,.0f}</td>"
+            + (
+                f'<td><a href="/api/v1/topn?ts={e.stamp}">{e.stamp}</a> · '
+                f'<a href="/api/v1/snapshot/level?lvl=0&ts={e.stamp}">tree</a></td>'
+                if e.stamp else "<td>–</td>"
+            )
+            + "</tr>"
+            for e in events.itertuples(index=False)
+        )
+        events_html = f"""
+          <h2>Pressure events</h2>
+          <table class="proc-table">
+            <thead><tr>
+              <th>time</th><th>PSI some, %</th><th>PSI full, %</th>
+              <th>OOM kills</th><th>major faults/s</th><th>process snapshot</th>
+            </tr></thead>
+            <tbody>{rows}</tbody>
+          </table>
+        """
 
-    dash_html = build_dashboard(
-        [ram_fig, swap_fig],
-        n_cols=cols,
-        height=height,
-    ).to_html(full_html=False, include_plotlyjs="cdn")
+    live_html = ""
+    if live:
+        since = f"{df['TIMESTAMP'].max():%Y-%m-%d %H:%M:%S}"
+        live_html = f"""
+        <script src="/static/live.js"></script>
+        <script>liveStream("/api/v1/stream/system?since=" + encodeURIComponent("{since}"));</script>
+        """
 
     return f"""
     <html>
       <head>
         <title>Memory Inspector</title>
         <link rel="stylesheet" href="/static/mem.css">
+        {PLOTLY_SCRIPT}
       </head>
       <body style="font-family:sans-serif;">
         <div class="wrapper">
           <h1>Memory Inspector</h1>
           <p><b>Coverage:</b> {start} → {end} ({delta})</p>
           {dash_html}
+          {events_html}
           <p>
             <a class="pure-button" href="/api/v1/snapshot/level?lvl=0">
               Snapshot by level →
             </a>
           </p>
         </div>
+        {live_html}
       </body>
     </html>
     """
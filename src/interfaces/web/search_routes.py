@@ -0,0 +1,105 @@
+# src/interfaces/web/search_routes.py
+
+from __future__ import annotations
+
+import html
+import re
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import HTMLResponse
+import pandas as pd
+
+from application.services import MetricsService
+from config.settings import Settings
+from utils.time import format_timedelta
+
+search_router = APIRouter()
+
+
+def get_service() -> MetricsService:
+    return MetricsService(Settings())
+
+
+def _page(body: str, status_code: int = 200) -> HTMLResponse:
+    return HTMLResponse(
+        f"""
+    <html>
+      <head>
+        <title>Command search</title>
+        <link rel="stylesheet" href="/static/mem.css">
+      </head>
+      <body style="font-family:sans-serif;">
+        <div class="wrapper">
+          {body}
+          <p><a href="/api/v1/">← back to dashboard</a></p>
+        </div>
+      </body>
+    </html>
+    """,
+        status_code=status_code,
+    )
+
+
+@search_router.get("/search", response_class=HTMLResponse)
+def search(
+    service: MetricsService = Depends(get_service),
+    q: str = Query("", description="Substring (or regex) to find in command lines"),
+    regex: bool = Query(False, description="Treat `q` as a regular expression"),
+    case: bool = Query(False, description="Match case"),
+    days: float | None = Query(None, gt=0, description="Only processes seen in the last N days of the archive"),
+    since: str | None = Query(None, description="Only processes seen after this time"),
+    until: str | None = Query(None, description="Only processes seen before this time"),
+    limit: int = Query(500, ge=1, le=10000, description="Most processes listed"),
+) -> HTMLResponse:
+    """
+    Render processes whose command line matches `q`, each with its
+    first/last-seen time, lifetime and RSS, linked to its PID plot.
+    """
+    form = f"""
+      <h1>Command search</h1>
+      <form class="pure-form">
+        <input name="q" type="text" value="{html.escape(q)}" placeholder="java -Xmx8g" style="width:30em">
+        <label><input name="regex" type="checkbox" value="1" {"checked" if regex else ""}> regex</label>
+        <label><input name="case" type="checkbox" value="1" {"checked" if case else ""}> match case</label>
+        last <input name="days" type="number" step="any" value="{days or ''}" style="width:4em"> days
+        <button class="pure-button" type="submit">Search</button>
+      </form>
+    """
+    if not q:
+        return _page(form)
+
+    try:
+        lo = pd.Timestamp(since) if since else None
+        hi = pd.Timestamp(until) if until else None
+    except ValueError:
+        return _page(form + "<p>Cannot parse since/until.</p>", status_code=400)
+    if days is not None:
+        _, end = service.dumps_time_bounds()
+        start = end - pd.Timedelta(days=days)
+        lo = start if lo is None else max(lo, start)
+
+    try:
+        found = service.search_processes(q, regex, case, lo, hi)
+    except re.error as exc:
+        return _page(form + f"<p>Invalid regex: {html.escape(str(exc))}</p>", status_code=400)
+
+    if found.empty:
+        return _page(form + "<p>No matching processes.</p>")
+
+    shown = found.head(limit).copy()
+    shown["PID"] = [f'<a href="/api/v1/snapshot/pid/plot?pid={p}">{p}</a>' for p in shown["PID"]]
+    shown["CMD"] = [
+        f'<a href="/api/v1/search?q={quote(str(c))}&case=1">{html.escape(str(c))}</a>' for c in shown["CMD"]
+    ]
+    shown["lifetime"] = [format_timedelta(pd.Timedelta(seconds=s)) for s in shown["lifetime"]]
+    shown = shown[["PID", "PPID", "first_seen", "last_seen", "lifetime", "rss_min", "rss_mean", "rss_max", "CMD"]]
+    table_html = shown.to_html(index=False, escape=False, classes="proc-table", float_format=lambda x: f"{x:,.1f}")
+
+    n_cmds = found["CMD"].nunique()
+    more = f" (first {limit} shown)" if len(found) > limit else ""
+    return _page(
+        form
+        + f"<p>{len(found)} processes with {n_cmds} distinct command lines{more}.</p>"
+        + table_html
+    )
@@ -0,0 +1,108 @@
+# src/interfaces/web/snapshot_diff_routes.py
+
+from __future__ import annotations
+
+import html
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import HTMLResponse
+import pandas as pd
+
+from application.services import MetricsService
+from config.settings import Settings
+
+diff_router = APIRouter()
+
+
+def get_service() -> MetricsService:
+    return MetricsService(Settings())
+
+
+def _table(df: pd.DataFrame, limit: int) -> str:
+    """
+    Return the first `limit` rows as an HTML table with PID links and escaped CMD.
+    """
+    if df.empty:
+        return "<p>None.</p>"
+    out = df.head(limit).copy()
+    out["PID"] = [
+        f'<a href="/api/v1/snapshot/pid/plot?pid={p}">{p}</a>' for p in out["PID"]
+    ]
+    out["CMD"] = [html.escape(str(c)) for c in out["CMD"]]
+    return out.to_html(index=False, escape=False, classes="proc-table")
+
+
+@diff_router.get("/snapshot/diff", response_class=HTMLResponse)
+def snapshot_diff(
+    service: MetricsService = Depends(get_service),
+    ts_a: str | None = Query(None, description="Earlier timestamp YYYYMMDD_HHMMSS"),
+    ts_b: str | None = Query(None, description="Later timestamp YYYYMMDD_HHMMSS"),
+    min_delta: int = Query(0, ge=0, description="Hide RSS changes smaller than this, MB"),
+    limit: int = Query(100, ge=1, le=10000, description="Maximum rows per table"),
+) -> HTMLResponse:
+    """
+    Render started/exited processes and RSS deltas between two snapshots.
+    """
+    stamps = service.available_stamps()
+    if not stamps:
+        return HTMLResponse("<h1>No process dumps found</h1>", status_code=404)
+
+    ts_b = ts_b or stamps[-1]
+    ts_a = ts_a or stamps[max(0, stamps.index(ts_b) - 1) if ts_b in stamps else 0]
+    for ts in (ts_a, ts_b):
+        if ts not in stamps:
+            return HTMLResponse(f"<h1>Timestamp {html.escape(ts)} unknown</h1>", status_code=404)
+
+    d = service.snapshot_diff(ts_a, ts_b)
+    changed = d.changed[d.changed["delta"].abs() >= max(min_delta, 1)]
+    subtrees = d.subtrees[d.subtrees["sub_delta"].abs() >= max(min_delta, 1)]
+
+    def options(selected: str) -> str:
+        return "\n".join(
+            f'<option value="{s}" {"selected" if s == selected else ""}>{s}</option>'
+            for s in stamps
+        )
+
+    return HTMLResponse(
+        f"""
+    <html>
+      <head>
+        <title>Diff {ts_a} → {ts_b}</title>
+        <link rel="stylesheet" href="/static/mem.css">
+      </head>
+      <body style="font-family:sans-serif;">
+        <div class="wrapper">
+          <h1>Snapshot diff <small>{ts_a} → {ts_b}</small></h1>
+
+          <form class="pure-form">
+            From <select name="ts_a">{options(ts_a)}</select>
+            to <select name="ts_b">{options(ts_b)}</select>,
+            |Δ| ≥ <input name="min_delta" type="number" value="{min_delta}" style="width:5em"> MB,
+            top <input name="limit" type="number" value="{limit}" style="width:4em"> rows
+            <button class="pure-button" type="submit">Apply</button>
+          </form>
+
+          <p>
+            <b>Total RSS:</b> {d.rss_a:,} → {d.rss_b:,} MB ({d.rss_b - d.rss_a:+,} MB);
+            <b>started:</b> {len(d.started)}, <b>exited:</b> {len(d.exited)},
+            <b>changed:</b> {len(changed)}
+          </p>
+
+          <h2>Subtree RSS changes</h2>
+          {_table(subtrees, limit)}
+
+          <h2>Process RSS changes</h2>
+          {_table(changed, limit)}
+
+          <h2>Started</h2>
+          {_table(d.started, limit)}
+
+          <h2>Exited</h2>
+          {_table(d.exited, limit)}
+
+          <p><a href="/api/v1/snapshot/level?lvl=0&ts={ts_b}">← back to snapshot</a></p>
+        </div>
+      </body>
+    </html>
+    """
+    )
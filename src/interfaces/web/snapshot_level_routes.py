@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import html
+
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import HTMLResponse
 import pandas as pd
@@ -38,7 +40,7 @@ def snapshot_by_level(
 
     ts = ts or stamps[-1]
     if ts not in stamps:
-        return HTMLResponse(f"<h1>Timestamp {ts} unknown</h1>", status_code=404)
+        return HTMLResponse(f"<h1>Timestamp {html.escape(ts)} unknown</h1>", status_code=404)
 
     pf = ProcessFilter(
         min_lifetime_s=min_life,
@@ -109,6 +111,7 @@ def snapshot_by_level(
         <div class="wrapper">
           <h1>Level {lvl} – snapshot <small>{ts}</small></h1>
           <p>{lvl_links}</p>
+          <p><a href="/api/v1/snapshot/treemap?ts={ts}">Memory map of this snapshot →</a></p>
 
           <form class="pure-form">
             Snapshot 
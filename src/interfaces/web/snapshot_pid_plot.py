@@ -8,7 +8,11 @@ import plotly.graph_objects as go
 
 from application.services import MetricsService
 from config.settings import Settings
+from domain.analysis.timeseries import top_children
+from interfaces.web.assets import PLOTLY_SCRIPT
+from interfaces.web.plots.encoding import figure_html
 from utils.time import format_timedelta
+from utils.timing import span
 
 plot_router = APIRouter()
 
@@ -19,6 +23,10 @@ def svc() -> MetricsService:
 def pid_plot(
     service: MetricsService = Depends(svc),
     pid: int = Query(..., description="PID to plot"),
+    live: bool = Query(True, description="Append new samples as dumps arrive"),
+    k: int = Query(20, ge=1, le=500, description="Descendants charted on their own; the rest are summed into 'other'"),
+    rank: str = Query("peak", pattern="^(peak|area)$", description="Rank descendants by peak or time-integrated RSS"),
+    stacked: bool = Query(False, description="Stack descendant series as areas"),
 ):
     # 1) достаём timeseries и агрегаты для самого pid
     ts_df, child_df, stats = service.pid_plots(pid)
@@ -36,8 +44,12 @@ def pid_plot(
       <tr><td>lifetime</td>    <td>{duration}</td></tr>
       <tr><td>rss min/mean/max</td>
           <td>{stats['rss_min']} / {stats['rss_mean']:.1f} / {stats['rss_max']} MB</td></tr>
+      <tr><td>rss p50/p95/p99</td>
+          <td>{stats['rss_p50']} / {stats['rss_p95']} / {stats['rss_p99']} MB</td></tr>
       <tr><td>subtree min/mean/max</td>
           <td>{stats['sub_min']} / {stats['sub_mean']:.1f} / {stats['sub_max']} MB</td></tr>
+      <tr><td>subtree p50/p95/p99</td>
+          <td>{stats['rss_subtree_p50']} / {stats['rss_subtree_p95']} / {stats['rss_subtree_p99']} MB</td></tr>
     </table>
     """
     ts_min, ts_max = service.dumps_time_bounds()
@@ -60,61 +72,72 @@ def pid_plot(
     
     fig.update_layout(height=550, hovermode="x unified")
     fig.update_xaxes(range=[ts_min, ts_max])
-    html_main = fig.to_html(full_html=False, include_plotlyjs="cdn")
+    with span("render.figure"):
+        html_main = figure_html(fig, "pid-main")
 
-    # 4) график RSS каждого child
+    # 4) график RSS top-K потомков + "other"
+    series_df, top_pids = top_children(child_df, k, rank)
     fig2 = go.Figure()
-    for child_pid, grp in child_df.groupby("PID"):
-        fig2.add_scattergl(
-            x=grp["TIMESTAMP"], y=grp["rss"],
-            mode="lines", name=str(child_pid)
+    if stacked:
+        wide = series_df.pivot_table(
+            index="TIMESTAMP", columns="series", values="rss", aggfunc="sum", fill_value=0, sort=False
         )
+        for name in wide.columns:
+            fig2.add_scatter(
+                x=wide.index, y=wide[name],
+                mode="lines", name=name, stackgroup="children"
+            )
+    else:
+        for name, grp in series_df.groupby("series", sort=False):
+            fig2.add_scattergl(
+                x=grp["TIMESTAMP"], y=grp["rss"],
+                mode="lines", name=name
+            )
     fig2.add_scattergl(
         x=[ts_min, ts_max], y=[0, 0],
         mode="lines", name="", showlegend=False,
         line=dict(color="rgba(0,0,0,0)")
     )
     
-    fig2.update_layout(title="Children RSS", height=550, hovermode="x unified")
+    fig2.update_layout(title=f"Children RSS, top {len(top_pids)} by {rank}", height=550, hovermode="x unified")
     fig2.update_xaxes(range=[ts_min, ts_max])
     
-    html_children = fig2.to_html(full_html=False, include_plotlyjs=False)
+    with span("render.figure"):
+        html_children = figure_html(fig2, "pid-children")
 
 
-    # 5) summary-таблица по каждому непосредственному child
+    # 5) summary-таблица по каждому потомку из top-K, одним проходом по архиву
+    children = service.pid_summaries(top_pids)
     child_stats_rows = []
-    # уникальные дети
-    for child_pid in sorted(child_df["PID"].unique()):
-        # получаем агрегаты для child_pid аналогично root
-        _, _, cstats = service.pid_plots(child_pid)
-        # форматируем
-        since = cstats["since"]
-        until = cstats["until"]
-        life = format_timedelta(pd.Timedelta(seconds=cstats["lifetime_s"]))
-        rss_stat = f"{cstats['rss_min']} / {cstats['rss_mean']:.1f} / {cstats['rss_max']}"
-        sub_stat = f"{cstats['sub_min']} / {cstats['sub_mean']:.1f} / {cstats['sub_max']}"
+    for c in children.itertuples(index=False):
+        life = format_timedelta(pd.Timedelta(seconds=c.lifetime_s))
+        rss_stat = f"{c.rss_min} / {c.rss_mean:.1f} / {c.rss_max}"
+        sub_stat = f"{c.sub_min} / {c.sub_mean:.1f} / {c.sub_max}"
+        pct_stat = f"{c.rss_p50} / {c.rss_p95} / {c.rss_p99}"
         # ссылки на plot child и на plot parent
-        pid_link = f'<a href="/api/v1/snapshot/pid/plot?pid={child_pid}">{child_pid}</a>'
+        pid_link = f'<a href="/api/v1/snapshot/pid/plot?pid={c.PID}">{c.PID}</a>'
         ppid_link = f'<a href="/api/v1/snapshot/pid/plot?pid={pid}">{pid}</a>'
         child_stats_rows.append(
             f"<tr>"
             f"<td>{pid_link}</td>"
             f"<td>{ppid_link}</td>"
-            f"<td>{since}</td>"
-            f"<td>{until}</td>"
+            f"<td>{c.since}</td>"
+            f"<td>{c.until}</td>"
             f"<td>{life}</td>"
             f"<td>{rss_stat} MB</td>"
+            f"<td>{pct_stat} MB</td>"
             f"<td>{sub_stat} MB</td>"
             f"</tr>"
         )
 
     child_summary_html = f"""
     <h2>Children summary</h2>
+    <p>Top {len(top_pids)} of {child_df["PID"].nunique() if not child_df.empty else 0} processes in the subtree by {rank} RSS.</p>
     <table class="proc-table">
      <thead>
       <tr>
        <th>PID</th><th>PPID</th><th>since</th><th>until</th>
-       <th>lifetime</th><th>rss min/mean/max</th><th>subtree min/mean/max</th>
+       <th>lifetime</th><th>rss min/mean/max</th><th>rss p50/p95/p99</th><th>subtree min/mean/max</th>
       </tr>
      </thead>
      <tbody>
@@ -123,20 +146,13 @@ def pid_plot(
     </table>
     """
 
-    full = service.process_df()
-    child_cmds = {}
-    for child_pid in sorted(child_df["PID"].unique()):
-        # из первого попавшегося
-        cmd = full.loc[full["PID"] == child_pid, "CMD"]
-        child_cmds[child_pid] = cmd.iloc[0] if not cmd.empty else ""
-
-    # Теперь формируем компактную таблицу PID→CMD
+    # Компактная таблица PID→CMD
     rows = [
         f"<tr>"
-        f"<td><a href=\"/api/v1/snapshot/pid/plot?pid={pid}\">{pid}</a></td>"
-        f"<td>{html.escape(cmd)}</td>"
+        f"<td><a href=\"/api/v1/snapshot/pid/plot?pid={child_pid}\">{child_pid}</a></td>"
+        f"<td>{html.escape(str(cmd))}</td>"
         f"</tr>"
-        for pid, cmd in child_cmds.items()
+        for child_pid, cmd in zip(children["PID"], children["CMD"])
     ]
     mapping_html = f"""
     <h2>Child PID → CMD</h2>
@@ -148,12 +164,21 @@ def pid_plot(
     </table>
     """
 
+    live_html = ""
+    if live:
+        since = f"{ts_df['TIMESTAMP'].max():%Y-%m-%d %H:%M:%S}"
+        live_html = f"""
+        <script src="/static/live.js"></script>
+        <script>liveStream("/api/v1/stream/pid?pid={pid}&top={','.join(map(str, top_pids))}&since=" + encodeURIComponent("{since}"));</script>
+        """
+
     # 6) собираем всё вместе
     return HTMLResponse(f"""
     <html>
       <head>
         <title>PID {pid} RSS timeline</title>
         <link rel="stylesheet" href="/static/mem.css">
+        {PLOTLY_SCRIPT}
       </head>
       <body class="wrapper">
         <h1>PID {pid}</h1>
@@ -168,6 +193,7 @@ def pid_plot(
         {child_summary_html}
         {mapping_html}
         <p><a href="/api/v1/snapshot/pid?pid={pid}">← back to subtree</a></p>
+        {live_html}
       </body>
     </html>
     """)
@@ -9,7 +9,10 @@ from fastapi.responses import HTMLResponse
 
 from application.services import MetricsService
 from config.settings import Settings
+from interfaces.web.assets import PLOTLY_SCRIPT
+from interfaces.web.plots.encoding import figure_html
 from utils.time import format_timedelta
+from utils.timing import span
 
 
 plot_router = APIRouter()
@@ -56,7 +59,8 @@ def pid_plot(
     fig.add_scattergl(x=[ts_min, ts_max], y=[0, 0], mode="lines", name="", showlegend=False, line=dict(color="rgba(0,0,0,0)"))
     fig.update_layout(height=550, hovermode="x unified")
     fig.update_xaxes(range=[ts_min, ts_max])
-    html_main = fig.to_html(full_html=False, include_plotlyjs="cdn")
+    with span("render.figure"):
+        html_main = figure_html(fig)
 
     # ── Children RSS plot ───────────────────────────────────────────────────
     fig2 = go.Figure()
@@ -65,7 +69,8 @@ def pid_plot(
     fig2.add_scattergl(x=[ts_min, ts_max], y=[0, 0], mode="lines", name="", showlegend=False, line=dict(color="rgba(0,0,0,0)"))
     fig2.update_layout(title="Children RSS", height=550, hovermode="x unified")
     fig2.update_xaxes(range=[ts_min, ts_max])
-    html_children = fig2.to_html(full_html=False, include_plotlyjs=False)
+    with span("render.figure"):
+        html_children = figure_html(fig2)
 
     # ── Children summary table ──────────────────────────────────────────────
     child_stats_rows = []
@@ -121,6 +126,7 @@ def pid_plot(
       <head>
         <title>PID {pid} RSS timeline</title>
         <link rel="stylesheet" href="/static/mem.css">
+        {PLOTLY_SCRIPT}
       </head>
       <body class="wrapper">
         <h1>PID {pid}</h1>
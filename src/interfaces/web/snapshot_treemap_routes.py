@@ -0,0 +1,115 @@
+# src/interfaces/web/snapshot_treemap_routes.py
+
+from __future__ import annotations
+
+import html
+
+import pandas as pd
+import plotly.graph_objects as go
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import HTMLResponse
+
+from application.services import MetricsService
+from config.settings import Settings
+from interfaces.web.assets import PLOTLY_SCRIPT
+from interfaces.web.plots.encoding import figure_html
+from utils.timing import span
+
+treemap_router = APIRouter()
+
+_CMD_CHARS = 300
+"""Command line shown on hover, truncated."""
+
+
+def get_service() -> MetricsService:
+    return MetricsService(Settings())
+
+
+def _labels(nodes: pd.DataFrame) -> list[str]:
+    return [
+        f"{html.escape(name)} {pid}" if pid >= 0 else (f"{name} ({n})" if n else name)
+        for name, pid, n in zip(nodes["name"], nodes["pid"], nodes["folded"])
+    ]
+
+
+@treemap_router.get("/snapshot/treemap", response_class=HTMLResponse)
+def snapshot_treemap(
+    service: MetricsService = Depends(get_service),
+    ts: str | None = Query(None, description="Timestamp YYYYMMDD_HHMMSS"),
+    min_frac: float = Query(0.002, ge=0, le=1, description="Subtrees below this share of total RSS go to 'other'"),
+    kind: str = Query("treemap", pattern="^(treemap|icicle)$", description="Chart type"),
+) -> HTMLResponse:
+    """
+    Render the snapshot's process tree as a treemap or icicle sized by
+    subtree RSS, small subtrees folded into one "other" box per parent.
+    """
+    stamps = service.available_stamps()
+    if not stamps:
+        return HTMLResponse("<h1>No process dumps found</h1>", status_code=404)
+    ts = ts or stamps[-1]
+    if ts not in stamps:
+        return HTMLResponse(f"<h1>Timestamp {html.escape(ts)} unknown</h1>", status_code=404)
+
+    nodes = service.snapshot_treemap(ts, min_frac)
+    processes = int((nodes["pid"] >= 0).sum())
+    folded = int(nodes["folded"].sum())
+
+    cmd = [html.escape(c[:_CMD_CHARS]) for c in nodes["cmd"]]
+    custom = nodes[["pid", "own_mb", "folded"]].assign(cmd=cmd).to_numpy(dtype=object)
+    trace = go.Icicle if kind == "icicle" else go.Treemap
+    fig = go.Figure(trace(
+        ids=nodes["id"],
+        parents=nodes["parent"],
+        values=nodes["value"],
+        labels=_labels(nodes),
+        customdata=custom,
+        branchvalues="total",
+        texttemplate="%{label}<br>%{value:,.0f} MB",
+        hovertemplate=(
+            "%{label}<br>subtree %{value:,.0f} MB (%{percentRoot:.1%})"
+            "<br>own %{customdata[1]:,.0f} MB<br>%{customdata[3]}<extra></extra>"
+        ),
+        maxdepth=-1,
+    ))
+    fig.update_layout(height=800, margin=dict(t=10, l=10, r=10, b=10))
+    with span("render.figure"):
+        chart_html = figure_html(fig)
+
+    ts_options = "\n".join(
+        f'<option value="{s}" {"selected" if s == ts else ""}>{s}</option>'
+        for s in stamps
+    )
+    kind_options = "\n".join(
+        f'<option value="{k}" {"selected" if k == kind else ""}>{k}</option>'
+        for k in ("treemap", "icicle")
+    )
+    when = pd.to_datetime(ts, format="%Y%m%d_%H%M%S")
+
+    return HTMLResponse(
+        f"""
+    <html>
+      <head>
+        <title>Memory map at {ts}</title>
+        <link rel="stylesheet" href="/static/mem.css">
+        {PLOTLY_SCRIPT}
+      </head>
+      <body style="font-family:sans-serif;">
+        <div class="wrapper">
+          <h1>Memory map <small>{when}</small></h1>
+
+          <form class="pure-form">
+            Snapshot <select name="ts">{ts_options}</select>
+            fold subtrees below <input name="min_frac" type="number" step="any" value="{min_frac}" style="width:6em"> of total
+            <select name="kind">{kind_options}</select>
+            <button class="pure-button" type="submit">Apply</button>
+          </form>
+          <p>{processes} processes drawn, {folded} small subtrees folded into "other". Click a box to zoom in.</p>
+
+          {chart_html}
+
+          <p><a href="/api/v1/snapshot/level?lvl=0&ts={ts}">← back to snapshot</a></p>
+        </div>
+      </body>
+    </html>
+    """
+    )
@@ -0,0 +1,45 @@
+// src/interfaces/web/static/live.js
+//
+// Append samples pushed by /api/v1/stream/* to Plotly figures in place.
+// Messages map a figure's div id to {trace name: {x: [...], y: [...]}};
+// known traces are extended, unknown ones (e.g. a new child PID) added.
+
+function liveExtend(gd, traces) {
+  const names = gd.data.map((t) => t.name);
+  const indices = [], xs = [], ys = [], added = [];
+  let last = null;
+
+  for (const [name, pts] of Object.entries(traces)) {
+    const i = names.indexOf(name);
+    if (i >= 0) {
+      indices.push(i);
+      xs.push(pts.x);
+      ys.push(pts.y);
+    } else {
+      added.push({ type: "scattergl", mode: "lines", name: name, x: pts.x, y: pts.y });
+    }
+    const t = pts.x[pts.x.length - 1];
+    if (last === null || t > last) last = t;
+  }
+
+  if (indices.length) Plotly.extendTraces(gd, { x: xs, y: ys }, indices);
+  if (added.length) Plotly.addTraces(gd, added);
+
+  // Axes were pinned to the dump range when rendered; stretch them to the new data.
+  const relayout = {};
+  for (const key of Object.keys(gd.layout)) {
+    if (key.startsWith("xaxis") && gd.layout[key].range) relayout[`${key}.range[1]`] = last;
+  }
+  if (last !== null && Object.keys(relayout).length) Plotly.relayout(gd, relayout);
+}
+
+function liveStream(url) {
+  const source = new EventSource(url);
+  source.onmessage = (event) => {
+    for (const [divId, traces] of Object.entries(JSON.parse(event.data))) {
+      const gd = document.getElementById(divId);
+      if (gd && gd.data) liveExtend(gd, traces);
+    }
+  };
+  return source;
+}
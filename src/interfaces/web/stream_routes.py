@@ -0,0 +1,143 @@
+# src/interfaces/web/stream_routes.py
+
+"""
+Server-Sent Events with samples from dumps written after a page loaded.
+
+Each message is a JSON object {div id: {trace name: {"x": [...], "y": [...]}}},
+x in epoch milliseconds like the rendered figures (see `plots.encoding`),
+that `/static/live.js` appends to the matching Plotly figures with
+`Plotly.extendTraces`. The event id is the newest sample's timestamp, so
+a reconnecting EventSource resumes via Last-Event-ID.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import AsyncIterator, Callable, Dict, Tuple
+
+import pandas as pd
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from application.services import MetricsService
+from config.settings import Settings
+from domain.analysis.timeseries import OTHER
+from interfaces.web.plots.dashboard import SYSTEM_PANELS
+from interfaces.web.plots.encoding import epoch_ms
+
+stream_router = APIRouter()
+
+PING_EVERY_S = 15.0
+"""Idle connections get an SSE comment this often to keep proxies from closing them."""
+
+Payload = Dict[str, Dict[str, Dict[str, list]]]
+Fetch = Callable[[pd.Timestamp], Tuple[Payload, pd.Timestamp]]
+
+
+def get_service() -> MetricsService:
+    return MetricsService(Settings())
+
+
+def _stamps(ts: pd.Series) -> list:
+    return epoch_ms(ts).tolist()
+
+
+def _start(request: Request, since: str | None) -> pd.Timestamp:
+    last_id = request.headers.get("last-event-id")
+    if last_id:
+        return pd.Timestamp(last_id)
+    return pd.Timestamp(since) if since else pd.Timestamp.now()
+
+
+async def _events(request: Request, since: pd.Timestamp, fetch: Fetch) -> AsyncIterator[str]:
+    poll_s = Settings().stream_poll_s
+    idle_s = 0.0
+    while not await request.is_disconnected():
+        payload, since = await run_in_threadpool(fetch, since)
+        if payload:
+            idle_s = 0.0
+            yield f"id: {since:%Y-%m-%d %H:%M:%S}\ndata: {json.dumps(payload)}\n\n"
+        elif idle_s >= PING_EVERY_S:
+            idle_s = 0.0
+            yield ": ping\n\n"
+        await asyncio.sleep(poll_s)
+        idle_s += poll_s
+
+
+def _sse(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@stream_router.get("/stream/system")
+async def stream_system(
+    request: Request,
+    service: MetricsService = Depends(get_service),
+    since: str | None = Query(None, description="Send samples taken after this time"),
+) -> StreamingResponse:
+    """
+    Stream new system samples for every dashboard panel (div `dash`).
+    """
+    def fetch(at: pd.Timestamp) -> Tuple[Payload, pd.Timestamp]:
+        df = service.system_since(at)
+        if df.empty:
+            return {}, at
+        x = _stamps(df["TIMESTAMP"])
+        series = {name: col for _, panel, _ in SYSTEM_PANELS for name, col in panel.items()}
+        traces = {
+            name: {"x": x, "y": df[col].astype(object).where(df[col].notna(), None).tolist()}
+            for name, col in series.items() if col in df.columns
+        }
+        return {"dash": traces}, df["TIMESTAMP"].max()
+
+    return _sse(_events(request, _start(request, since), fetch))
+
+
+@stream_router.get("/stream/pid")
+async def stream_pid(
+    request: Request,
+    service: MetricsService = Depends(get_service),
+    pid: int = Query(..., description="PID whose subtree is streamed"),
+    since: str | None = Query(None, description="Send samples taken after this time"),
+    top: str | None = Query(None, description="Comma-separated PIDs charted on their own; the rest go to 'other'"),
+) -> StreamingResponse:
+    """
+    Stream own/subtree RSS (div `pid-main`) and per-PID RSS of the subtree
+    (div `pid-children`) for new process snapshots.
+
+    With `top`, only those PIDs get their own series and all other
+    descendants are summed into the `other` series, as on the PID page.
+    """
+    kept = {p for p in (top or "").split(",") if p}
+
+    def fetch(at: pd.Timestamp) -> Tuple[Payload, pd.Timestamp]:
+        samples = service.pid_since(pid, at)
+        if not samples:
+            return {}, at
+        x = _stamps(pd.Series([s["TIMESTAMP"] for s in samples]))
+        main = {
+            "RSS own": {"x": x, "y": [s["rss_own"] for s in samples]},
+            "RSS subtree": {"x": x, "y": [s["rss_subtree"] for s in samples]},
+        }
+        children: Dict[str, Dict[str, list]] = {}
+        for t, s in zip(x, samples):
+            rest = 0
+            for child, rss in s["children"].items():
+                if kept and child not in kept:
+                    rest += rss
+                    continue
+                trace = children.setdefault(child, {"x": [], "y": []})
+                trace["x"].append(t)
+                trace["y"].append(rss)
+            if kept:
+                trace = children.setdefault(OTHER, {"x": [], "y": []})
+                trace["x"].append(t)
+                trace["y"].append(rest)
+        return {"pid-main": main, "pid-children": children}, samples[-1]["TIMESTAMP"]
+
+    return _sse(_events(request, _start(request, since), fetch))
@@ -0,0 +1,150 @@
+# src/interfaces/web/timing.py
+
+"""
+Timing middleware: Server-Timing headers, recent-request log, ?profile=1.
+"""
+
+from __future__ import annotations
+
+import html
+import io
+import pstats
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, List
+
+import numpy as np
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse
+
+from utils.timing import RequestTimings, begin_request
+
+
+HIST_EDGES_MS: List[float] = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+"""Upper bounds of latency histogram buckets; a final bucket holds the rest."""
+
+UNMATCHED = "unmatched"
+"""Route key of requests no route matched (404 probes, redirects to /)."""
+
+
+class TimingLog:
+    """
+    Bounded log of recent requests with per-route latency histograms.
+
+    Histograms are keyed by route template (e.g. ``/api/v1/query``), never
+    by raw URL, so their number is bounded by the app's routes.
+    """
+
+    def __init__(self, size: int = 500) -> None:
+        self._recent: Deque[dict] = deque(maxlen=size)
+        self._hist: Dict[str, np.ndarray] = defaultdict(lambda: np.zeros(len(HIST_EDGES_MS) + 1, dtype=np.int64))
+        self._lock = threading.Lock()
+
+    def add(self, route: str, path: str, status: int, total_ms: float, spans: Dict[str, float]) -> None:
+        bucket = int(np.searchsorted(HIST_EDGES_MS, total_ms))
+        with self._lock:
+            self._recent.append({
+                "route": route,
+                "path": path,
+                "status": status,
+                "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "total_ms": round(total_ms, 2),
+                "spans_ms": {k: round(v, 2) for k, v in spans.items()},
+            })
+            self._hist[route][bucket] += 1
+
+    def report(self) -> dict:
+        """
+        Return recent requests and, per route, percentiles and a histogram.
+        """
+        with self._lock:
+            recent = list(self._recent)
+            hist = {route: counts.copy() for route, counts in self._hist.items()}
+
+        by_route: Dict[str, List[float]] = defaultdict(list)
+        for r in recent:
+            by_route[r["route"]].append(r["total_ms"])
+
+        labels = [f"≤{e:g}ms" for e in HIST_EDGES_MS] + [f">{HIST_EDGES_MS[-1]:g}ms"]
+        routes = {}
+        for route, counts in hist.items():
+            lat = np.array(by_route.get(route, []))
+            routes[route] = {
+                "count": int(counts.sum()),
+                "recent_p50_ms": round(float(np.percentile(lat, 50)), 2) if len(lat) else None,
+                "recent_p95_ms": round(float(np.percentile(lat, 95)), 2) if len(lat) else None,
+                "histogram": {label: int(c) for label, c in zip(labels, counts) if c},
+            }
+        return {"routes": routes, "recent": recent[::-1]}
+
+
+timing_log = TimingLog()
+
+
+def _route_of(request: Request) -> str:
+    """
+    Return the path template of the route that served `request`, or UNMATCHED.
+
+    FastAPI versions that resolve included routers lazily keep the router
+    prefix out of `route.path` and record the full template in the
+    effective route context; older ones copy routes with the prefix.
+    """
+    ctx = request.scope.get("fastapi", {}).get("effective_route_context")
+    return getattr(ctx, "path", None) or getattr(request.scope.get("route"), "path", None) or UNMATCHED
+
+
+def _aggregate(timings: RequestTimings) -> Dict[str, float]:
+    """
+    Return total milliseconds per span name.
+    """
+    out: Dict[str, float] = defaultdict(float)
+    with timings._lock:
+        for name, ms in timings.spans:
+            out[name] += ms
+    return dict(out)
+
+
+def _server_timing(spans: Dict[str, float], total_ms: float) -> str:
+    parts = [f'{name.replace(".", "-")};dur={ms:.1f}' for name, ms in spans.items()]
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+
+def _profile_page(timings: RequestTimings, path: str, total_ms: float) -> HTMLResponse:
+    buf = io.StringIO()
+    stats = pstats.Stats(timings.profiler, stream=buf)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(60)
+    return HTMLResponse(
+        f"""
+    <html>
+      <head><title>Profile {html.escape(path)}</title></head>
+      <body>
+        <h1>Profile of {html.escape(path)} <small>({total_ms:.1f} ms)</small></h1>
+        <pre>{html.escape(buf.getvalue())}</pre>
+      </body>
+    </html>
+    """
+    )
+
+
+def install_timing(app: FastAPI) -> None:
+    """
+    Add middleware that times every request, sets a Server-Timing header,
+    logs it in `timing_log` and answers `?profile=1` with a cProfile report.
+    """
+    @app.middleware("http")
+    async def timing_middleware(request: Request, call_next):
+        profile = request.query_params.get("profile") == "1"
+        timings = begin_request(profile=profile)
+        t0 = time.perf_counter()
+        response = await call_next(request)
+        total_ms = (time.perf_counter() - t0) * 1000
+
+        spans = _aggregate(timings)
+        if not request.url.path.startswith("/static"):
+            timing_log.add(_route_of(request), request.url.path, response.status_code, total_ms, spans)
+        if profile and timings.spans:
+            response = _profile_page(timings, request.url.path, total_ms)
+        response.headers["Server-Timing"] = _server_timing(spans, total_ms)
+        return response
@@ -0,0 +1,124 @@
+# src/interfaces/web/topn_routes.py
+
+from __future__ import annotations
+
+import html
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import HTMLResponse
+import pandas as pd
+
+from application.services import MetricsService
+from config.settings import Settings
+
+topn_router = APIRouter()
+
+
+def get_service() -> MetricsService:
+    return MetricsService(Settings())
+
+
+def _resolve_at(at: str, stamps: list[str]) -> pd.Timestamp:
+    """
+    Return `at` as a timestamp; a bare time ("03:00") is taken on the
+    day of the latest snapshot.
+    """
+    when = pd.Timestamp(at)
+    if len(at.strip()) <= 8 and ":" in at:
+        day = pd.to_datetime(stamps[-1], format="%Y%m%d_%H%M%S").normalize()
+        when = day + (when - when.normalize())
+    return when
+
+
+def _movement(prev: float, rank: int) -> str:
+    if pd.isna(prev):
+        return "new"
+    step = int(prev) - rank
+    return "=" if step == 0 else f"{step:+d}"
+
+
+def _table(df: pd.DataFrame) -> str:
+    """
+    Return a ranking as an HTML table with rank movement and PID links.
+    """
+    if df.empty:
+        return "<p>No processes.</p>"
+    out = df.copy()
+    out.insert(1, "move", [_movement(p, r) for p, r in zip(out["prev_rank"], out["rank"])])
+    out = out.drop(columns=["prev_rank"])
+    out["PID"] = [
+        f'<a href="/api/v1/snapshot/pid/plot?pid={p}">{p}</a>' for p in out["PID"]
+    ]
+    out["CMD"] = [html.escape(str(c)) for c in out["CMD"]]
+    return out.to_html(index=False, escape=False, classes="proc-table")
+
+
+@topn_router.get("/topn", response_class=HTMLResponse)
+def top_consumers(
+    service: MetricsService = Depends(get_service),
+    ts: str | None = Query(None, description="Timestamp YYYYMMDD_HHMMSS"),
+    at: str | None = Query(None, description="Any time, e.g. '2025-05-01 03:00' or '03:00'"),
+    span: int = Query(12, ge=1, le=500, description="Snapshots in the ranking timeline"),
+) -> HTMLResponse:
+    """
+    Render top-N processes and subtrees by RSS for one snapshot, their rank
+    movement, and the top-process ranking over the preceding snapshots.
+    """
+    stamps = service.available_stamps()
+    if not stamps:
+        return HTMLResponse("<h1>No process dumps found</h1>", status_code=404)
+
+    if at:
+        try:
+            ts = service.stamp_at(_resolve_at(at, stamps))
+        except (KeyError, ValueError):
+            return HTMLResponse(f"<h1>No snapshot at or before {html.escape(at)}</h1>", status_code=404)
+    ts = ts or stamps[-1]
+    if ts not in stamps:
+        return HTMLResponse(f"<h1>Timestamp {html.escape(ts)} unknown</h1>", status_code=404)
+
+    procs, subtrees = service.top_consumers(ts)
+    timeline = service.top_timeline(ts, span).map(
+        lambda p: "" if pd.isna(p) else f'<a href="/api/v1/snapshot/pid/plot?pid={p}">{p}</a>'
+    )
+    timeline.columns = [f"{c[4:6]}-{c[6:8]} {c[9:11]}:{c[11:13]}" for c in timeline.columns]
+    timeline_html = timeline.to_html(escape=False, classes="proc-table")
+
+    ts_options = "\n".join(
+        f'<option value="{s}" {"selected" if s == ts else ""}>{s}</option>'
+        for s in stamps
+    )
+
+    return HTMLResponse(
+        f"""
+    <html>
+      <head>
+        <title>Top consumers at {ts}</title>
+        <link rel="stylesheet" href="/static/mem.css">
+      </head>
+      <body style="font-family:sans-serif;">
+        <div class="wrapper">
+          <h1>Top consumers <small>{ts}</small></h1>
+
+          <form class="pure-form">
+            Snapshot <select name="ts">{ts_options}</select>
+            or at <input name="at" type="text" placeholder="03:00" style="width:10em">,
+            timeline of <input name="span" type="number" value="{span}" style="width:4em"> snapshots
+            <button class="pure-button" type="submit">Apply</button>
+          </form>
+
+          <h2>Processes</h2>
+          {_table(procs)}
+
+          <h2>Subtrees</h2>
+          {_table(subtrees)}
+
+          <h2>Top processes over time</h2>
+          {timeline_html}
+
+          <p><a href="/api/v1/snapshot/level?lvl=0&ts={ts}">← back to snapshot</a></p>
+        </div>
+      </body>
+    </html>
+    """
+    )
@@ -0,0 +1,54 @@
+# src/loader.py
+
+"""
+Publish the process store for app workers that attach read-only.
+
+Ingests new dumps into the memory-mapped store and brings the derived
+indexes (top-N, per-process stats, subtree rollups, CMD search) up to date, once or every
+`--interval` seconds. Run it next to a multi-worker server started with
+STORE_READONLY=1, so no worker spends time or memory on ingest:
+
+    python src/loader.py --interval 5 &
+    STORE_READONLY=1 uvicorn src.app:create_app --factory --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from adapters.cmd_index import open_cmd_index
+from adapters.process_stats import open_process_stats
+from adapters.snapshot_store import open_store
+from adapters.subtree_index import open_subtrees
+from adapters.topn_index import open_topn
+from config.settings import Settings
+
+
+def publish(settings: Settings) -> None:
+    """
+    Ingest new dumps and catch up every derived index.
+    """
+    store = open_store(settings.store_dir or settings.dumps_dir / ".store", settings.dumps_dir / settings.proc_glob)
+    open_topn(store, settings.topn_size)
+    open_process_stats(store)
+    open_subtrees(store)
+    open_cmd_index(store)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest dumps into the shared process store.")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between ingests.")
+    parser.add_argument("--once", action="store_true", help="Ingest once and exit.")
+    args = parser.parse_args()
+
+    settings = Settings()
+    while True:
+        publish(settings)
+        if args.once:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# src/query.py
+
+"""
+Run SQL against the dump archive from the command line.
+
+Uses the same embedded DuckDB views as `/api/v1/query` (processes,
+subtrees, system, cgroups); needs ``pip install 'pid-memory-inspector[sql]'``:
+
+    python src/query.py "SELECT CMD, max(RSS_MB) FROM processes GROUP BY 1 ORDER BY 2 DESC LIMIT 10"
+    echo "SELECT count(*) FROM system" | python src/query.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+import pandas as pd
+
+from adapters.sql_engine import SqlError, SqlUnavailable
+from application.services import MetricsService
+from config.settings import Settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the dump archive with SQL.")
+    parser.add_argument("sql", nargs="?", help="SELECT statement; read from stdin when omitted.")
+    parser.add_argument("--limit", type=int, default=None, help="Most rows printed.")
+    parser.add_argument("--csv", action="store_true", help="Print CSV instead of a table.")
+    args = parser.parse_args()
+
+    sql = args.sql if args.sql is not None else sys.stdin.read()
+    try:
+        result = MetricsService(Settings()).query(sql, args.limit)
+    except (SqlUnavailable, SqlError) as exc:
+        sys.exit(f"error: {exc}")
+
+    df = result.to_frame()
+    if args.csv:
+        df.to_csv(sys.stdout, index=False)
+    else:
+        with pd.option_context("display.max_rows", None, "display.max_columns", None, "display.width", None):
+            print(df.to_string(index=False))
+    if result.truncated:
+        print(f"(first {len(df)} rows)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
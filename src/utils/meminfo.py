@@ -0,0 +1,233 @@
+# src/utils/meminfo.py
+
+"""
+Sampling of /proc/meminfo and per-process memory, in collector dump format.
+
+Shared by scripts/collect_memory.py and the collector embedded in the app
+(adapters/embedded_collector.py), so both write identical dumps.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+import os
+import pwd
+import resource
+
+import pandas as pd
+
+
+PAGE_SIZE: int = os.sysconf("SC_PAGE_SIZE")
+
+
+def get_meminfo() -> Dict[str, int]:
+    """
+    Return selected memory metrics from /proc/meminfo.
+
+    Values are in MB unless key starts with 'HugePages',
+    which are raw counts.
+    """
+    wanted_keys: List[str] = [
+        "MemTotal", "MemFree", "MemAvailable", "Buffers", "Cached",
+        "SwapTotal", "SwapFree", "SwapCached",
+        "Active(anon)", "Inactive(anon)", "AnonPages",
+        "SReclaimable", "SUnreclaim", "PageTables",
+        "Committed_AS", "CommitLimit",
+        "AnonHugePages", "HugePages_Total", "HugePages_Free",
+    ]
+    meminfo: Dict[str, int] = {}
+    with open("/proc/meminfo", encoding="utf-8") as f:
+        for line in f:
+            key, *rest = line.split(":")
+            if key not in wanted_keys:
+                continue
+            try:
+                value_kb = int(rest[0].strip().split()[0])
+            except (IndexError, ValueError):
+                continue
+            if key.startswith("HugePages"):
+                meminfo[key] = value_kb
+            else:
+                meminfo[f"{key}_MB"] = value_kb // 1024
+    return meminfo
+
+
+VMSTAT_KEYS: Tuple[str, ...] = ("pgmajfault", "oom_kill", "pswpin", "pswpout", "pgscan_direct")
+"""Cumulative /proc/vmstat counters recorded with every system row."""
+
+
+def get_pressure() -> Dict[str, float]:
+    """
+    Return memory pressure (PSI) from /proc/pressure/memory.
+
+    Keys are PSI_<some|full>_<avg10|avg60|avg300> in percent and
+    PSI_<some|full>_total_us; empty when the kernel has no PSI.
+    """
+    pressure: Dict[str, float] = {}
+    try:
+        with open("/proc/pressure/memory", encoding="utf-8") as f:
+            for line in f:
+                kind, *fields = line.split()
+                for field in fields:
+                    name, _, value = field.partition("=")
+                    key = f"PSI_{kind}_total_us" if name == "total" else f"PSI_{kind}_{name}"
+                    pressure[key] = float(value)
+    except OSError:
+        return {}
+    return pressure
+
+
+def get_vmstat() -> Dict[str, int]:
+    """
+    Return the VMSTAT_KEYS counters from /proc/vmstat.
+    """
+    counters: Dict[str, int] = {}
+    with open("/proc/vmstat", encoding="utf-8") as f:
+        for line in f:
+            key, _, value = line.partition(" ")
+            if key in VMSTAT_KEYS:
+                counters[key] = int(value)
+    return counters
+
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def read_cgroup(pid: int) -> str:
+    """
+    Return the memory cgroup path of `pid` ("/" when unknown).
+
+    The cgroup v1 memory controller line wins over the v2 ("0::") line,
+    because on hybrid hosts memory is accounted in the v1 hierarchy.
+    """
+    unified = "/"
+    with open(f"/proc/{pid}/cgroup", encoding="utf-8") as f:
+        for line in f:
+            _, controllers, path = line.rstrip("\n").split(":", 2)
+            if "memory" in controllers.split(","):
+                return path or "/"
+            if controllers == "":
+                unified = path or "/"
+    return unified
+
+
+def cgroup_ancestors(path: str) -> List[str]:
+    """
+    Return `path` and every cgroup above it, root ("/") first.
+    """
+    parts = [p for p in path.split("/") if p]
+    return ["/"] + ["/" + "/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def get_cgroup_memory(paths: Iterable[str]) -> pd.DataFrame:
+    """
+    Return CGROUP, MEMORY_CURRENT_MB for `paths` and all their ancestors.
+
+    Reads cgroup v2 `memory.current`, falling back to the v1
+    `memory.usage_in_bytes`; cgroups readable in neither are left out.
+    """
+    nodes = sorted({node for path in paths for node in cgroup_ancestors(path)})
+    rows: List[Dict[str, str | int]] = []
+    for node in nodes:
+        rel = node.strip("/")
+        candidates = (
+            os.path.join(CGROUP_ROOT, rel, "memory.current"),
+            os.path.join(CGROUP_ROOT, "memory", rel, "memory.usage_in_bytes"),
+        )
+        for file in candidates:
+            try:
+                with open(file, encoding="utf-8") as f:
+                    rows.append({"CGROUP": node, "MEMORY_CURRENT_MB": int(f.read()) // 2**20})
+                break
+            except (OSError, ValueError):
+                continue
+    return pd.DataFrame(rows, columns=["CGROUP", "MEMORY_CURRENT_MB"])
+
+
+class ProcessScanner:
+    """
+    Read process memory stats straight from /proc.
+
+    User, command line and cgroup are cached per (pid, starttime), so with
+    `reread_cmdline=False` a known process costs a single read of
+    /proc/<pid>/stat; new processes (or a reused PID, which gets a new
+    starttime) are always read in full.
+    """
+
+    def __init__(self) -> None:
+        self._known: Dict[Tuple[int, int], Tuple[str, str, str]] = {}
+        self._users: Dict[int, str] = {}
+        self.cmdline_reads = 0
+
+    def _user(self, uid: int) -> str:
+        name = self._users.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self._users[uid] = name
+        return name
+
+    @staticmethod
+    def _cmdline(pid: int, comm: str) -> str:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            raw = f.read()
+        cmd = raw.replace(b"\0", b" ").decode("utf-8", "replace").strip()
+        return cmd or f"[{comm}]"
+
+    def scan(self, reread_cmdline: bool = True) -> pd.DataFrame:
+        """
+        Return PID, PPID, USER, RSS_MB, VSZ_MB, CMD, CGROUP of all processes, by RSS descending.
+        """
+        self.cmdline_reads = 0
+        known: Dict[Tuple[int, int], Tuple[str, str, str]] = {}
+        rows: List[Dict[str, str | int]] = []
+        for entry in os.scandir("/proc"):
+            if not entry.name.isdigit():
+                continue
+            pid = int(entry.name)
+            try:
+                with open(f"/proc/{pid}/stat", "rb") as f:
+                    stat = f.read().decode("utf-8", "replace")
+                lpar, rpar = stat.index("("), stat.rindex(")")
+                comm = stat[lpar + 1:rpar]
+                fields = stat[rpar + 2:].split()
+                key = (pid, int(fields[19]))
+                cached = self._known.get(key)
+                if cached is None or reread_cmdline:
+                    user = cached[0] if cached else self._user(entry.stat().st_uid)
+                    try:
+                        cached = (user, self._cmdline(pid, comm), read_cgroup(pid))
+                    except PermissionError:
+                        # Another user's process under hidepid=1 or a foreign
+                        # namespace: stat is readable, cmdline/cgroup are not.
+                        cached = (user, f"[{comm}]", "/")
+                    self.cmdline_reads += 1
+            except (OSError, ValueError, IndexError):
+                # Exited mid-scan, or hidden from us entirely (hidepid).
+                continue
+            known[key] = cached
+            rows.append({
+                "PID": pid,
+                "PPID": int(fields[1]),
+                "USER": cached[0],
+                "RSS_MB": int(fields[21]) * PAGE_SIZE // 2**20,
+                "VSZ_MB": int(fields[20]) // 2**20,
+                "CMD": cached[1],
+                "CGROUP": cached[2],
+            })
+        self._known = known
+        df = pd.DataFrame(rows, columns=["PID", "PPID", "USER", "RSS_MB", "VSZ_MB", "CMD", "CGROUP"])
+        return df.sort_values("RSS_MB", ascending=False, kind="stable")
+
+
+def get_own_usage() -> Dict[str, float]:
+    """
+    Return this process's CPU seconds (user + system) and RSS in MB.
+    """
+    ru = resource.getrusage(resource.RUSAGE_SELF)
+    with open("/proc/self/statm", encoding="utf-8") as f:
+        rss_pages = int(f.read().split()[1])
+    return {
+        "cpu_s": ru.ru_utime + ru.ru_stime,
+        "rss_mb": rss_pages * PAGE_SIZE / 2**20,
+    }
@@ -23,8 +23,9 @@ def parse_timestamp(path: str, prefix: str) -> pd.Timestamp:
     """
     Extract and parse timestamp from filename.
 
-    Assumes filename format: <prefix><YYYYMMDD_HHMMSS>.csv
+    Assumes filename format: <prefix><YYYYMMDD_HHMMSS>.csv, optionally
+    followed by a compression suffix (.gz, .zst).
     """
     base = os.path.basename(path)
-    ts_str = base.replace(prefix, "").replace(".csv", "")
+    ts_str = base.replace(prefix, "").split(".", 1)[0]
     return pd.to_datetime(ts_str, format="%Y%m%d_%H%M%S")
@@ -0,0 +1,21 @@
+# src/utils/process.py
+
+import resource
+from typing import Dict
+
+
+def own_memory_mb() -> Dict[str, float]:
+    """
+    Return current and peak resident memory of this process in MB.
+
+    Current RSS comes from /proc/self/statm; when it is unavailable
+    (non-Linux) only the peak from getrusage is reported.
+    """
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as f:
+            pages = int(f.read().split()[1])
+        rss_mb = pages * resource.getpagesize() / 2**20
+    except (OSError, IndexError, ValueError):
+        rss_mb = peak_mb
+    return {"rss_mb": round(rss_mb, 1), "peak_rss_mb": round(peak_mb, 1)}
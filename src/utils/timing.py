@@ -0,0 +1,97 @@
+# src/utils/timing.py
+
+"""
+Per-request timing spans and opt-in profiling.
+
+A request installs a fresh span list with `begin_request`; `span(...)` /
+`@timed(...)` append (name, ms) to it from any layer, including the
+threadpool workers Starlette runs sync handlers in (the context is copied
+into them). Outside a request spans cost one ContextVar lookup.
+
+When a request asks for profiling, the outermost span on each thread
+enables a shared `cProfile.Profile`, so the report covers every timed
+region of the request without profiling the event loop.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Tuple, TypeVar
+
+
+F = TypeVar("F", bound=Callable)
+
+
+@dataclass
+class RequestTimings:
+    """
+    Spans collected for one request.
+    """
+    spans: List[Tuple[str, float]] = field(default_factory=list)
+    profiler: Optional[cProfile.Profile] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+_CURRENT: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+_DEPTH = threading.local()
+
+
+def begin_request(profile: bool = False) -> RequestTimings:
+    """
+    Start collecting spans (and optionally a profile) for the current context.
+    """
+    timings = RequestTimings(profiler=cProfile.Profile() if profile else None)
+    _CURRENT.set(timings)
+    return timings
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Record the wall time of the enclosed block under `name`.
+    """
+    timings = _CURRENT.get()
+    if timings is None:
+        yield
+        return
+
+    depth = getattr(_DEPTH, "value", 0)
+    _DEPTH.value = depth + 1
+    profiling = timings.profiler is not None and depth == 0
+    if profiling:
+        timings.profiler.enable()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - t0) * 1000
+        if profiling:
+            timings.profiler.disable()
+        _DEPTH.value = depth
+        with timings._lock:
+            timings.spans.append((name, elapsed))
+
+
+def timed(name: str | None = None) -> Callable[[F], F]:
+    """
+    Decorate a function so each call is recorded as a span.
+
+    The span name defaults to the function's qualified name.
+    """
+    def wrap(fn: F) -> F:
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with span(label):
+                return fn(*args, **kwargs)
+
+        return inner  # type: ignore[return-value]
+
+    return wrap
@@ -0,0 +1,53 @@
+# tests/conftest.py
+
+from __future__ import annotations
+
+from pathlib import Path
+import shutil
+from typing import Callable, Iterator
+
+import pytest
+
+import gen_dumps
+
+
+@pytest.fixture
+def make_dumps(tmp_path: Path) -> Callable[..., Path]:
+    """
+    Return a function writing small synthetic dumps (`benchmarks/gen_dumps.py`)
+    into a fresh directory; keyword arguments override its CLI options.
+    """
+    def make(**options) -> Path:
+        out = tmp_path / "dumps"
+        defaults = {"processes": 60, "days": 0.05, "interval": 600, "depth": 3}
+        argv = ["--out", str(out)]
+        for name, value in {**defaults, **options}.items():
+            argv += [f"--{name.replace('_', '-')}", str(value)]
+        gen_dumps.generate(gen_dumps.build_parser().parse_args(argv))
+        return out
+
+    return make
+
+
+def replay(dumps: Path, live: Path, steps: int) -> Iterator[int]:
+    """
+    Copy the process dumps of `dumps` into `live` in `steps` batches, oldest
+    first, yielding the number copied so far after each batch.
+    """
+    live.mkdir(exist_ok=True)
+    files = sorted(dumps.glob("process_mem_*"))
+    cuts = sorted({round(len(files) * (k + 1) / steps) for k in range(steps)})
+    done = 0
+    for cut in cuts:
+        for path in files[done:cut]:
+            shutil.copy(path, live / path.name)
+        done = cut
+        yield done
+
+
+@pytest.fixture
+def replay_dumps() -> Callable[[Path, Path, int], Iterator[int]]:
+    """
+    Return `replay`, for growing a dump directory the way a collector does.
+    """
+    return replay
@@ -0,0 +1,118 @@
+# tests/test_cmd_index.py
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from adapters.cmd_index import CmdIndex, required_literals
+from adapters.snapshot_store import SnapshotStore
+
+
+COMMANDS = [
+    "fooAbar",
+    "abcAdef",
+    "abcd",
+    "/usr/bin/python3 -m gunicorn app.wsgi:application --workers 8",
+    "/usr/bin/python3 -m celery -A tasks worker --concurrency 4",
+    "/usr/sbin/nginx -g daemon on; master_process on;",
+    "[kworker/3:1-events]",
+    "cc1plus -O2 src/module_17.cpp -o /tmp/cc17.s",
+    "Redis-Server 127.0.0.1:6379",
+    "a]cde",
+    "yzw",
+    "x.y.z",
+]
+
+PATTERNS = [
+    r"foo\x41bar",
+    r"abc\101def",
+    r"fooAbar",
+    r"foo\N{LATIN CAPITAL LETTER A}bar",
+    r"(?x) a b c d",
+    r"(?ix) A B C D",
+    r"(?x:a b) cd",
+    r"[a\]b]cde",
+    r"[^]x]yzw",
+    r"[^]abc]yzw",
+    r"[x\]abc]\.y",
+    r"python3 -m (gunicorn|celery)",
+    r"worker\s+--concurrency \d+",
+    r"module_\d+\.cpp",
+    r"kworker/\d+:\d+",
+    r"redis-server",
+    r"x\.y\.z",
+    r"da?emon on",
+    r"(app)\.wsgi:\1lication",
+    r"nginx.*master_process",
+]
+
+
+@pytest.mark.parametrize(
+    ("pattern", "literals"),
+    [
+        (r"foo\x41bar", ["foo", "bar"]),
+        (r"abc\101def", ["abc", "def"]),
+        (r"fooAbar", ["fooAbar"]),
+        (r"foo\N{LATIN CAPITAL LETTER A}bar", ["foo", "bar"]),
+        (r"abc\0def", ["abc", "def"]),
+        (r"(abc)\1def", ["def"]),
+        (r"(?x) a b c d", []),
+        (r"(?x:a b) cd", []),
+        (r"[a\]b]cde", ["cde"]),
+        (r"[a\]bcd]x", []),
+        (r"[^]abc]x", []),
+        (r"abc\.def", ["abc.def"]),
+        (r"nginx|redis", []),
+        (r"colou?r", ["colo"]),
+    ],
+)
+def test_required_literals(pattern: str, literals: list[str]) -> None:
+    assert required_literals(pattern) == literals
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_required_literals_are_in_every_match(pattern: str) -> None:
+    rx = re.compile(pattern, re.IGNORECASE)
+    for cmd in COMMANDS:
+        if rx.search(cmd):
+            assert all(lit.lower() in cmd.lower() for lit in required_literals(pattern)), cmd
+
+
+def write_dump(dumps: Path, stamp: str, cmds: list[str]) -> None:
+    pd.DataFrame({
+        "PID": np.arange(len(cmds)) + 100, "PPID": 1, "USER": "root",
+        "RSS_MB": 10, "VSZ_MB": 20, "CMD": cmds,
+    }).to_csv(dumps / f"process_mem_{stamp}.csv", index=False)
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> CmdIndex:
+    dumps = tmp_path / "dumps"
+    dumps.mkdir()
+    store = SnapshotStore(tmp_path / "store", dumps / "process_mem_*.csv")
+    index = CmdIndex(store)
+    # Two snapshots, so the postings are extended once after they are built.
+    write_dump(dumps, "20250101_000000", COMMANDS[:6])
+    store.refresh()
+    index.catch_up()
+    write_dump(dumps, "20250101_001000", COMMANDS)
+    store.refresh()
+    index.catch_up()
+    return index
+
+
+@pytest.mark.parametrize("regex", [False, True])
+def test_search_matches_brute_force(index: CmdIndex, regex: bool) -> None:
+    strings = list(index._store.strings("cmd"))
+    queries = PATTERNS if regex else ["gunicorn", "abc", "KWORKER", "on;", "127.0.0.1", "zz", "ab"]
+    for q in queries:
+        if regex:
+            expected = [i for i, s in enumerate(strings) if re.search(q, s, re.IGNORECASE)]
+        else:
+            expected = [i for i, s in enumerate(strings) if q.lower() in s.lower()]
+        assert index.search(q, regex=regex).tolist() == expected, q
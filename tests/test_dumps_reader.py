@@ -0,0 +1,73 @@
+# tests/test_dumps_reader.py
+
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from adapters.dumps_reader import COMPRESSION_SUFFIXES, STRINGS_FILE, read_process_csv, zstandard
+
+
+PLAIN = (
+    "PID,PPID,USER,RSS_MB,VSZ_MB,CMD\n"
+    "1,0,root,12,40,/sbin/init\n"
+    "42,1,app,300,900,python3 -m app\n"
+)
+
+INTERNED = (
+    "PID,PPID,USER_ID,RSS_MB,VSZ_MB,CMD_ID,CGROUP_ID\n"
+    "1,0,0,12,40,0,0\n"
+    "42,1,1,300,900,1,1\n"
+)
+
+STRINGS = (
+    "COLUMN,ID,VALUE\n"
+    "USER,0,root\nUSER,1,app\n"
+    "CMD,0,/sbin/init\nCMD,1,python3 -m app\n"
+    "CGROUP,0,/\nCGROUP,1,/system.slice/app.service\n"
+)
+
+
+def compress(data: bytes, codec: str | None) -> bytes:
+    if codec == "gzip":
+        return gzip.compress(data)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+def write_dump(dumps: Path, text: str, codec: str | None) -> Path:
+    path = dumps / ("process_mem_20250101_120000.csv" + COMPRESSION_SUFFIXES.get(codec, ""))
+    path.write_bytes(compress(text.encode(), codec))
+    return path
+
+
+CODECS = [
+    None,
+    "gzip",
+    pytest.param("zstd", marks=pytest.mark.skipif(zstandard is None, reason="zstandard not installed")),
+]
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_plain_dump_round_trip(tmp_path: Path, codec: str | None) -> None:
+    df = read_process_csv(write_dump(tmp_path, PLAIN, codec))
+
+    assert df["PID"].tolist() == [1, 42]
+    assert df["CMD"].astype(str).tolist() == ["/sbin/init", "python3 -m app"]
+    assert df["CGROUP"].astype(str).tolist() == ["", ""]
+    assert (df["TIMESTAMP"] == pd.Timestamp("2025-01-01 12:00:00")).all()
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_interned_dump_round_trip(tmp_path: Path, codec: str | None) -> None:
+    (tmp_path / STRINGS_FILE).write_text(STRINGS, encoding="utf-8")
+    df = read_process_csv(write_dump(tmp_path, INTERNED, codec))
+
+    assert df["USER"].astype(str).tolist() == ["root", "app"]
+    assert df["CMD"].astype(str).tolist() == ["/sbin/init", "python3 -m app"]
+    assert df["CGROUP"].astype(str).tolist() == ["/", "/system.slice/app.service"]
+    assert df["RSS_MB"].tolist() == [12, 300]
@@ -0,0 +1,54 @@
+# tests/test_embedded_collector.py
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from adapters.embedded_collector import EmbeddedCollector
+from adapters.snapshot_store import SnapshotStore
+from config.settings import Settings
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="samples /proc")
+
+
+def sample(collector: EmbeddedCollector) -> None:
+    # Snapshots are keyed by the second; the store refuses a second sample within one.
+    time.sleep(1.0)
+    collector.sample()
+
+
+def test_failed_flush_drops_snapshots_from_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = Settings(dumps_dir=tmp_path, collector_flush_every=100)
+    store = SnapshotStore(tmp_path / ".store", tmp_path / settings.proc_glob)
+    collector = EmbeddedCollector(settings, store)
+
+    collector.sample()
+    collector.flush()
+    assert store.n_snapshots == 1
+
+    sample(collector)
+    sample(collector)
+    assert store.n_snapshots == 3
+
+    def fail(*args, **kwargs) -> None:
+        raise OSError("No space left on device")
+
+    with monkeypatch.context() as m:
+        m.setattr(pd.DataFrame, "to_csv", fail)
+        collector.flush()
+
+    assert collector.pending_system().empty
+    assert json.loads((tmp_path / ".store" / "manifest.json").read_text()).get("pending", []) == []
+    dumps = sorted(p.name[len("process_mem_"):][:15] for p in tmp_path.glob("process_mem_*"))
+    assert store.stamps() == dumps
+    assert store.n_snapshots == 1
+
+    # A rebuild from the dumps agrees with what the collector's store shows.
+    store.refresh()
+    assert store.n_snapshots == 1
@@ -0,0 +1,73 @@
+# tests/test_process_stats.py
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import adapters.process_stats as process_stats
+from adapters.process_stats import ProcessStatsIndex
+from adapters.snapshot_store import SnapshotStore
+
+
+def build(store_dir: Path, dumps: Path) -> SnapshotStore:
+    store = SnapshotStore(store_dir, dumps / "process_mem_*.csv")
+    store.refresh()
+    return store
+
+
+# 0 never folds the delta into the base, 1 does so now and then, a huge ratio every time.
+@pytest.mark.parametrize("ratio", [0, 1, 10**9])
+def test_incremental_equals_single_pass(
+    tmp_path: Path, make_dumps, replay_dumps, monkeypatch: pytest.MonkeyPatch, ratio: int
+) -> None:
+    monkeypatch.setattr(process_stats, "COMPACT_RATIO", ratio)
+    dumps = make_dumps(days=0.1, churn=0.8)
+    live = tmp_path / "live"
+
+    grown = None
+    tables = set()
+    for _ in replay_dumps(dumps, live, 5):
+        if grown is None:
+            store = build(tmp_path / "grown", live)
+            grown = ProcessStatsIndex(store)
+        else:
+            store.refresh()
+        grown.catch_up()
+        meta = json.loads((grown._dir / "meta.json").read_text())
+        tables.add((meta["base"]["dir"], (meta["delta"] or {}).get("dir")))
+    assert len(tables) == 5
+
+    whole = ProcessStatsIndex(build(tmp_path / "whole", dumps))
+    whole.catch_up()
+
+    cmds = np.arange(len(store.strings("cmd")))
+    expected = whole.by_cmd(cmds)
+    pd.testing.assert_frame_equal(grown.by_cmd(cmds), expected)
+
+    pid, ppid = expected["PID"].to_numpy(), expected["PPID"].to_numpy()
+    pd.testing.assert_frame_equal(grown.lookup(pid[::3], ppid[::3]), whole.lookup(pid[::3], ppid[::3]))
+
+    pids = np.unique(pid)
+    pd.testing.assert_frame_equal(grown.quantiles_by_pid(pids), whole.quantiles_by_pid(pids))
+    assert grown.pid_quantiles(int(pids[0])) == whole.pid_quantiles(int(pids[0]))
+
+
+def test_stats_match_raw_rows(tmp_path: Path, make_dumps) -> None:
+    store = build(tmp_path / "store", make_dumps())
+    index = ProcessStatsIndex(store)
+    index.catch_up()
+
+    rows = store.frame()
+    raw = rows.groupby(["PID", "PPID", "CMD"], observed=True)["RSS_MB"].agg(["min", "max", "mean"])
+    stats = index.by_cmd(np.arange(len(store.strings("cmd")))).set_index(["PID", "PPID", "CMD"])
+
+    assert len(stats) == len(raw)
+    raw = raw.reindex(stats.index)
+    np.testing.assert_array_equal(stats["rss_min"], raw["min"])
+    np.testing.assert_array_equal(stats["rss_max"], raw["max"])
+    np.testing.assert_allclose(stats["rss_mean"], raw["mean"])
@@ -0,0 +1,54 @@
+# tests/test_sketch.py
+
+from __future__ import annotations
+
+import numpy as np
+
+from domain.analysis.sketch import ALPHA, QUANTILES, bucket_of, merge, quantiles, segment_quantiles
+
+
+def sketch(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return merge(bucket_of(values), np.ones(len(values)))
+
+
+def test_quantiles_within_relative_error() -> None:
+    rng = np.random.default_rng(0)
+    values = np.round(rng.lognormal(6, 1.5, 5000))
+    keys, counts = sketch(values)
+
+    exact = np.quantile(values, QUANTILES, method="lower")
+    np.testing.assert_allclose(quantiles(keys, counts), exact, rtol=ALPHA)
+
+
+def test_zero_values_and_empty_sketches() -> None:
+    keys, counts = sketch(np.array([0, 0, 0, 5.0]))
+    assert quantiles(keys, counts, [0.5])[0] == 0.0
+    assert np.isnan(segment_quantiles(np.array([0, 0]), keys, counts, np.array([0]))).all()
+
+
+def test_merge_equals_sketch_of_union() -> None:
+    rng = np.random.default_rng(1)
+    a, b = rng.integers(0, 4000, 300), rng.integers(0, 40, 700)
+    ka, ca = sketch(a)
+    kb, cb = sketch(b)
+    keys, counts = merge(np.concatenate([ka, kb]), np.concatenate([ca, cb]))
+
+    union_keys, union_counts = sketch(np.concatenate([a, b]))
+    np.testing.assert_array_equal(keys, union_keys)
+    np.testing.assert_array_equal(counts, union_counts)
+
+
+def test_segments_match_single_sketches() -> None:
+    rng = np.random.default_rng(2)
+    parts = [rng.integers(1, 10_000, n) for n in (1, 50, 0, 400)]
+    sketches = [sketch(p) for p in parts]
+    ptr = np.concatenate([[0], np.cumsum([len(k) for k, _ in sketches])])
+    keys = np.concatenate([k for k, _ in sketches])
+    counts = np.concatenate([c for _, c in sketches])
+
+    got = segment_quantiles(ptr, keys, counts, np.array([3, 0, 2, 1]))
+    for row, i in zip(got, [3, 0, 2, 1]):
+        if len(parts[i]):
+            np.testing.assert_array_equal(row, quantiles(*sketches[i]))
+        else:
+            assert np.isnan(row).all()
@@ -0,0 +1,58 @@
+# tests/test_snapshot_store.py
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from adapters.dumps_reader import load_process_df
+from adapters.snapshot_store import SnapshotStore
+
+
+def plain(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return `df` with strings instead of categories, in store row order.
+    """
+    df = df.astype({col: str for col in ("USER", "CMD", "CGROUP")})
+    df["TIMESTAMP"] = df["TIMESTAMP"].astype("datetime64[s]")
+    return df.sort_values(["TIMESTAMP", "PID"], ignore_index=True)
+
+
+def test_appends_equal_one_rebuild(tmp_path: Path, make_dumps, replay_dumps) -> None:
+    dumps = make_dumps()
+    live = tmp_path / "live"
+    grown = SnapshotStore(tmp_path / "grown", live / "process_mem_*.csv")
+    generations = set()
+    for _ in replay_dumps(dumps, live, 4):
+        grown.refresh()
+        generations.add(grown.generation)
+
+    whole = SnapshotStore(tmp_path / "whole", dumps / "process_mem_*.csv")
+    whole.refresh()
+
+    assert len(generations) == 1, "in-order dumps must be appended, not rebuilt"
+    assert grown.stamps() == whole.stamps()
+    pd.testing.assert_frame_equal(plain(grown.frame()), plain(whole.frame()))
+    pd.testing.assert_frame_equal(plain(whole.frame()), plain(load_process_df(dumps / "process_mem_*.csv")))
+
+
+def test_deleted_or_late_dump_rebuilds(tmp_path: Path, make_dumps) -> None:
+    dumps = make_dumps()
+    files = sorted(dumps.glob("process_mem_*"))
+    store = SnapshotStore(tmp_path / "store", dumps / "process_mem_*.csv")
+    store.refresh()
+    generation = store.generation
+
+    files[1].unlink()
+    store.refresh()
+    assert store.generation > generation
+    assert len(store.stamps()) == len(files) - 1
+    pd.testing.assert_frame_equal(plain(store.frame()), plain(load_process_df(dumps / "process_mem_*.csv")))
+
+    # The dump reappears late, older than the newest one: no in-place append.
+    files[1].write_bytes(files[0].read_bytes())
+    generation = store.generation
+    store.refresh()
+    assert store.generation > generation
+    assert len(store.stamps()) == len(files)
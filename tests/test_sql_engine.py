@@ -0,0 +1,76 @@
+# tests/test_sql_engine.py
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+
+from adapters.snapshot_store import SnapshotStore  # noqa: E402
+from adapters.sql_engine import SqlError, connect, run  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path: Path, make_dumps) -> SnapshotStore:
+    store = SnapshotStore(tmp_path / "store", make_dumps() / "process_mem_*.csv")
+    store.refresh()
+    return store
+
+
+def open_con(store: SnapshotStore, tmp_path: Path, external_access: bool = False):
+    system = pd.DataFrame({"TIMESTAMP": pd.to_datetime(store.stamps(), format="%Y%m%d_%H%M%S"), "MemTotal_MB": 1})
+    return connect(store, system, str(tmp_path / "cgroup_mem_*.csv"), external_access=external_access)
+
+
+def test_select_over_views(store: SnapshotStore, tmp_path: Path) -> None:
+    con = open_con(store, tmp_path)
+
+    assert run(con, "SELECT count(*) FROM processes", 10).rows == [(store.n_rows,)]
+    assert run(con, "SELECT count(*) FROM subtrees WHERE LEVEL = 0", 10).rows[0][0] > 0
+    assert run(con, "SELECT count(*) FROM system", 10).rows == [(store.n_snapshots,)]
+    assert run(con, "WITH s AS (SELECT * FROM cgroups) SELECT count(*) FROM s", 10).rows == [(0,)]
+
+    result = run(con, "SELECT PID FROM processes", 5)
+    assert len(result.rows) == 5 and result.truncated
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT 1; SELECT 2",
+        "DROP VIEW processes",
+        "CREATE TABLE t AS SELECT 1",
+        "INSERT INTO t VALUES (1)",
+        "COPY (SELECT 1) TO 'out.csv'",
+        "ATTACH 'other.db'",
+        "SET enable_external_access = true",
+        "PRAGMA enable_profiling",
+        "PRAGMA threads = 1",
+        "CALL pragma_version()",
+        "INSTALL httpfs",
+        "not sql at all",
+    ],
+)
+def test_rejects_anything_but_one_select(store: SnapshotStore, tmp_path: Path, sql: str) -> None:
+    con = open_con(store, tmp_path)
+    with pytest.raises(SqlError):
+        run(con, sql, 10)
+    assert run(con, "SELECT count(*) FROM processes", 10).rows == [(store.n_rows,)]
+
+
+def test_external_files_need_opt_in(store: SnapshotStore, tmp_path: Path) -> None:
+    outside = tmp_path / "outside.csv"
+    outside.write_text("a,b\n1,2\n", encoding="utf-8")
+    sql = f"SELECT * FROM read_csv('{outside}')"
+
+    with pytest.raises(SqlError):
+        run(open_con(store, tmp_path), sql, 10)
+    # The setting is locked on the connection itself, not only by `run`.
+    con = open_con(store, tmp_path)
+    with pytest.raises(duckdb.Error):
+        con.execute("SET enable_external_access = true")
+
+    assert run(open_con(store, tmp_path, external_access=True), sql, 10).rows == [(1, 2)]
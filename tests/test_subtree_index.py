@@ -0,0 +1,52 @@
+# tests/test_subtree_index.py
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from adapters.snapshot_store import SnapshotStore
+from adapters.subtree_index import SubtreeIndex
+
+
+def walk_up(pid: np.ndarray, ppid: np.ndarray, rss: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return (level, subtree RSS) of one snapshot by walking every row up to its root.
+    """
+    at = {p: i for i, p in enumerate(pid)}
+    level = np.zeros(len(pid), dtype=np.int64)
+    sub = np.zeros(len(pid), dtype=np.int64)
+    for i in range(len(pid)):
+        j, seen = i, {i}
+        sub[i] += rss[i]
+        while ppid[j] in at and at[ppid[j]] not in seen:
+            j = at[ppid[j]]
+            seen.add(j)
+            sub[j] += rss[i]
+            level[i] += 1
+    return level, sub
+
+
+def test_rollups_match_walk_and_single_pass(tmp_path: Path, make_dumps, replay_dumps) -> None:
+    dumps = make_dumps()
+    live = tmp_path / "live"
+    store = SnapshotStore(tmp_path / "grown", live / "process_mem_*.csv")
+    grown = SubtreeIndex(store)
+    for _ in replay_dumps(dumps, live, 3):
+        store.refresh()
+        grown.catch_up()
+
+    whole_store = SnapshotStore(tmp_path / "whole", dumps / "process_mem_*.csv")
+    whole_store.refresh()
+    whole = SubtreeIndex(whole_store)
+    whole.catch_up()
+
+    cols = store.columns()
+    for i in range(store.n_snapshots):
+        rows = store.snapshot_rows(i)
+        level, sub = walk_up(cols["pid"][rows], cols["ppid"][rows], cols["rss_mb"][rows].astype(np.int64))
+        np.testing.assert_array_equal(grown.columns(rows)["level"], level)
+        np.testing.assert_array_equal(grown.columns(rows)["sub_rss"], sub)
+    for name in ("level", "sub_rss"):
+        np.testing.assert_array_equal(grown.columns()[name], whole.columns()[name])
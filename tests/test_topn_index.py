@@ -0,0 +1,49 @@
+# tests/test_topn_index.py
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from adapters.snapshot_store import SnapshotStore
+from adapters.subtree_index import SubtreeIndex
+from adapters.topn_index import TopNIndex, top_rows
+
+
+def test_top_rows_pads_and_orders() -> None:
+    assert top_rows(np.array([3, 9, 1, 9, 5]), 3).tolist() == [1, 3, 4]
+    assert top_rows(np.array([2, 7]), 4).tolist() == [1, 0, -1, -1]
+    assert top_rows(np.array([], dtype=np.int64), 2).tolist() == [-1, -1]
+
+
+@pytest.mark.parametrize("n", [5, 500])
+def test_rankings_match_sorting_every_snapshot(tmp_path: Path, make_dumps, replay_dumps, n: int) -> None:
+    dumps = make_dumps()
+    live = tmp_path / "live"
+    store = SnapshotStore(tmp_path / "store", live / "process_mem_*.csv")
+    index = TopNIndex(store, n)
+    for _ in replay_dumps(dumps, live, 3):
+        store.refresh()
+        index.catch_up()
+
+    subtrees = SubtreeIndex(store)
+    subtrees.catch_up()
+    rss = store.columns()["rss_mb"]
+    sub_rss = subtrees.columns()["sub_rss"]
+    for i in range(store.n_snapshots):
+        rows = store.snapshot_rows(i)
+        k = min(n, rows.stop - rows.start)
+
+        top = index.processes(i)
+        assert rss[top].tolist() == sorted(rss[rows], reverse=True)[:k]
+        assert ((top >= rows.start) & (top < rows.stop)).all()
+
+        roots, values = index.subtrees(i)
+        assert values.tolist() == sorted(sub_rss[rows], reverse=True)[:k]
+        np.testing.assert_array_equal(sub_rss[roots], values)
+
+    ranking = index.ranking(store.n_snapshots - 1, "processes")
+    assert ranking["rank"].tolist() == list(range(1, len(ranking) + 1))
+    assert ranking["prev_rank"].dropna().between(1, n).all()